@@ -68,12 +68,15 @@ class ErrorCodes(object):
         ########
         # General
         'alba_cmd_fail': ErrorCode('ALBA0001', 'A command towards ALBA failed', 'Validate whether the Arakoon cluster is running'),
+        'alba_backend_unresponsive': ErrorCode('ALBA0002', 'The information of the backend could not be collected in time', 'Validate whether the ASD managers of the backend are responding'),
         # OSD
         'osd_no_ip': ErrorCode('ALBA0100', 'An OSD has no associated IPs', 'Validate whether the asd-manager registered the correct IPs'),
         'osd_broken': ErrorCode('ALBA0101', 'An OSD seems to be broken', 'Validate whether the OSD is running correctly'),
         'osd_object_download_fail': ErrorCode('ALBA0102', 'An OSD did not return the correct object', 'Validate whether the OSD is running correctly'),
         'osd_defective': ErrorCode('ALBA0103', 'One or more OSDs are not responding', 'Validate whether the OSD is running correctly'),
         'osd_defective_unsatisfiable': ErrorCode('ALBA104', 'One or more OSDs are not responding and the preset is no longer satisfiable!', 'Validate whether the OSD is running correctly'),
+        'osd_slow': ErrorCode('ALBA0105', 'An OSD responds a lot slower than the other OSDs of the backend', 'Validate whether the disk of the OSD is failing'),
+        'osd_node_unreachable': ErrorCode('ALBA0106', 'A node hosting OSDs is unreachable, its OSDs could not be tested', 'Validate whether the node is running and reachable over the network'),
         # Proxy
         'proxy_namespace_create': ErrorCode('ALBA0200', 'The namespace was successfully created through the proxy', no_action),
         'proxy_namespace_fetch': ErrorCode('ALBA0201', 'The namespace was successfully fetched through the proxy', no_action),
@@ -82,11 +85,16 @@ class ErrorCodes(object):
         'proxy_verify_obj': ErrorCode('ALBA0204', 'The object\'s contents did not change', no_action),
         'proxy_verify_obj_fail': ErrorCode('ALBA0205', 'The object\'s contents changed', engineer_report),
         'proxy_problems': ErrorCode('ALBA0206', 'Testing the proxies was unsuccessful', 'Look for previous errors and act accordingly'),
+        'proxy_bench_ok': ErrorCode('ALBA0207', 'The throughput and latency of the proxy are within the thresholds', no_action),
+        'proxy_bench_threshold': ErrorCode('ALBA0208', 'The throughput or latency of the proxy exceeds the thresholds', 'Validate the load on the proxy and the performance of the backend'),
+        'proxy_bench_degraded': ErrorCode('ALBA0209', 'The throughput of the proxy dropped compared to previous runs', 'Validate the load on the proxy and the performance of the backend'),
         # Disk safety
         'disk_safety_ok': ErrorCode('ALBA0300', 'All data for the backend is safe, no data is at risk', no_action),
         'disk_safety_warn': ErrorCode('ALBA0301', 'Not all data is completely safe, certain fragments are to be repaired', 'Validate whether all OSDs are running'),
         'disk_safety_error_zero': ErrorCode('ALBA0302', 'The data is at risk or might have suffered some loss!', 'Validate whether all OSDs are running'),
         'disk_safety_error_negative': ErrorCode('ALBA0303', 'The data has suffered some loss!', 'Validate whether all OSDs are running'),
+        'disk_safety_forecast': ErrorCode('ALBA0304', 'The disk safety is expected to reach zero soon', 'Validate whether all OSDs are running and whether the repair keeps up'),
+        'disk_safety_repair_slow': ErrorCode('ALBA0305', 'Objects lose safety faster than they are repaired', 'Validate whether all OSDs are running and whether the maintenance processes keep up'),
         # Services
         'alba_service_running': ErrorCode('ALBA0400', 'The Alba service is up and running', no_action),
         'alba_service_down': ErrorCode('ALBA0401', 'The Alba service is not running', 'Validate whether the Alba service has been started'),
@@ -97,6 +105,7 @@ class ErrorCodes(object):
         'nsm_load_ok': ErrorCode('ALBA0600', 'The backend\'s NSM Arakoons are not overloaded', no_action),
         'nsm_load_warn': ErrorCode('ALBA0601', 'The backend\'s NSM Arakoons are overloaded', 'No action required. The Framework will pick this up'),
         'nsm_load_failure': ErrorCode('ALBA0602', 'The backend\'s NSM Arakoons are overloaded', 'The NSMs are not handled by the Framework. Register new NSM hosts to the cluster'),
+        'nsm_load_forecast': ErrorCode('ALBA0603', 'The backend\'s NSM Arakoons are expected to become overloaded soon', 'Plan the registration of new NSM hosts to the cluster'),
         #############
         # Framework #
         #############
@@ -133,10 +142,12 @@ class ErrorCodes(object):
         'node_up_to_date': ErrorCode('ARA0100', 'The Arakoon node is currently up to date with the master', 'No actions required'),
         'master_behind': ErrorCode('ARA0101', 'The Arakoon slave is a couple of transactions behind the master', 'Wait for the catchup to complete'),
         'slave_catch_up': ErrorCode('ARA0102', 'The Arakoon slave is catching up to the master', 'Wait for the catchup to complete'),
+        'node_falling_behind': ErrorCode('ARA0103', 'The Arakoon slave is falling further behind the master', 'Validate whether the node and its network are not overloaded'),
         # Connections
         'arakoon_connection_ok': ErrorCode('ARA0200', 'Connection can be established to the Arakoon node', 'No actions required'),
         'arakoon_connection_failure': ErrorCode('ARA0201', 'Connection could not be established to the Arakoon node', 'Validate whether the Arakoon process is running on the node'),
         'arakoon_responded': ErrorCode('ARA0202', 'The Arakoon cluster responded', 'No actions required'),
+        'arakoon_node_unresponsive': ErrorCode('ARA0203', 'The Arakoon node did not respond within the time limit', 'Validate whether the node and its Arakoon process are not overloaded'),
         # Tlog and TLX
         'tlx_tlog_not_found': ErrorCode('ARA0300', 'Neither the TLX nor TLOG could be found on a node within the Arakoon cluster', 'Validate whether this Arakoon cluster has been setup correctly'),
         'tlog_not_found': ErrorCode('ARA0301', 'No open TLOG could be found on a node within the Arakoon cluster', 'Validate whether this Arakoon cluster has been setup correctly'),
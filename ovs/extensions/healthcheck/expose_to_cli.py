@@ -31,6 +31,14 @@ import inspect
 from functools import wraps
 from ovs.extensions.generic.configuration import Configuration
 from ovs.extensions.healthcheck.decorators import node_check
+from ovs.extensions.healthcheck.helpers.albacli import AlbaCLI
+from ovs.extensions.healthcheck.helpers.api import OVSClientPool
+from ovs.extensions.healthcheck.helpers.arakoon import ArakoonClusterHelper
+from ovs.extensions.healthcheck.helpers.asd import ASDClientPool
+from ovs.extensions.healthcheck.helpers.helper import Helper
+from ovs.extensions.healthcheck.helpers.metrics import MetricsHelper
+from ovs.extensions.healthcheck.helpers.servicestatus import ServiceStatusHelper
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
 from ovs.extensions.healthcheck.result import HCResults
 from ovs.extensions.healthcheck.logger import Logger
 from ovs.extensions.storage.volatilefactory import VolatileFactory
@@ -373,15 +381,50 @@ class HealthCheckShared(object):
         :rtype: dict
         """
         recap_executer = 'Health Check'
-        result = result_handler.get_results()
+        metrics = MetricsHelper.get_metrics()
+        result = result_handler.get_results(metrics=metrics)
         result_handler.info("Recap of {0}!".format(recap_executer))
         result_handler.info("======================")
         recount = []  # Order matters
         for severity in ['SUCCESS', 'FAILED', 'SKIPPED', 'WARNING', 'EXCEPTION']:
             recount.append((severity, result_handler.counter[severity]))
         result_handler.info(' '.join('{0}={1}'.format(s, v) for s, v in recount))
+        HealthCheckShared.end_run()
+        try:
+            MetricsHelper.write(Helper.metrics_file)
+        except Exception:
+            HealthCheckShared.logger.exception('Unable to write the metrics to {0}'.format(Helper.metrics_file))
         # returns dict with minimal and detailed information
-        return {'result': result, 'recap': dict(recount)}
+        return {'result': result, 'recap': dict(recount), 'metrics': metrics}
+
+    @staticmethod
+    def start_run():
+        # type: () -> None
+        """
+        Reset all state that is scoped to a single Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        AlbaCLI.clear_cache()
+        ASDClientPool.clear()
+        OVSClientPool.clear()
+        SSHClientPool.clear()
+        ArakoonClusterHelper.clear()
+        MetricsHelper.clear()
+        ServiceStatusHelper.clear()
+
+    @staticmethod
+    def end_run():
+        # type: () -> None
+        """
+        Release all resources that were held during a single Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        ASDClientPool.clear()
+        OVSClientPool.clear()
+        SSHClientPool.clear()
+        ArakoonClusterHelper.clear()
 
     @classmethod
     def get_default_arguments(cls):
@@ -667,6 +710,7 @@ def healthcheck_entry_point(ctx, unattended, to_json):
     # Provide a new instance of the results to collect all results within the complete healthcheck
     result_handler = HCResults(unattended=unattended, to_json=to_json)
     ctx.obj = HealthCheckCLiContext(result_handler)
+    HealthCheckShared.start_run()
     # When run with subcommand, it will fetch the command to execute
     if ctx.invoked_subcommand is None:
         # Invoked without sub command. Run all functions.
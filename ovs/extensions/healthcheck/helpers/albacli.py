@@ -42,8 +42,14 @@ import re
 import json
 import time
 import select
+import signal
+import tempfile
 from subprocess import Popen, PIPE, CalledProcessError
-from ovs.extensions.healthcheck.helpers.exceptions import AlbaException
+from threading import Event, Lock, Thread
+from ovs.extensions.healthcheck.helpers.exceptions import AlbaException, AlbaTimeOutException
+from ovs.extensions.healthcheck.helpers.helper import Helper
+from ovs.extensions.healthcheck.helpers.jsonstream import AlbaJSONStream
+from ovs.extensions.healthcheck.helpers.metrics import MetricsHelper
 from ovs.extensions.healthcheck.logger import Logger
 
 
@@ -51,8 +57,54 @@ class AlbaCLI(object):
     """
     Wrapper for 'alba' command line interface
     """
-    @staticmethod
-    def run(command, config=None, named_params=None, extra_params=None, client=None, debug=False, to_json=True):
+    # Read-only commands of which the output can be re-used for the remainder of a Healthcheck run
+    CACHEABLE_COMMANDS = ['get-maintenance-config', 'list-nsm-hosts', 'list-namespaces', 'list-osds', 'list-presets', 'proxy-client-cfg']
+    # Commands which change the state of ALBA, mapped to the cached commands of which the output becomes stale
+    MUTATING_COMMANDS = {'add-nsm-host': ['list-nsm-hosts'],
+                         'claim-osd': ['list-osds'],
+                         'create-namespace': ['list-namespaces'],
+                         'create-preset': ['list-presets'],
+                         'delete-namespace': ['list-namespaces'],
+                         'delete-preset': ['list-presets'],
+                         'proxy-create-namespace': ['list-namespaces'],
+                         'proxy-delete-namespace': ['list-namespaces'],
+                         'purge-osd': ['list-osds'],
+                         'update-maintenance-config': ['get-maintenance-config'],
+                         'update-nsm-host': ['list-nsm-hosts'],
+                         'update-preset': ['list-presets']}
+
+    # Exit codes of coreutils' timeout when the command timed out (124) or had to be killed (128 + 9)
+    TIMEOUT_EXIT_CODES = [124, 137]
+
+    _cache = {}
+    _cache_lock = Lock()
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Clear all cached command output. To be called at the start of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._cache_lock:
+            cls._cache.clear()
+
+    @classmethod
+    def invalidate(cls, commands):
+        """
+        Remove the cached output of the given commands, regardless of the config or parameters they were called with
+        :param commands: Commands to invalidate, eg: ['list-namespaces']
+        :type commands: list[str]
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._cache_lock:
+            for cache_key in cls._cache.keys():
+                if cache_key[0] in commands:
+                    cls._cache.pop(cache_key)
+
+    @classmethod
+    def run(cls, command, config=None, named_params=None, extra_params=None, client=None, debug=False, to_json=True, use_cache=True, cluster_identifier=None, timeout=None):
         """
         Executes a command on ALBA
         When --to-json is NOT passed:
@@ -78,6 +130,15 @@ class AlbaCLI(object):
         :type debug: bool
         :param to_json: Parse the output as json
         :type to_json: bool
+        :param use_cache: Re-use the output of a previous identical call when the command is read-only (see CACHEABLE_COMMANDS)
+        Cached output is shared between callers and should not be modified
+        :type use_cache: bool
+        :param cluster_identifier: Identifies the ALBA manager cluster the config points to. Used instead of the config to look up cached output
+        Allows configs stored at different locations (eg. one for every proxy) to share the output when they point to the same ALBA manager
+        :type cluster_identifier: str
+        :param timeout: Number of seconds the command may take before it is terminated. Defaults to the timeout configured for the command
+        :type timeout: float
+        :raises AlbaTimeOutException: When the command did not finish within the timeout
         :return: The output of the command
         :rtype: dict
         """
@@ -86,6 +147,233 @@ class AlbaCLI(object):
         if extra_params is None:
             extra_params = []
 
+        cache_key = None
+        if use_cache is True and command in cls.CACHEABLE_COMMANDS and os.environ.get('RUNNING_UNITTESTS') != 'True':
+            cache_key = (command, cluster_identifier or config, tuple(sorted(named_params.iteritems())), tuple(extra_params), to_json, getattr(client, 'ip', None))
+            with cls._cache_lock:
+                if cache_key in cls._cache:
+                    return cls._cache[cache_key]
+        failed = True
+        start = time.time()
+        try:
+            output = cls._run(command=command, config=config, named_params=named_params, extra_params=extra_params, client=client, debug=debug, to_json=to_json,
+                              timeout=timeout or cls.get_timeout(command))
+            failed = False
+        finally:
+            cls._record_latency(command=command, config=config, named_params=named_params, extra_params=extra_params, client=client, to_json=to_json,
+                                duration=time.time() - start, failed=failed)
+            # A failing mutating command might still have changed the state
+            if command in cls.MUTATING_COMMANDS:
+                cls.invalidate(cls.MUTATING_COMMANDS[command])
+        if cache_key is not None:
+            with cls._cache_lock:
+                cls._cache[cache_key] = output
+        return output
+
+    @classmethod
+    def _record_latency(cls, command, config, named_params, extra_params, client, to_json, duration, failed):
+        """
+        Record the latency of a call and log it when it was slow
+        Calls are tagged with the host and port they were executed against. Calls which go through a config are tagged with the config location
+        :return: None
+        :rtype: NoneType
+        """
+        if 'host' in named_params and 'port' in named_params:
+            target = '{0}:{1}'.format(named_params['host'], named_params['port'])
+        elif config is not None:
+            target = config.split('?')[0]
+        else:
+            target = 'local'
+        MetricsHelper.record_latency(category='alba_cli', name=command, target=target, duration=duration, failed=failed)
+        if duration > Helper.alba_cli_slow_call_threshold:
+            slow_call = {'command': command,
+                         'command_line': ' '.join(cls._build_command(command, config, named_params, extra_params, to_json)),
+                         'target': target,
+                         'node': getattr(client, 'ip', None),
+                         'duration': round(duration, 4),
+                         'failed': failed}
+            Logger('healthcheck-alba_cli').warning('Slow AlbaCLI call: {0}'.format(json.dumps(slow_call, sort_keys=True)))
+
+    @staticmethod
+    def _build_command(command, config, named_params, extra_params, to_json):
+        """
+        Build the command line for an ALBA command
+        See run() for the parameter documentation
+        :return: The command line
+        :rtype: list[str]
+        """
+        cmd_list = ['/usr/bin/alba', command]
+        if to_json is True:
+            cmd_list.append('--to-json')
+        if config is not None:
+            cmd_list.append('--config={0}'.format(config))
+        for key, value in named_params.iteritems():
+            cmd_list.append('--{0}={1}'.format(key, value))
+        cmd_list.extend(extra_params)
+        return cmd_list
+
+    @staticmethod
+    def get_timeout(command):
+        """
+        Retrieve the configured timeout for a command
+        :param command: The command to retrieve the timeout for, eg: 'list-namespaces'
+        :type command: str
+        :return: Number of seconds the command may take
+        :rtype: float
+        """
+        return Helper.alba_cli_command_timeouts.get(command, Helper.alba_cli_timeout)
+
+    @staticmethod
+    def _start_watchdog(channel, timeout):
+        """
+        Start a thread which enforces a timeout on a process
+        A process exceeding the timeout is asked to terminate (SIGTERM) and killed (SIGKILL) when it is still running after the grace period
+        :param channel: The process to watch. Must have been started through _spawn
+        :type channel: subprocess.Popen
+        :param timeout: Number of seconds the process may take
+        :type timeout: float
+        :return: The event to set once the process has finished, the event that is set when the process timed out and the watchdog thread
+        :rtype: tuple(threading.Event, threading.Event, threading.Thread)
+        """
+        finished = Event()
+        timed_out = Event()
+
+        def _send_signal(signal_number):
+            try:
+                # The process runs in its own process group (see _spawn) so children do not keep the pipes open
+                os.killpg(channel.pid, signal_number)
+            except OSError:
+                pass  # Process exited in the meantime
+
+        def _watchdog():
+            if finished.wait(timeout):
+                return
+            timed_out.set()
+            _send_signal(signal.SIGTERM)
+            if finished.wait(Helper.alba_cli_kill_grace_period):
+                return
+            _send_signal(signal.SIGKILL)
+
+        watchdog = Thread(target=_watchdog)
+        watchdog.setDaemon(True)
+        watchdog.start()
+        return finished, timed_out, watchdog
+
+    @staticmethod
+    def _spawn(cmd_list, **kwargs):
+        """
+        Start a process in a new process group so the process and all of its children can be signalled at once
+        :param cmd_list: Command to execute
+        :type cmd_list: list[str]
+        :param kwargs: Additional arguments for subprocess.Popen
+        :return: The started process
+        :rtype: subprocess.Popen
+        """
+        return Popen(cmd_list, preexec_fn=os.setpgrp, **kwargs)
+
+    @staticmethod
+    def _communicate(channel, timeout):
+        """
+        Wait for a process to finish while enforcing a timeout
+        :param channel: The process to wait for
+        :type channel: subprocess.Popen
+        :param timeout: Number of seconds the process may take
+        :type timeout: float
+        :return: The stdout, stderr and whether the process timed out
+        :rtype: tuple(str, str, bool)
+        """
+        finished, timed_out, watchdog = AlbaCLI._start_watchdog(channel, timeout)
+        try:
+            output, stderr = channel.communicate()
+        finally:
+            finished.set()
+            watchdog.join()
+        return output, stderr, timed_out.is_set()
+
+    @classmethod
+    def run_iter(cls, command, config=None, named_params=None, extra_params=None, timeout=None):
+        """
+        Executes a command with a list as result on ALBA and yields the items of the result one by one
+        The output is parsed while the command produces it, so the complete output is never kept in memory
+        Closing the generator (eg. breaking out of the loop) stops the command
+        Unlike run(), the command is always executed on the local node and the output is never cached
+        :param command: The command to execute, eg: 'list-namespaces'
+        :type command: str
+        :param config: The configuration location to be used
+        :type config: str
+        :param named_params: Additional parameters to be given to the command
+        :type named_params: dict
+        :param extra_params: Additional parameters to be given to the command
+        :type extra_params: list
+        :param timeout: Number of seconds the command may take before it is terminated. Defaults to the timeout configured for the command
+        :type timeout: float
+        :raises AlbaTimeOutException: When the command did not finish within the timeout
+        :raises AlbaException: When the command failed
+        :return: Generator yielding every item of the result
+        :rtype: generator
+        """
+        if named_params is None:
+            named_params = {}
+        if extra_params is None:
+            extra_params = []
+        if os.environ.get('RUNNING_UNITTESTS') == 'True':
+            for item in cls.run(command=command, config=config, named_params=named_params, extra_params=extra_params):
+                yield item
+            return
+
+        logger = Logger('healthcheck-alba_cli')
+        timeout = timeout or cls.get_timeout(command)
+        cmd_list = cls._build_command(command, config, named_params, extra_params, to_json=True)
+        cmd_string = ' '.join(cmd_list)
+        failed = True
+        start = time.time()
+        stderr_file = tempfile.TemporaryFile()
+        try:
+            try:
+                channel = cls._spawn(cmd_list, stdout=PIPE, stderr=stderr_file)
+            except OSError as ose:
+                raise AlbaException(str(ose), command)
+            finished, timed_out, watchdog = cls._start_watchdog(channel, timeout)
+            try:
+                for item in AlbaJSONStream(channel.stdout.read).iter_result():
+                    yield item
+                channel.wait()
+                failed = False
+            except GeneratorExit:
+                failed = False  # Stopped by the caller
+                raise
+            except Exception as ex:
+                if timed_out.is_set():
+                    logger.error('Error: Command {0} timed out after {1}s'.format(cmd_string, timeout))
+                    raise AlbaTimeOutException('Command timed out after {0}s'.format(timeout), command)
+                stderr_file.seek(0)
+                logger.exception('Error: {0}'.format(ex))
+                logger.debug('Command: {0}'.format(cmd_string))
+                logger.debug('stderr: {0}'.format(stderr_file.read()))
+                raise AlbaException(str(ex), command)
+            finally:
+                if channel.poll() is None:
+                    try:
+                        os.killpg(channel.pid, signal.SIGKILL)
+                    except OSError:
+                        pass  # Process exited in the meantime
+                    channel.wait()
+                channel.stdout.close()
+                finished.set()
+                watchdog.join()
+        finally:
+            stderr_file.close()
+            cls._record_latency(command=command, config=config, named_params=named_params, extra_params=extra_params, client=None, to_json=True,
+                                duration=time.time() - start, failed=failed)
+
+    @staticmethod
+    def _run(command, config, named_params, extra_params, client, debug, to_json, timeout):
+        """
+        Executes a command on ALBA without consulting the cache
+        See run() for the parameter documentation
+        :return: The output of the command
+        :rtype: dict
+        """
         logger = Logger('healthcheck-alba_cli')
         if os.environ.get('RUNNING_UNITTESTS') == 'True':
             # For the unittest, all commands are passed to a mocked Alba
@@ -96,30 +384,22 @@ class AlbaCLI(object):
 
         debug_log = []
         try:
-            if to_json is True:
-                extra_options = ["--to-json"]
-            else:
-                extra_options = []
-            cmd_list = ['/usr/bin/alba', command] + extra_options
-            if config is not None:
-                cmd_list.append('--config={0}'.format(config))
-            for key, value in named_params.iteritems():
-                cmd_list.append('--{0}={1}'.format(key, value))
-            cmd_list.extend(extra_params)
+            cmd_list = AlbaCLI._build_command(command, config, named_params, extra_params, to_json)
             cmd_string = ' '.join(cmd_list)
             debug_log.append('Command: {0}'.format(cmd_string))
 
-            start = time.time()
             try:
                 if client is None:
                     try:
                         if not hasattr(select, 'poll'):
                             import subprocess
                             subprocess._has_poll = False  # Damn 'monkey patching'
-                        channel = Popen(cmd_list, stdout=PIPE, stderr=PIPE, universal_newlines=True)
+                        channel = AlbaCLI._spawn(cmd_list, stdout=PIPE, stderr=PIPE, universal_newlines=True)
                     except OSError as ose:
                         raise CalledProcessError(1, cmd_string, str(ose))
-                    output, stderr = channel.communicate()
+                    output, stderr, timed_out = AlbaCLI._communicate(channel, timeout)
+                    if timed_out is True:
+                        raise AlbaTimeOutException('Command timed out after {0}s'.format(timeout), command)
                     output = re.sub(r'[^\x00-\x7F]+', '', output)
                     stderr_debug = 'stderr: {0}'.format(stderr)
                     stdout_debug = 'stdout: {0}'.format(output)
@@ -130,20 +410,24 @@ class AlbaCLI(object):
                     if exit_code != 0:  # Raise same error as check_output
                         raise CalledProcessError(exit_code, cmd_string, output)
                 else:
-                    if debug is True:
-                        output, stderr = client.run(cmd_list, debug=True)
-                        debug_log.append('stderr: {0}'.format(stderr))
-                    else:
-                        output = client.run(cmd_list, debug=False).strip()
+                    # Let coreutils enforce the timeout on the remote side, escalating to SIGKILL after the grace period
+                    remote_cmd_list = ['timeout', '--kill-after={0}'.format(Helper.alba_cli_kill_grace_period), str(timeout)] + cmd_list
+                    try:
+                        if debug is True:
+                            output, stderr = client.run(remote_cmd_list, debug=True)
+                            debug_log.append('stderr: {0}'.format(stderr))
+                        else:
+                            output = client.run(remote_cmd_list, debug=False).strip()
+                    except CalledProcessError as cpe:
+                        if cpe.returncode in AlbaCLI.TIMEOUT_EXIT_CODES:
+                            raise AlbaTimeOutException('Command timed out after {0}s'.format(timeout), command)
+                        raise
                     debug_log.append('stdout: {0}'.format(output))
 
                 if to_json is True:
                     output = json.loads(output)
                 else:
                     return output
-                duration = time.time() - start
-                if duration > 0.5:
-                    logger.warning('AlbaCLI call {0} took {1}s'.format(command, round(duration, 2)))
             except CalledProcessError as cpe:
                 try:
                     output = json.loads(cpe.output)
@@ -154,6 +438,11 @@ class AlbaCLI(object):
                 return output['result']
             raise RuntimeError(output['error']['message'])
 
+        except AlbaTimeOutException as ex:
+            logger.error('Error: {0}'.format(ex))
+            for debug_line in debug_log:
+                logger.debug(debug_line)
+            raise
         except Exception as ex:
             logger.exception('Error: {0}'.format(ex))
             # In case there's an exception, we always log
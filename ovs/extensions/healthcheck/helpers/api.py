@@ -0,0 +1,98 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+API client module
+"""
+import time
+from threading import Lock
+from ovs.extensions.healthcheck.helpers.helper import Helper
+from ovs_extensions.api.client import OVSClient
+
+
+class OVSClientPool(object):
+    """
+    Keeps one API client per OVS cluster for the duration of a Healthcheck run, so its OAuth token is re-used
+    GET responses are cached for a short while, so concurrent tests do not query the same data over and over
+    """
+    _clients = {}
+    _responses = {}
+    _fetch_locks = {}
+    _lock = Lock()
+
+    @staticmethod
+    def _get_key(connection_info):
+        return connection_info['host'], int(connection_info['port']), connection_info['client_id']
+
+    @classmethod
+    def get_client(cls, connection_info):
+        """
+        Retrieve the pooled client of an OVS cluster
+        :param connection_info: Connection information as stored in the metadata of a vPool (host, port, client_id, client_secret)
+        :type connection_info: dict
+        :return: The client
+        :rtype: ovs_extensions.api.client.OVSClient
+        """
+        key = cls._get_key(connection_info)
+        with cls._lock:
+            if key not in cls._clients:
+                cls._clients[key] = OVSClient(connection_info['host'], connection_info['port'], (connection_info['client_id'], connection_info['client_secret']))
+            return cls._clients[key]
+
+    @classmethod
+    def get(cls, connection_info, api_url, params=None, ttl=None):
+        """
+        Execute a GET request through the pooled client, or return the response of an identical request
+        which was executed less than 'ttl' seconds ago
+        :param connection_info: Connection information as stored in the metadata of a vPool (host, port, client_id, client_secret)
+        :type connection_info: dict
+        :param api_url: API url to query
+        :type api_url: str
+        :param params: Query parameters
+        :type params: dict
+        :param ttl: Number of seconds a response may be re-used. Defaults to the configured cache TTL
+        :type ttl: float
+        :return: The response
+        :rtype: dict
+        """
+        if ttl is None:
+            ttl = Helper.api_cache_ttl
+        key = (cls._get_key(connection_info), api_url, tuple(sorted((params or {}).iteritems())))
+        with cls._lock:
+            fetch_lock = cls._fetch_locks.setdefault(key, Lock())
+        # Only one thread fetches a response, the others wait for it and use the cached version
+        with fetch_lock:
+            with cls._lock:
+                if key in cls._responses:
+                    fetched_at, response = cls._responses[key]
+                    if time.time() - fetched_at <= ttl:
+                        return response
+            response = cls.get_client(connection_info).get(api_url, params=params)
+            with cls._lock:
+                cls._responses[key] = (time.time(), response)
+            return response
+
+    @classmethod
+    def clear(cls):
+        """
+        Forget all pooled clients and cached responses. To be called at the start and the end of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            cls._clients.clear()
+            cls._responses.clear()
+            cls._fetch_locks.clear()
@@ -0,0 +1,183 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Arakoon cluster module
+"""
+import os
+import json
+import hashlib
+from threading import Lock
+from ovs_extensions.constants.arakoon import ARAKOON_BASE
+from ovs_extensions.constants.config import CACC_LOCATION
+from ovs.extensions.db.arakooninstaller import ArakoonClusterConfig, ArakoonInstaller
+from ovs.extensions.generic.configuration import Configuration
+from ovs.extensions.healthcheck.helpers.cache import CacheHelper
+from ovs.extensions.healthcheck.helpers.executor import Executor
+from ovs.extensions.healthcheck.helpers.helper import Helper
+
+
+class ArakoonClusterHelper(object):
+    """
+    Discovers all Arakoon clusters concurrently, once per Healthcheck run, so every Arakoon test re-uses the same configs and clients
+    The metadata of a cluster is cached across runs for as long as its configuration does not change
+    Pyrakoon clients are not thread safe: the client of a cluster is replaced once a timed out task might still be using it
+    """
+    CACC_NAME = 'cacc'
+    METADATA_CACHE_KEY = 'arakoon_metadata_{0}'
+
+    _clusters = None
+    _stale = set()
+    _lock = Lock()
+
+    @classmethod
+    def get_clusters(cls):
+        """
+        Retrieve all Arakoon clusters of this OVS cluster, discovering them when that did not happen yet during this run
+        :return: The discovered clusters (name, type, client and config) and the clusters which could not be discovered
+        (name, exception and traceback), in the order of the configuration management
+        :rtype: tuple(list[dict], list[tuple])
+        """
+        with cls._lock:
+            if cls._clusters is None:
+                cls._clusters = cls._discover_clusters()
+            elif len(cls._stale) > 0:
+                cls._clusters = cls._replace_clients(*cls._clusters)
+            return cls._clusters
+
+    @classmethod
+    def discard_client(cls, cluster_name):
+        """
+        Stop handing out the client of a cluster, eg: because an abandoned task might still be using it
+        A new client is built the next time the clusters are requested
+        :param cluster_name: Name of the Arakoon cluster
+        :type cluster_name: str
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            cls._stale.add(cluster_name)
+
+    @classmethod
+    def _replace_clients(cls, clusters, errors):
+        """
+        Build new clients for the clusters whose client was discarded
+        Must be called while holding the lock
+        :param clusters: The discovered clusters
+        :type clusters: list[dict]
+        :param errors: The clusters which could not be discovered
+        :type errors: list[tuple]
+        :return: The discovered clusters with their new clients and the clusters which could not be discovered
+        :rtype: tuple(list[dict], list[tuple])
+        """
+        stale_clusters = [cluster for cluster in clusters if cluster['cluster_name'] in cls._stale]
+        cls._stale.clear()
+        executor = Executor(workers=Helper.arakoon_collection_workers)
+        tasks = dict((cluster['cluster_name'], executor.submit(ArakoonInstaller.build_client, args=(cluster['config'],), timeout=Helper.arakoon_collection_node_timeout))
+                     for cluster in stale_clusters)
+        executor.run(timeout=Helper.arakoon_collection_timeout)
+        new_clusters = []
+        new_errors = list(errors)
+        for cluster in clusters:
+            task = tasks.get(cluster['cluster_name'])
+            if task is not None:
+                try:
+                    cluster = dict(cluster, client=task.get())
+                except Exception as ex:
+                    new_errors.append((cluster['cluster_name'], ex, task.traceback))
+                    continue
+            new_clusters.append(cluster)
+        return new_clusters, new_errors
+
+    @classmethod
+    def _discover_clusters(cls):
+        """
+        Load the config, locate the master and retrieve the metadata of every Arakoon cluster concurrently
+        :return: The discovered clusters and the clusters which could not be discovered
+        :rtype: tuple(list[dict], list[tuple])
+        """
+        cluster_names = list(Configuration.list(ARAKOON_BASE)) + [cls.CACC_NAME]
+        executor = Executor(workers=Helper.arakoon_collection_workers)
+        tasks = [executor.submit(cls._load_cluster, args=(cluster_name,), timeout=Helper.arakoon_collection_node_timeout) for cluster_name in cluster_names]
+        executor.run(timeout=Helper.arakoon_collection_timeout)
+        clusters = []
+        errors = []
+        for cluster_name, task in zip(cluster_names, tasks):
+            try:
+                clusters.append(task.get())
+            except Exception as ex:
+                errors.append((cluster_name, ex, task.traceback))
+        return clusters, errors
+
+    @classmethod
+    def _load_cluster(cls, cluster_name):
+        """
+        Load the config of an Arakoon cluster and build a client towards its master
+        :param cluster_name: Name of the Arakoon cluster
+        :type cluster_name: str
+        :return: The name, type, client and config of the cluster
+        :rtype: dict
+        """
+        if cluster_name == cls.CACC_NAME:
+            with open(CACC_LOCATION) as config_file:
+                contents = config_file.read()
+        else:
+            contents = Configuration.get(os.path.join(ARAKOON_BASE, cluster_name, 'config'), raw=True)
+        arakoon_config = ArakoonClusterConfig(cluster_id=cluster_name, load_config=False)
+        arakoon_config.read_config(contents=contents)
+        arakoon_client = ArakoonInstaller.build_client(arakoon_config)
+        metadata = cls._get_metadata(cluster_name, contents, arakoon_client)
+        return {'cluster_name': cluster_name,
+                'cluster_type': metadata['cluster_type'],
+                'client': arakoon_client,
+                'config': arakoon_config}
+
+    @classmethod
+    def _get_metadata(cls, cluster_name, contents, arakoon_client):
+        """
+        Retrieve the metadata of an Arakoon cluster
+        The cached metadata is used as long as the configuration it was retrieved with has not changed
+        :param cluster_name: Name of the Arakoon cluster
+        :type cluster_name: str
+        :param contents: Raw configuration of the Arakoon cluster
+        :type contents: str
+        :param arakoon_client: Client towards the Arakoon cluster
+        :type arakoon_client: ovs_extensions.db.arakoon.pyrakoon.client.PyrakoonClient
+        :return: The metadata
+        :rtype: dict
+        """
+        cache_key = cls.METADATA_CACHE_KEY.format(cluster_name)
+        config_hash = hashlib.md5(contents).hexdigest()
+        try:
+            cached = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            cached = None
+        if isinstance(cached, dict) and cached.get('config_hash') == config_hash:
+            return cached['metadata']
+        metadata = json.loads(arakoon_client.get(ArakoonInstaller.METADATA_KEY))
+        CacheHelper.set(key=cache_key, item={'config_hash': config_hash, 'metadata': metadata})
+        return metadata
+
+    @classmethod
+    def clear(cls):
+        """
+        Forget the discovered clusters and their clients. To be called at the start and the end of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            cls._clusters = None
+            cls._stale.clear()
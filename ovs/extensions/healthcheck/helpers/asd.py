@@ -0,0 +1,344 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+ASD client module
+Speaks the ASD wire protocol directly so a disk can be probed without spawning the alba binary
+"""
+import time
+import socket
+import struct
+from threading import Lock
+from ovs.extensions.healthcheck.helpers.exceptions import ASDException, ASDProtocolException
+from ovs.extensions.healthcheck.helpers.metrics import MetricsHelper
+
+
+class ASDProtocol(object):
+    """
+    Encoding and decoding of the ASD wire protocol (Llio serialization: little endian, length prefixed)
+    """
+    MAGIC = 'aLbA'
+    VERSION = 1
+    # Request codes
+    MULTI_GET = 2
+    APPLY = 3
+    # Update tags
+    UPDATE_SET = 1
+    UPDATE_DELETE = 2
+    # Checksum tags
+    CHECKSUM_NONE = 1
+    # Priorities
+    PRIORITY_HIGH = 0
+    # Return codes
+    RC_OK = 0
+    RC_UNKNOWN_OPERATION = 6
+    RC_PROTOCOL_VERSION_MISMATCH = 7
+    RC_ASD_ID_MISMATCH = 8
+
+    @staticmethod
+    def int32_to(value):
+        return struct.pack('<i', value)
+
+    @staticmethod
+    def bool_to(value):
+        return '\x01' if value is True else '\x00'
+
+    @classmethod
+    def string_to(cls, value):
+        return cls.int32_to(len(value)) + value
+
+    @classmethod
+    def option_to(cls, encode, value):
+        if value is None:
+            return cls.bool_to(False)
+        return cls.bool_to(True) + encode(value)
+
+    @classmethod
+    def list_to(cls, encode, values):
+        # Llio writes the items in reverse order
+        return cls.int32_to(len(values)) + ''.join(encode(value) for value in reversed(values))
+
+    @classmethod
+    def prologue(cls, long_id):
+        """
+        Build the prologue which has to be sent when opening a connection
+        :param long_id: Long ID of the ASD to connect to
+        :type long_id: str
+        :return: The encoded prologue
+        :rtype: str
+        """
+        return cls.MAGIC + cls.int32_to(cls.VERSION) + cls.option_to(cls.string_to, long_id)
+
+    @classmethod
+    def multi_get(cls, keys):
+        """
+        Build the payload of a multi-get request
+        :param keys: Keys to fetch
+        :type keys: list[str]
+        :return: The encoded payload
+        :rtype: str
+        """
+        return cls.list_to(cls.string_to, keys) + cls.int32_to(cls.PRIORITY_HIGH)
+
+    @classmethod
+    def apply(cls, sets=None, deletes=None):
+        """
+        Build the payload of an apply request without any asserts
+        :param sets: Mapping of keys to the values to store
+        :type sets: dict
+        :param deletes: Keys to delete
+        :type deletes: list[str]
+        :return: The encoded payload
+        :rtype: str
+        """
+        updates = []
+        for key, value in (sets or {}).iteritems():
+            updates.append(cls.int32_to(cls.UPDATE_SET) + cls.string_to(key) + cls.string_to(value) +
+                           cls.int32_to(cls.CHECKSUM_NONE) + cls.bool_to(False))
+        for key in deletes or []:
+            updates.append(cls.int32_to(cls.UPDATE_DELETE) + cls.string_to(key))
+        # Every update is already encoded. No asserts are required
+        return cls.int32_to(0) + cls.int32_to(len(updates)) + ''.join(reversed(updates)) + cls.int32_to(cls.PRIORITY_HIGH)
+
+
+class ASDReader(object):
+    """
+    Decodes Llio encoded data from a buffer
+    """
+    def __init__(self, data):
+        self._data = data
+        self._position = 0
+
+    def _take(self, length):
+        if length < 0 or self._position + length > len(self._data):
+            raise ASDProtocolException('Unexpected end of ASD response')
+        data = self._data[self._position:self._position + length]
+        self._position += length
+        return data
+
+    def int32_from(self):
+        return struct.unpack('<i', self._take(4))[0]
+
+    def bool_from(self):
+        value = self._take(1)
+        if value not in ['\x00', '\x01']:
+            raise ASDProtocolException('Invalid boolean {0!r} in ASD response'.format(value))
+        return value == '\x01'
+
+    def string_from(self):
+        return self._take(self.int32_from())
+
+    def option_from(self, decode):
+        return decode() if self.bool_from() is True else None
+
+    def list_from(self, decode):
+        values = [decode() for _ in xrange(self.int32_from())]
+        values.reverse()
+        return values
+
+
+class ASDClient(object):
+    """
+    Client for a single ASD. Keeps one connection open to execute multiple requests
+    """
+    def __init__(self, ip, port, long_id, timeout=10):
+        """
+        :param ip: IP of the ASD
+        :type ip: str
+        :param port: Port of the ASD
+        :type port: int
+        :param long_id: Long ID of the ASD
+        :type long_id: str
+        :param timeout: Timeout (in seconds) for connecting and for every request
+        :type timeout: float
+        """
+        self.ip = ip
+        self.port = int(port)
+        self.long_id = long_id
+        self.timeout = timeout
+        self._socket = None
+
+    @property
+    def target(self):
+        return '{0}:{1}'.format(self.ip, self.port)
+
+    def _receive(self, length):
+        """
+        Receive exactly the given amount of bytes
+        :param length: Number of bytes to receive
+        :type length: int
+        :return: The received data
+        :rtype: str
+        """
+        chunks = []
+        remaining = length
+        while remaining > 0:
+            chunk = self._socket.recv(remaining)
+            if not chunk:
+                raise ASDException('Connection to ASD {0} was closed'.format(self.target))
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return ''.join(chunks)
+
+    def _receive_int32(self):
+        return struct.unpack('<i', self._receive(4))[0]
+
+    def _connect(self):
+        """
+        Open the connection and validate the identity of the ASD
+        :return: None
+        :rtype: NoneType
+        """
+        self._socket = socket.create_connection((self.ip, self.port), timeout=self.timeout)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.sendall(ASDProtocol.prologue(self.long_id))
+        return_code = self._receive_int32()
+        if return_code != ASDProtocol.RC_OK:
+            raise ASDProtocolException('ASD {0} refused the connection with return code {1}'.format(self.target, return_code))
+        reported_id = self._receive(self._receive_int32())
+        if reported_id != self.long_id:
+            raise ASDProtocolException('ASD {0} reported long id {1} instead of {2}'.format(self.target, reported_id, self.long_id))
+
+    def _request(self, name, code, payload):
+        """
+        Execute a request, (re)connecting when required
+        :param name: Name of the request, used for the metrics
+        :type name: str
+        :param code: Code of the request
+        :type code: int
+        :param payload: Encoded payload of the request
+        :type payload: str
+        :return: A reader for the payload of the response
+        :rtype: ASDReader
+        """
+        start = time.time()
+        failed = True
+        try:
+            if self._socket is None:
+                self._connect()
+            message = ASDProtocol.int32_to(code) + payload
+            self._socket.sendall(ASDProtocol.int32_to(len(message)) + message)
+            reader = ASDReader(self._receive(self._receive_int32()))
+            return_code = reader.int32_from()
+            if return_code == ASDProtocol.RC_UNKNOWN_OPERATION:
+                raise ASDProtocolException('ASD {0} does not support request {1}'.format(self.target, code))
+            if return_code != ASDProtocol.RC_OK:
+                raise ASDException('ASD {0} failed request {1} with return code {2}'.format(self.target, name, return_code))
+            failed = False
+            return reader
+        except socket.error as ex:
+            self.close()
+            raise ASDException('Communication with ASD {0} failed: {1}'.format(self.target, ex))
+        except ASDException:
+            self.close()
+            raise
+        finally:
+            MetricsHelper.record_latency('asd', name, self.target, time.time() - start, failed=failed)
+
+    def set(self, key, value):
+        """
+        Store a value
+        :param key: Key to store the value under
+        :type key: str
+        :param value: Value to store
+        :type value: str
+        :return: None
+        :rtype: NoneType
+        """
+        self._request('set', ASDProtocol.APPLY, ASDProtocol.apply(sets={key: value}))
+
+    def get(self, key):
+        """
+        Fetch a value
+        :param key: Key to fetch
+        :type key: str
+        :return: The value or None when the key does not exist
+        :rtype: str
+        """
+        reader = self._request('get', ASDProtocol.MULTI_GET, ASDProtocol.multi_get([key]))
+
+        def _value_from():
+            value = reader.string_from()
+            reader.int32_from()  # Checksum tag, no checksum is stored by this client
+            return value
+        values = reader.list_from(lambda: reader.option_from(_value_from))
+        if len(values) != 1:
+            raise ASDProtocolException('ASD {0} returned {1} values for a single key'.format(self.target, len(values)))
+        return values[0]
+
+    def delete(self, key):
+        """
+        Delete a value
+        :param key: Key to delete
+        :type key: str
+        :return: None
+        :rtype: NoneType
+        """
+        self._request('delete', ASDProtocol.APPLY, ASDProtocol.apply(deletes=[key]))
+
+    def close(self):
+        """
+        Close the connection. A new connection is opened for the next request
+        :return: None
+        :rtype: NoneType
+        """
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except socket.error:
+                pass
+            self._socket = None
+
+
+class ASDClientPool(object):
+    """
+    Keeps one client per ASD for the duration of a Healthcheck run
+    """
+    _clients = {}
+    _lock = Lock()
+
+    @classmethod
+    def get_client(cls, ip, port, long_id, timeout=10):
+        """
+        Retrieve the pooled client of an ASD
+        :param ip: IP of the ASD
+        :type ip: str
+        :param port: Port of the ASD
+        :type port: int
+        :param long_id: Long ID of the ASD
+        :type long_id: str
+        :param timeout: Timeout (in seconds) for connecting and for every request
+        :type timeout: float
+        :return: The client
+        :rtype: ASDClient
+        """
+        key = (ip, int(port), long_id)
+        with cls._lock:
+            if key not in cls._clients:
+                cls._clients[key] = ASDClient(ip, port, long_id, timeout=timeout)
+            return cls._clients[key]
+
+    @classmethod
+    def clear(cls):
+        """
+        Close all pooled connections. To be called at the start and the end of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            for client in cls._clients.itervalues():
+                client.close()
+            cls._clients.clear()
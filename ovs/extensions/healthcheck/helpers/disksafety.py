@@ -0,0 +1,100 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Disk safety module
+"""
+import heapq
+from array import array
+
+
+class DiskSafetyAggregate(object):
+    """
+    Aggregates the disk safety of all namespaces using a single policy
+    Every safety level is a column in typed arrays, so the memory usage does not grow with the amount of namespaces
+    Only the worst namespaces of every safety level are remembered, unless the complete lists are requested
+    """
+    def __init__(self, max_disk_safety, top_k=10, keep_namespaces=False):
+        """
+        :param max_disk_safety: Safety of a fully repaired object
+        :type max_disk_safety: int
+        :param top_k: Number of namespaces with the biggest share of their objects to remember per safety level
+        :type top_k: int
+        :param keep_namespaces: Remember every namespace for every safety level
+        :type keep_namespaces: bool
+        """
+        self.max_disk_safety = max_disk_safety
+        self.top_k = top_k
+        self.keep_namespaces = keep_namespaces
+        self.safety_levels = []
+        self.namespace_counts = array('L')
+        self.object_counts = array('L')
+        self.namespaces = {}  # Only filled in when keep_namespaces is set
+        self._level_indices = {}
+        self._worst_namespaces = []  # Min-heap of (percentage, namespace) per safety level
+
+    def add(self, namespace, safety, count, total_count):
+        """
+        Add a bucket of a namespace
+        :param namespace: Name of the namespace
+        :type namespace: str
+        :param safety: Remaining safety of the objects in the bucket
+        :type safety: int
+        :param count: Number of objects in the bucket
+        :type count: int
+        :param total_count: Number of objects in the namespace
+        :type total_count: int
+        :return: None
+        :rtype: NoneType
+        """
+        index = self._level_indices.get(safety)
+        if index is None:
+            index = len(self.safety_levels)
+            self._level_indices[safety] = index
+            self.safety_levels.append(safety)
+            self.namespace_counts.append(0)
+            self.object_counts.append(0)
+            self._worst_namespaces.append([])
+        self.namespace_counts[index] += 1
+        self.object_counts[index] += count
+        percentage = 100.0 * count / total_count if total_count > 0 else 0.0
+        if self.top_k > 0:
+            heap = self._worst_namespaces[index]
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, (percentage, namespace))
+            elif percentage > heap[0][0]:
+                heapq.heapreplace(heap, (percentage, namespace))
+        if self.keep_namespaces is True:
+            self.namespaces.setdefault(safety, []).append({'namespace': namespace,
+                                                           'amount_in_bucket': '%.5f' % percentage})
+
+    def get_levels(self):
+        """
+        Summarize every safety level, from the lowest to the highest safety
+        :return: The safety, the number of namespaces and objects, the share of the objects of the policy
+        and the worst namespaces (biggest share of their objects first) of every safety level
+        :rtype: list[dict]
+        """
+        total_objects = sum(self.object_counts)
+        levels = []
+        for safety in sorted(self.safety_levels):
+            index = self._level_indices[safety]
+            levels.append({'safety': safety,
+                           'namespace_count': self.namespace_counts[index],
+                           'object_count': self.object_counts[index],
+                           'object_percentage': 100.0 * self.object_counts[index] / total_objects if total_objects > 0 else 0.0,
+                           'worst_namespaces': sorted(self._worst_namespaces[index], reverse=True)})
+        return levels
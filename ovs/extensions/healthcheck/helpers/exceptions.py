@@ -101,4 +101,32 @@ class AlbaTimeOutException(AlbaException):
         super(AlbaTimeOutException, self).__init__(*args)
 
     def __str__(self):
-        return "Command '{0}' has timed out with '{1}'.".format(self.alba_command, self.EXCEPTION_MAPPING.get(self.message, self.message))
\ No newline at end of file
+        return "Command '{0}' has timed out with '{1}'.".format(self.alba_command, self.EXCEPTION_MAPPING.get(self.message, self.message))
+
+
+class ASDException(Exception):
+    """
+    Raised when an ASD could not complete a request
+    """
+    pass
+
+
+class ASDProtocolException(ASDException):
+    """
+    Raised when an ASD does not speak the expected version of the protocol
+    """
+    pass
+
+
+class NodeUnreachableException(Exception):
+    """
+    Raised when a node can not be reached over the network
+    """
+    pass
+
+
+class TaskTimeoutException(Exception):
+    """
+    Raised when a task of the executor did not finish in time
+    """
+    pass
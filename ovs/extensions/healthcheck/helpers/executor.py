@@ -0,0 +1,219 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Executor module
+"""
+import time
+import traceback
+from threading import Condition, Thread
+from ovs.extensions.healthcheck.helpers.exceptions import TaskTimeoutException
+
+
+class ExecutorTask(object):
+    """
+    A single function call executed by the Executor
+    A task which exceeds its timeout is abandoned: it keeps running in the background but its outcome is discarded
+    """
+    def __init__(self, function, args, kwargs, group, timeout):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.group = group
+        self.timeout = timeout
+        self.result = None
+        self.exception = None
+        self.traceback = None
+        self.duration = None
+        self.start_time = None
+        self.finished = False
+        self.timed_out = False
+
+    def execute(self):
+        """
+        Execute the function and capture its result or exception
+        The outcome is only stored by the executor, as the task might have timed out in the meantime
+        :return: The result, the exception, the traceback and the duration
+        :rtype: tuple
+        """
+        result = exception = trace = None
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception as ex:
+            exception = ex
+            trace = traceback.format_exc()
+        return result, exception, trace, time.time() - self.start_time
+
+    def get(self):
+        """
+        Retrieve the result of the function
+        :raises Exception: The exception raised by the function
+        :return: The result of the function
+        :rtype: any
+        """
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+
+class Executor(object):
+    """
+    Executes functions concurrently
+    The amount of functions running at the same time is limited globally and, optionally, per group (eg. per host)
+    Usage:
+        executor = Executor(workers=16, group_limit=4)
+        tasks = [executor.submit(probe, args=(ip,), group=ip) for ip in ips]
+        executor.run()
+        results = [task.get() for task in tasks]
+    """
+    def __init__(self, workers=8, group_limit=None):
+        """
+        :param workers: Maximum amount of functions executing at the same time
+        :type workers: int
+        :param group_limit: Maximum amount of functions of the same group executing at the same time. None for no limit
+        :type group_limit: int
+        """
+        if workers < 1:
+            raise ValueError('At least 1 worker is required')
+        self.workers = workers
+        self.group_limit = group_limit
+        self.tasks = []
+        self._pending = []
+        self._running = {}
+        self._condition = Condition()
+
+    def submit(self, function, args=(), kwargs=None, group=None, timeout=None):
+        """
+        Add a function call to execute
+        :param function: Function to execute
+        :type function: callable
+        :param args: Positional arguments for the function
+        :type args: tuple
+        :param kwargs: Keyword arguments for the function
+        :type kwargs: dict
+        :param group: Group of the call, used to limit concurrency within the group
+        :type group: hashable
+        :param timeout: Number of seconds the call may take once started. None for no limit
+        :type timeout: float
+        :return: The task, holding the result once executed
+        :rtype: ExecutorTask
+        """
+        task = ExecutorTask(function, args, kwargs or {}, group, timeout)
+        self.tasks.append(task)
+        self._pending.append(task)
+        return task
+
+    def _next_task(self):
+        """
+        Wait for a task which can be executed without exceeding the group limit
+        :return: The task to execute or None when all tasks have been picked up
+        :rtype: ExecutorTask
+        """
+        with self._condition:
+            while len(self._pending) > 0:
+                for index, task in enumerate(self._pending):
+                    if self.group_limit is None or task.group is None or self._running.get(task.group, 0) < self.group_limit:
+                        self._running[task.group] = self._running.get(task.group, 0) + 1
+                        task.start_time = time.time()
+                        self._condition.notify_all()  # The deadline of the task starts now
+                        return self._pending.pop(index)
+                self._condition.wait()
+        return None
+
+    def _worker(self):
+        """
+        Execute tasks until none are left
+        :return: None
+        :rtype: NoneType
+        """
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            outcome = task.execute()
+            with self._condition:
+                if task.timed_out is True:
+                    return  # A replacement worker has taken over
+                task.result, task.exception, task.traceback, task.duration = outcome
+                task.finished = True
+                self._running[task.group] -= 1
+                self._condition.notify_all()
+
+    def _start_worker(self):
+        """
+        Start a worker thread
+        :return: None
+        :rtype: NoneType
+        """
+        thread = Thread(target=self._worker)
+        thread.daemon = True
+        thread.start()
+
+    def _abandon(self, task, now):
+        """
+        Mark a task as timed out and start a replacement worker, as the worker of the task remains blocked
+        Must be called while holding the condition
+        :param task: The task which exceeded its timeout
+        :type task: ExecutorTask
+        :param now: Current timestamp
+        :type now: float
+        :return: None
+        :rtype: NoneType
+        """
+        task.timed_out = True
+        task.duration = now - task.start_time if task.start_time is not None else 0
+        task.exception = TaskTimeoutException('Task did not finish within {0:.1f}s'.format(task.duration))
+        if task.start_time is not None:
+            self._running[task.group] -= 1
+            if len(self._pending) > 0:
+                self._start_worker()
+        else:
+            self._pending.remove(task)
+        self._condition.notify_all()
+
+    def run(self, timeout=None):
+        """
+        Execute all submitted function calls and wait for them to finish
+        Tasks exceeding their own timeout or the overall timeout are abandoned and raise a TaskTimeoutException on get()
+        :param timeout: Number of seconds all calls may take together. None for no limit
+        :type timeout: float
+        :return: All tasks, in the order they were submitted
+        :rtype: list[ExecutorTask]
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        for _ in xrange(min(self.workers, len(self._pending))):
+            self._start_worker()
+        with self._condition:
+            while True:
+                now = time.time()
+                next_deadline = deadline
+                unfinished = False
+                for task in self.tasks:
+                    if task.finished is True or task.timed_out is True:
+                        continue
+                    task_deadline = deadline
+                    if task.timeout is not None and task.start_time is not None:
+                        task_deadline = task.start_time + task.timeout if task_deadline is None else min(task_deadline, task.start_time + task.timeout)
+                    if task_deadline is not None and now >= task_deadline:
+                        self._abandon(task, now)
+                        continue
+                    unfinished = True
+                    if task_deadline is not None:
+                        next_deadline = task_deadline if next_deadline is None else min(next_deadline, task_deadline)
+                if unfinished is False:
+                    return self.tasks
+                # Woken up by finishing tasks, tasks which get started and expiring deadlines
+                self._condition.wait(None if next_deadline is None else max(0.0, next_deadline - now))
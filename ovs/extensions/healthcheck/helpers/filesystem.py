@@ -15,10 +15,16 @@
 # but WITHOUT ANY WARRANTY of any kind.
 import os
 import grp
+import zlib
+import errno
+import random
+import binascii
 from pwd import getpwuid
 
 
 class FilesystemHelper(object):
+    CHUNK_SIZE = 64 * 1024
+    MEMORY_BACKED_DIRECTORY = '/dev/shm'
 
     @staticmethod
     def get_owner_of_file(filename):
@@ -56,3 +62,75 @@ class FilesystemHelper(object):
         # fetch file to start compare
         st = os.stat(filename)
         return oct(st.st_mode)[-3:] == str(rights)
+
+    @classmethod
+    def get_temp_directory(cls):
+        """
+        Gets a directory for short lived files. A memory backed directory (tmpfs) is preferred when available
+        :return: the absolute path of the directory
+        :rtype: str
+        """
+        if os.path.isdir(cls.MEMORY_BACKED_DIRECTORY) and os.access(cls.MEMORY_BACKED_DIRECTORY, os.W_OK):
+            return cls.MEMORY_BACKED_DIRECTORY
+        return '/tmp'
+
+    @classmethod
+    def write_random_file(cls, filename, size, seed):
+        """
+        Writes pseudo random contents to a file. The same seed always results in the same contents
+        The checksum is calculated while writing so the file does not have to be read again
+        :param filename: the absolute pathname of the file
+        :type filename: str
+        :param size: size of the file in bytes
+        :type size: int
+        :param seed: seed for the pseudo random generator
+        :type seed: int
+        :return: the CRC32 checksum of the contents
+        :rtype: int
+        """
+        generator = random.Random(seed)
+        checksum = 0
+        remaining = size
+        with open(filename, 'wb') as output_file:
+            while remaining > 0:
+                chunk_size = min(cls.CHUNK_SIZE, remaining)
+                chunk = binascii.unhexlify('{0:0{1}x}'.format(generator.getrandbits(chunk_size * 8), chunk_size * 2))
+                checksum = zlib.crc32(chunk, checksum)
+                output_file.write(chunk)
+                remaining -= chunk_size
+        return checksum & 0xffffffff
+
+    @classmethod
+    def get_checksum_of_file(cls, filename):
+        """
+        Calculates the CRC32 checksum of a file without loading it into memory at once
+        :param filename: the absolute pathname of the file
+        :type filename: str
+        :return: the size of the file in bytes and its CRC32 checksum
+        :rtype: tuple(int, int)
+        """
+        size = 0
+        checksum = 0
+        with open(filename, 'rb') as input_file:
+            while True:
+                chunk = input_file.read(cls.CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                checksum = zlib.crc32(chunk, checksum)
+        return size, checksum & 0xffffffff
+
+    @staticmethod
+    def remove_file(filename):
+        """
+        Removes a file. A file which does not exist is ignored
+        :param filename: the absolute pathname of the file
+        :type filename: str
+        :return: None
+        :rtype: NoneType
+        """
+        try:
+            os.remove(filename)
+        except OSError as ex:
+            if ex.errno != errno.ENOENT:
+                raise
@@ -24,8 +24,8 @@ import platform
 import socket
 import subprocess
 from ovs.extensions.generic.system import System
-from ovs.extensions.generic.sshclient import SSHClient
 from ovs.extensions.generic.configuration import Configuration
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
 from ovs.extensions.packages.packagefactory import PackageFactory
 
 
@@ -50,6 +50,37 @@ class Helper(object):
     rights_dirs = settings["healthcheck"]["rights_dirs"]
     owners_files = settings["healthcheck"]["owners_files"]
     max_hours_zero_disk_safety = settings["healthcheck"]["max_hours_zero_disk_safety"]
+    alba_cli_timeout = settings["healthcheck"]["alba_cli"]["timeout"]
+    alba_cli_command_timeouts = settings["healthcheck"]["alba_cli"]["command_timeouts"]
+    alba_cli_kill_grace_period = settings["healthcheck"]["alba_cli"]["kill_grace_period"]
+    alba_cli_slow_call_threshold = settings["healthcheck"]["alba_cli"]["slow_call_threshold"]
+    metrics_file = settings["healthcheck"]["metrics_file"]
+    asd_probe_native = settings["healthcheck"]["asd_probe"]["native"]
+    asd_probe_timeout = settings["healthcheck"]["asd_probe"]["timeout"]
+    asd_probe_workers = settings["healthcheck"]["asd_probe"]["workers"]
+    asd_probe_workers_per_host = settings["healthcheck"]["asd_probe"]["workers_per_host"]
+    asd_probe_slow_threshold = settings["healthcheck"]["asd_probe"]["slow_threshold"]
+    asd_probe_slow_minimum_latency = settings["healthcheck"]["asd_probe"]["slow_minimum_latency"]
+    asd_probe_node_timeout = settings["healthcheck"]["asd_probe"]["node_timeout"]
+    proxy_bench_min_throughput = settings["healthcheck"]["proxy_bench"]["min_throughput"]
+    proxy_bench_max_latency = settings["healthcheck"]["proxy_bench"]["max_latency"]
+    proxy_bench_max_degradation = settings["healthcheck"]["proxy_bench"]["max_degradation"]
+    proxy_bench_history_size = settings["healthcheck"]["proxy_bench"]["history_size"]
+    persistent_namespace_enabled = settings["healthcheck"]["persistent_namespace"]["enabled"]
+    persistent_namespace_max_age = settings["healthcheck"]["persistent_namespace"]["max_age"]
+    disk_safety_trend_history_hours = settings["healthcheck"]["disk_safety_trend"]["history_hours"]
+    disk_safety_trend_forecast_hours = settings["healthcheck"]["disk_safety_trend"]["forecast_hours"]
+    disk_safety_trend_min_samples = settings["healthcheck"]["disk_safety_trend"]["min_samples"]
+    backend_collection_workers = settings["healthcheck"]["backend_collection"]["workers"]
+    backend_collection_timeout = settings["healthcheck"]["backend_collection"]["timeout"]
+    nsm_forecast_history_days = settings["healthcheck"]["nsm_forecast"]["history_days"]
+    nsm_forecast_days = settings["healthcheck"]["nsm_forecast"]["forecast_days"]
+    nsm_forecast_min_samples = settings["healthcheck"]["nsm_forecast"]["min_samples"]
+    api_cache_ttl = settings["healthcheck"]["api"]["cache_ttl"]
+    arakoon_collection_workers = settings["healthcheck"]["arakoon_collection"]["workers"]
+    arakoon_collection_node_timeout = settings["healthcheck"]["arakoon_collection"]["node_timeout"]
+    arakoon_collection_timeout = settings["healthcheck"]["arakoon_collection"]["timeout"]
+    arakoon_node_status_sample_interval = settings["healthcheck"]["arakoon_node_status"]["sample_interval"]
 
     @staticmethod
     def get_healthcheck_version():
@@ -58,7 +89,7 @@ class Helper(object):
         :return: version number of the installed healthcheck
         :rtype: str
         """
-        client = SSHClient(System.get_my_storagerouter())
+        client = SSHClientPool.get_client(System.get_my_storagerouter())
         package_name = 'openvstorage-health-check'
         package_manager = PackageFactory.get_manager()
         packages = package_manager.get_installed_versions(client=client, package_names=[package_name])
@@ -0,0 +1,180 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Incremental JSON parsing module
+"""
+import re
+import json
+
+
+class AlbaJSONStream(object):
+    """
+    Incrementally parses the JSON output of an ALBA command executed with --to-json
+    Expected format: {"success": true, "result": [<item>, <item>, ...]} or {"success": false, "error": {"message": "..."}}
+    Only a single item of the result is kept in memory at any time
+    """
+    CHUNK_SIZE = 64 * 1024
+    NON_ASCII = re.compile(r'[^\x00-\x7F]+')
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, read, chunk_size=CHUNK_SIZE):
+        """
+        Initialize a stream
+        :param read: Function which returns the next chunk of the output when passed a size. Returns an empty string when no data is left
+        :type read: callable
+        :param chunk_size: Number of bytes to read at once
+        :type chunk_size: int
+        """
+        self.success = None
+        self.error = None
+        self._read = read
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._position = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """
+        Read the next chunk of the output into the buffer. Non-ASCII characters are filtered out
+        :return: False when no data is left
+        :rtype: bool
+        """
+        if self._eof is True:
+            return False
+        chunk = self._read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # Drop the data that has already been parsed
+        self._buffer = self._buffer[self._position:] + self.NON_ASCII.sub('', chunk)
+        self._position = 0
+        return True
+
+    def _skip_whitespace(self):
+        """
+        Move past all whitespace, reading new chunks if required
+        :return: None
+        :rtype: NoneType
+        """
+        while True:
+            self._position = self.WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer) or self._fill() is False:
+                return
+
+    def _expect(self, characters):
+        """
+        Consume the next non-whitespace character, which must be one of the given characters
+        :param characters: Allowed characters
+        :type characters: str
+        :return: The consumed character
+        :rtype: str
+        """
+        self._skip_whitespace()
+        if self._position >= len(self._buffer):
+            raise ValueError('Unexpected end of output, expected one of "{0}"'.format(characters))
+        character = self._buffer[self._position]
+        if character not in characters:
+            raise ValueError('Unexpected character "{0}" at position {1}, expected one of "{2}"'.format(character, self._position, characters))
+        self._position += 1
+        return character
+
+    def _peek(self):
+        """
+        Retrieve the next non-whitespace character without consuming it
+        :return: The next character or None when no data is left
+        :rtype: str
+        """
+        self._skip_whitespace()
+        if self._position >= len(self._buffer):
+            return None
+        return self._buffer[self._position]
+
+    def _decode_value(self):
+        """
+        Decode the next complete JSON value, reading new chunks until the value is complete
+        :return: The decoded value
+        :rtype: any
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except ValueError:
+                if self._fill() is False:
+                    raise
+                continue
+            if end == len(self._buffer) and self._fill() is True:
+                # Numbers and literals could continue in the next chunk
+                continue
+            self._position = end
+            return value
+
+    def _read_remaining(self):
+        """
+        Read all remaining output into the buffer
+        :return: None
+        :rtype: NoneType
+        """
+        while self._fill() is True:
+            pass
+
+    def iter_result(self):
+        """
+        Yield the items of the result one by one
+        The 'success' and 'error' attributes are populated while parsing
+        :raises RuntimeError: When the output reports a failure
+        :raises ValueError: When the output could not be parsed
+        :return: Generator yielding every item of the result
+        :rtype: generator
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._position += 1
+        else:
+            while True:
+                key = self._decode_value()
+                self._expect(':')
+                if key == 'result':
+                    if self._peek() != '[':
+                        raise ValueError('The result is not a list and cannot be streamed')
+                    self._position += 1
+                    if self._peek() == ']':
+                        self._position += 1
+                    else:
+                        while True:
+                            yield self._decode_value()
+                            if self._expect(',]') == ']':
+                                break
+                else:
+                    if self._peek() not in ['[', '{']:
+                        value = self._decode_value()
+                    else:
+                        # Avoid decoding a large value over and over while it is still incomplete
+                        self._read_remaining()
+                        value = self._decode_value()
+                    if key == 'success':
+                        self.success = value
+                    elif key == 'error':
+                        self.error = value
+                if self._expect(',}') == '}':
+                    break
+        if self.success is not True:
+            message = 'Unknown error'
+            if isinstance(self.error, dict):
+                message = self.error.get('message', message)
+            raise RuntimeError(message)
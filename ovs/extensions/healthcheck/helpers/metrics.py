@@ -0,0 +1,145 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Metrics module
+"""
+import os
+import json
+import time
+from threading import Lock
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latencies (in seconds)
+    Every bucket counts the samples that are smaller or equal than its upper bound and bigger than the previous bound
+    """
+    BUCKET_BOUNDS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300]
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.buckets = [0] * (len(self.BUCKET_BOUNDS) + 1)  # Last bucket holds everything above the highest bound
+
+    def add(self, duration, failed=False):
+        """
+        Add a sample to the histogram
+        :param duration: Duration of the call (in seconds)
+        :type duration: float
+        :param failed: Whether the call failed
+        :type failed: bool
+        :return: None
+        :rtype: NoneType
+        """
+        self.count += 1
+        self.total += duration
+        if failed is True:
+            self.failures += 1
+        self.minimum = duration if self.minimum is None else min(self.minimum, duration)
+        self.maximum = duration if self.maximum is None else max(self.maximum, duration)
+        for index, bound in enumerate(self.BUCKET_BOUNDS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self):
+        """
+        Serialize the histogram
+        :return: The histogram in a JSON serializable format
+        :rtype: dict
+        """
+        bucket_names = ['<={0}'.format(bound) for bound in self.BUCKET_BOUNDS] + ['+Inf']
+        return {'count': self.count,
+                'failures': self.failures,
+                'sum': round(self.total, 4),
+                'min': None if self.minimum is None else round(self.minimum, 4),
+                'max': None if self.maximum is None else round(self.maximum, 4),
+                'buckets': dict(zip(bucket_names, self.buckets))}
+
+
+class MetricsHelper(object):
+    """
+    Collects the metrics of a single Healthcheck run
+    Metrics are grouped by category (eg. 'alba_cli'), name (eg. the command) and target (eg. host:port)
+    """
+    _histograms = {}
+    _lock = Lock()
+
+    @classmethod
+    def record_latency(cls, category, name, target, duration, failed=False):
+        """
+        Record the latency of a call
+        :param category: Category of the call, eg: 'alba_cli'
+        :type category: str
+        :param name: Name of the call, eg: 'list-presets'
+        :type name: str
+        :param target: Target of the call, eg: '10.100.1.1:8870'
+        :type target: str
+        :param duration: Duration of the call (in seconds)
+        :type duration: float
+        :param failed: Whether the call failed
+        :type failed: bool
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            key = (category, name, target)
+            if key not in cls._histograms:
+                cls._histograms[key] = LatencyHistogram()
+            cls._histograms[key].add(duration, failed=failed)
+
+    @classmethod
+    def get_metrics(cls):
+        """
+        Retrieve all collected metrics
+        Example output: {'alba_cli': {'list-presets': {'mybackend-abm': {'count': 1, 'failures': 0, 'sum': 0.21, 'min': 0.21, 'max': 0.21, 'buckets': {...}}}}}
+        :return: All histograms by category, name and target
+        :rtype: dict
+        """
+        metrics = {}
+        with cls._lock:
+            for (category, name, target), histogram in cls._histograms.iteritems():
+                metrics.setdefault(category, {}).setdefault(name, {})[target] = histogram.to_dict()
+        return metrics
+
+    @classmethod
+    def write(cls, path):
+        """
+        Write all collected metrics to a file. The file is replaced atomically
+        :param path: Path of the file
+        :type path: str
+        :return: None
+        :rtype: NoneType
+        """
+        temp_path = '{0}.tmp'.format(path)
+        with open(temp_path, 'w') as metrics_file:
+            json.dump({'timestamp': time.time(), 'metrics': cls.get_metrics()}, metrics_file, indent=4, sort_keys=True)
+        os.rename(temp_path, path)
+
+    @classmethod
+    def clear(cls):
+        """
+        Remove all collected metrics. To be called at the start of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            cls._histograms.clear()
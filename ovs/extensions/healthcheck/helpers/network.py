@@ -13,6 +13,7 @@
 #
 # Open vStorage is distributed in the hope that it will be useful,
 # but WITHOUT ANY WARRANTY of any kind.
+import errno
 import socket
 
 
@@ -33,6 +34,28 @@ class NetworkHelper(object):
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         return sock.connect_ex((ip, int(port_number))) == 0
 
+    @staticmethod
+    def is_host_reachable(ip, port_number, timeout=2):
+        """
+        Checks whether a host answers on the network. A refused connection means that the host is up while the service is not
+        :param ip: IP address to try
+        :type ip: str
+        :param port_number: Port number to connect to
+        :type port_number: int
+        :param timeout: Amount of seconds to wait for an answer
+        :type timeout: float
+        :return: True if the host answered; False if it did not
+        :rtype: bool
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            return sock.connect_ex((ip, int(port_number))) in [0, errno.ECONNREFUSED]
+        except socket.error:
+            return False
+        finally:
+            sock.close()
+
     @staticmethod
     def check_if_dns_resolves(fqdn='google.com'):
         """
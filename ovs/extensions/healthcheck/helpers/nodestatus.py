@@ -0,0 +1,93 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Arakoon node status module
+"""
+import operator
+
+
+class NodeStatusHelper(object):
+    """
+    Classifies the nodes of an Arakoon cluster based on the amount of transactions every node has applied
+    """
+    UP_TO_DATE = 'up_to_date'
+    BEHIND = 'behind'
+    CATCHING_UP = 'catching_up'
+    FALLING_BEHIND = 'falling_behind'
+
+    @staticmethod
+    def get_transactions_behind(node_is):
+        """
+        Calculate how many transactions every node is behind the node with the most transactions
+        :param node_is: The amount of transactions for every node name
+        :type node_is: dict
+        :return: The amount of transactions behind for every node name, except for the node with the most transactions
+        :rtype: dict
+        """
+        if len(node_is) == 0:
+            return {}
+        highest_id = max(node_is.iteritems(), key=operator.itemgetter(1))[0]
+        return dict((node_id, node_is[highest_id] - transactions) for node_id, transactions in node_is.iteritems() if node_id != highest_id)
+
+    @classmethod
+    def has_lagging_nodes(cls, node_is, max_transactions_behind):
+        """
+        Determine whether any node of an Arakoon cluster is catching up or too far behind
+        :param node_is: The amount of transactions for every node name
+        :type node_is: dict
+        :param max_transactions_behind: The number of transactions that a slave can be behind a master
+        :type max_transactions_behind: int
+        :return: True when any node is lagging
+        :rtype: bool
+        """
+        return any(node_is[node_id] == 0 or transactions_behind > max_transactions_behind
+                   for node_id, transactions_behind in cls.get_transactions_behind(node_is).iteritems())
+
+    @classmethod
+    def get_node_states(cls, node_is, max_transactions_behind, later_node_is=None, elapsed=0):
+        """
+        Classify every node which is not the node with the most transactions
+        When a second sample is given, the rate at which the lagging nodes catch up is taken into account
+        :param node_is: The amount of transactions for every node name
+        :type node_is: dict
+        :param max_transactions_behind: The number of transactions that a slave can be behind a master
+        :type max_transactions_behind: int
+        :param later_node_is: The amount of transactions for every node name, sampled 'elapsed' seconds later. None when sampled only once
+        :type later_node_is: dict
+        :param elapsed: Seconds between both samples
+        :type elapsed: float
+        :return: The state, the amount of transactions behind and the rate at which the node catches up (transactions/s,
+        negative when falling further behind, None when unknown) for every node name
+        :rtype: dict
+        """
+        later_behind = cls.get_transactions_behind(later_node_is or {})
+        states = {}
+        for node_id, transactions_behind in cls.get_transactions_behind(node_is).iteritems():
+            lagging = node_is[node_id] == 0 or transactions_behind > max_transactions_behind
+            rate = None
+            if node_id in later_behind and elapsed > 0:
+                rate = (transactions_behind - later_behind[node_id]) / float(elapsed)
+            if lagging is False:
+                state = cls.UP_TO_DATE
+            elif rate is not None and rate < 0:
+                state = cls.FALLING_BEHIND
+            elif node_is[node_id] == 0 or (rate is not None and rate > 0):
+                state = cls.CATCHING_UP
+            else:
+                state = cls.BEHIND
+            states[node_id] = (state, transactions_behind, rate)
+        return states
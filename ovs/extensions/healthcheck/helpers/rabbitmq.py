@@ -22,7 +22,7 @@ from requests import ConnectionError
 from StringIO import StringIO
 from ovs.dal.lists.storagerouterlist import StorageRouterList
 from ovs.extensions.generic.configuration import Configuration
-from ovs.extensions.generic.sshclient import SSHClient
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
 from ovs.extensions.services.servicefactory import ServiceFactory
 
 
@@ -47,7 +47,7 @@ class RabbitMQ(object):
         self.ip = ip
         if RabbitMQ.INTERNAL:
             self._storagerouter = StorageRouterList.get_by_ip(ip)
-            self._client = SSHClient(ip, username='root')
+            self._client = SSHClientPool.get_client(ip, username='root')
 
         if not self.check_management_plugin():
             self.enable_management_plugin()
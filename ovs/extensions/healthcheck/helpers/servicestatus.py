@@ -0,0 +1,150 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Service status module
+"""
+from threading import Lock
+from ovs.extensions.healthcheck.logger import Logger
+
+
+class ServiceStatusHelper(object):
+    """
+    Fetches the state of many services with a single call (systemctl show or initctl list) instead of one call per service
+    The states are cached for the rest of the Healthcheck run
+    """
+    logger = Logger('healthcheck-service_status')
+
+    _cache = {}
+    _init_systems = {}
+    _lock = Lock()
+
+    @classmethod
+    def clear(cls):
+        """
+        Forget all cached states. Called at the start of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            cls._cache.clear()
+            cls._init_systems.clear()
+
+    @classmethod
+    def get_service_statuses(cls, service_names, client, service_manager):
+        """
+        Retrieve the state of the services on the node of the client
+        Services which could not be found through the bulk call are asked to the service manager one by one
+        :param service_names: Names of the services
+        :type service_names: list[str]
+        :param client: Client on the node running the services
+        :type client: ovs.extensions.generic.sshclient.SSHClient
+        :param service_manager: Service manager of the node, used as fallback
+        :type service_manager: ovs.extensions.services.interfaces.manager.Manager
+        :return: The state of every service, eg: {'ovs-workers': 'active'}
+        :rtype: dict
+        """
+        with cls._lock:
+            missing = [name for name in service_names if (client.ip, name) not in cls._cache]
+        if len(missing) > 0:
+            statuses = cls._fetch_statuses(missing, client)
+            for name in missing:
+                if name not in statuses:
+                    statuses[name] = service_manager.get_service_status(name, client)
+            with cls._lock:
+                for name, status in statuses.iteritems():
+                    cls._cache[(client.ip, name)] = status
+        with cls._lock:
+            return dict((name, cls._cache[(client.ip, name)]) for name in service_names)
+
+    @classmethod
+    def _fetch_statuses(cls, service_names, client):
+        """
+        Retrieve the state of the services with a single call
+        :param service_names: Names of the services
+        :type service_names: list[str]
+        :param client: Client on the node running the services
+        :type client: ovs.extensions.generic.sshclient.SSHClient
+        :return: The state of the services which were found
+        :rtype: dict
+        """
+        try:
+            if cls._get_init_system(client) == 'systemd':
+                output = client.run(['systemctl', 'show', '--property=Id,LoadState,ActiveState', '--'] + ['{0}.service'.format(name) for name in service_names])
+                return cls._parse_systemctl_show(output, service_names)
+            return cls._parse_initctl_list(client.run(['initctl', 'list']), service_names)
+        except Exception:
+            cls.logger.exception('Unable to fetch the state of {0} services at once'.format(len(service_names)))
+            return {}
+
+    @classmethod
+    def _get_init_system(cls, client):
+        """
+        Determine the init system of the node of the client
+        :param client: Client on the node
+        :type client: ovs.extensions.generic.sshclient.SSHClient
+        :return: 'systemd' or 'upstart'
+        :rtype: str
+        """
+        with cls._lock:
+            if client.ip in cls._init_systems:
+                return cls._init_systems[client.ip]
+        init_system = 'systemd' if 'systemd' in client.run(['cat', '/proc/1/comm']) else 'upstart'
+        with cls._lock:
+            cls._init_systems[client.ip] = init_system
+        return init_system
+
+    @staticmethod
+    def _parse_systemctl_show(output, service_names):
+        """
+        Parse the output of systemctl show. Every unit is a block of key=value lines, blocks are separated by an empty line
+        :param output: Output of systemctl show --property=Id,LoadState,ActiveState
+        :type output: str
+        :param service_names: Names of the requested services
+        :type service_names: list[str]
+        :return: The ActiveState of the services which are known to systemd
+        :rtype: dict
+        """
+        statuses = {}
+        requested = set(service_names)
+        for block in output.strip().split('\n\n'):
+            properties = dict(line.split('=', 1) for line in block.splitlines() if '=' in line)
+            name = properties.get('Id', '')
+            if name.endswith('.service'):
+                name = name[:-len('.service')]
+            if name in requested and properties.get('LoadState') != 'not-found' and 'ActiveState' in properties:
+                statuses[name] = properties['ActiveState']
+        return statuses
+
+    @staticmethod
+    def _parse_initctl_list(output, service_names):
+        """
+        Parse the output of initctl list, eg: 'ovs-workers start/running, process 1234'
+        :param output: Output of initctl list
+        :type output: str
+        :param service_names: Names of the requested services
+        :type service_names: list[str]
+        :return: The state of the services which are known to upstart, 'active' when running and 'inactive' otherwise
+        :rtype: dict
+        """
+        statuses = {}
+        requested = set(service_names)
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) < 2 or parts[0] not in requested:
+                continue
+            statuses[parts[0]] = 'active' if parts[1].rstrip(',') == 'start/running' else 'inactive'
+        return statuses
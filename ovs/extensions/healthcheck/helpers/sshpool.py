@@ -0,0 +1,118 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+SSH client pool module
+"""
+from contextlib import contextmanager
+from threading import BoundedSemaphore, Lock
+from ovs.extensions.generic.sshclient import SSHClient
+
+
+class SSHClientPool(object):
+    """
+    Keeps one authenticated SSHClient per host and user for the duration of a Healthcheck run
+    Hosts which could not be connected to are remembered as well, so every suite does not wait for the same timeout again
+    """
+    # Stay below the default MaxSessions (10) of sshd
+    SESSIONS_PER_HOST = 8
+
+    _clients = {}
+    _failures = {}
+    _sessions = {}
+    _connect_locks = {}
+    _lock = Lock()
+
+    @staticmethod
+    def _get_ip(endpoint):
+        return endpoint.ip if hasattr(endpoint, 'ip') else endpoint
+
+    @classmethod
+    def get_client(cls, endpoint, username='ovs', timeout=None):
+        """
+        Retrieve the pooled client of a host
+        :param endpoint: IP or StorageRouter to connect to
+        :type endpoint: str|ovs.dal.hybrids.storagerouter.StorageRouter
+        :param username: User to connect as
+        :type username: str
+        :param timeout: Timeout (in seconds) for connecting. Only used when no client was pooled yet
+        :type timeout: float
+        :raises Exception: The exception raised while connecting, also when it was raised earlier during this run
+        :return: The client
+        :rtype: ovs.extensions.generic.sshclient.SSHClient
+        """
+        key = (cls._get_ip(endpoint), username)
+        with cls._lock:
+            connect_lock = cls._connect_locks.setdefault(key, Lock())
+        # Connecting to a host does not hold up connecting to the other hosts
+        with connect_lock:
+            with cls._lock:
+                if key in cls._failures:
+                    raise cls._failures[key]
+                if key in cls._clients:
+                    return cls._clients[key]
+            try:
+                client = SSHClient(endpoint, username=username, timeout=timeout)
+            except Exception as ex:
+                with cls._lock:
+                    cls._failures[key] = ex
+                raise
+            with cls._lock:
+                cls._clients[key] = client
+            return client
+
+    @classmethod
+    @contextmanager
+    def session(cls, endpoint, username='ovs', timeout=None):
+        """
+        Retrieve the pooled client of a host, waiting until the host has a session available
+        Usage:
+            with SSHClientPool.session(ip) as client:
+                client.run(['uptime'])
+        :param endpoint: IP or StorageRouter to connect to
+        :type endpoint: str|ovs.dal.hybrids.storagerouter.StorageRouter
+        :param username: User to connect as
+        :type username: str
+        :param timeout: Timeout (in seconds) for connecting. Only used when no client was pooled yet
+        :type timeout: float
+        :return: The client
+        :rtype: ovs.extensions.generic.sshclient.SSHClient
+        """
+        ip = cls._get_ip(endpoint)
+        with cls._lock:
+            if ip not in cls._sessions:
+                cls._sessions[ip] = BoundedSemaphore(cls.SESSIONS_PER_HOST)
+            semaphore = cls._sessions[ip]
+        with semaphore:
+            yield cls.get_client(endpoint, username=username, timeout=timeout)
+
+    @classmethod
+    def clear(cls):
+        """
+        Close all pooled connections. To be called at the start and the end of every Healthcheck run
+        :return: None
+        :rtype: NoneType
+        """
+        with cls._lock:
+            for client in cls._clients.itervalues():
+                try:
+                    client._disconnect()
+                except Exception:
+                    pass  # The connection is dropped together with the client either way
+            cls._clients.clear()
+            cls._failures.clear()
+            cls._sessions.clear()
+            cls._connect_locks.clear()
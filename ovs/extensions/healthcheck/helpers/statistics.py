@@ -0,0 +1,118 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Statistics module
+"""
+
+
+class StatisticsHelper(object):
+    """
+    Robust statistics on small samples
+    """
+    # Scales the median absolute deviation to the standard deviation of a normal distribution
+    MAD_SCALE = 0.6745
+
+    @staticmethod
+    def percentile(values, percentile):
+        """
+        Calculate a percentile using linear interpolation between the closest ranks
+        :param values: Samples
+        :type values: list[float]
+        :param percentile: Percentile to calculate (0-100)
+        :type percentile: float
+        :return: The percentile or None when there are no samples
+        :rtype: float
+        """
+        if len(values) == 0:
+            return None
+        ordered = sorted(values)
+        rank = (len(ordered) - 1) * percentile / 100.0
+        lower = int(rank)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    @classmethod
+    def median(cls, values):
+        """
+        Calculate the median
+        :param values: Samples
+        :type values: list[float]
+        :return: The median or None when there are no samples
+        :rtype: float
+        """
+        return cls.percentile(values, 50)
+
+    @classmethod
+    def median_absolute_deviation(cls, values):
+        """
+        Calculate the median absolute deviation (MAD)
+        :param values: Samples
+        :type values: list[float]
+        :return: The MAD or None when there are no samples
+        :rtype: float
+        """
+        median = cls.median(values)
+        if median is None:
+            return None
+        return cls.median([abs(value - median) for value in values])
+
+    @classmethod
+    def distribution(cls, values):
+        """
+        Summarize a distribution
+        :param values: Samples
+        :type values: list[float]
+        :return: Count, minimum, median, 95th percentile and maximum of the samples
+        :rtype: dict
+        """
+        if len(values) == 0:
+            return {'count': 0, 'min': None, 'median': None, 'p95': None, 'max': None}
+        return {'count': len(values),
+                'min': min(values),
+                'median': cls.median(values),
+                'p95': cls.percentile(values, 95),
+                'max': max(values)}
+
+    @classmethod
+    def find_outliers(cls, samples, threshold=3.5, minimum_value=0.0, minimum_samples=5, minimum_deviation=0.001):
+        """
+        Find the samples which are significantly higher than the others, based on the modified z-score:
+        0.6745 * (value - median) / MAD
+        :param samples: Value for every key
+        :type samples: dict
+        :param threshold: Modified z-score above which a sample is an outlier
+        :type threshold: float
+        :param minimum_value: Samples below this value are never outliers
+        :type minimum_value: float
+        :param minimum_samples: Minimum amount of samples required to detect outliers
+        :type minimum_samples: int
+        :param minimum_deviation: Lower bound for the MAD, avoids flagging tiny differences when most samples are (nearly) equal
+        :type minimum_deviation: float
+        :return: The modified z-score of every outlier
+        :rtype: dict
+        """
+        if len(samples) < minimum_samples:
+            return {}
+        values = samples.values()
+        median = cls.median(values)
+        mad = max(cls.median_absolute_deviation(values), minimum_deviation)
+        outliers = {}
+        for key, value in samples.iteritems():
+            score = cls.MAD_SCALE * (value - median) / mad
+            if value >= minimum_value and score > threshold:
+                outliers[key] = score
+        return outliers
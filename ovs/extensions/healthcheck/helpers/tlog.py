@@ -0,0 +1,74 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Arakoon tlog directory module
+"""
+import pipes
+
+
+class TlogHelper(object):
+    """
+    Summarizes the tlog directory of an Arakoon node on the node itself, so only a couple of lines are transferred regardless of the amount of files
+    """
+    # Example output:
+    # tlx 3392 1513166090 1513174418
+    # tlog 1 1513178427 1513178427
+    # headdb 104857600
+    # avail 5368709120
+    COLLAPSE_PROBE = ("find {0} -mindepth 1 -maxdepth 1 -printf '%T@ %s %f\\n' | "
+                      "awk '{{timestamp = int($1); "
+                      "if ($3 ~ /tlx$/) type = \"tlx\"; else if ($3 ~ /tlog$/) type = \"tlog\"; else {{ if ($3 ~ /^head\\.db/) headdb += $2; next }} "
+                      "if (!(type in count) || timestamp < oldest[type]) oldest[type] = timestamp; "
+                      "if (!(type in count) || timestamp > youngest[type]) youngest[type] = timestamp; "
+                      "count[type]++}} "
+                      "END {{for (type in count) print type, count[type], oldest[type], youngest[type]; print \"headdb\", headdb + 0}}'; "
+                      "df -B1 --output=avail {0} | tail -1 | awk '{{print \"avail\", $1}}'")
+
+    @classmethod
+    def get_collapse_probe(cls, tlog_dir):
+        """
+        Build the shell command which summarizes a tlog directory
+        :param tlog_dir: Tlog directory of the Arakoon node
+        :type tlog_dir: str
+        :return: The command, to be executed by a shell
+        :rtype: str
+        """
+        return cls.COLLAPSE_PROBE.format(pipes.quote(tlog_dir))
+
+    @staticmethod
+    def parse_collapse_probe(probe_output):
+        """
+        Parse the output of the collapse probe
+        :param probe_output: Output of the command built by get_collapse_probe
+        :type probe_output: str
+        :return: The amount, oldest and youngest modification time of the tlx and tlog files,
+        the total size of the head.db files and the available size (in bytes, None when unknown)
+        :rtype: dict
+        """
+        output = {'tlx': {'count': 0, 'oldest': None, 'youngest': None},
+                  'tlog': {'count': 0, 'oldest': None, 'youngest': None},
+                  'headdb_size': 0,
+                  'avail_size': None}
+        for line in probe_output.splitlines():
+            fields = line.split()
+            if len(fields) == 4 and fields[0] in ['tlx', 'tlog']:
+                output[fields[0]] = {'count': int(fields[1]), 'oldest': int(fields[2]), 'youngest': int(fields[3])}
+            elif len(fields) == 2 and fields[0] == 'headdb':
+                output['headdb_size'] = int(fields[1])
+            elif len(fields) == 2 and fields[0] == 'avail':
+                output['avail_size'] = int(fields[1])
+        return output
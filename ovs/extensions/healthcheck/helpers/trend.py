@@ -0,0 +1,83 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+
+"""
+Trend module
+"""
+
+
+class TrendHelper(object):
+    """
+    Trends of values sampled over time
+    Points are (timestamp, value) tuples, the timestamps are in seconds
+    """
+
+    @staticmethod
+    def linear_regression(points):
+        """
+        Fit a line through the points using the least squares method
+        :param points: Samples
+        :type points: list[tuple(float, float)]
+        :return: The slope (change per second) and the intercept or None when no line can be fitted
+        :rtype: tuple(float, float)
+        """
+        if len(points) < 2:
+            return None
+        count = float(len(points))
+        mean_x = sum(x for x, _ in points) / count
+        mean_y = sum(y for _, y in points) / count
+        variance_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if variance_x == 0:
+            return None
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance_x
+        return slope, mean_y - slope * mean_x
+
+    @classmethod
+    def time_until(cls, points, target):
+        """
+        Estimate the time until the value reaches the target, starting from the last point and following the trend of all points
+        :param points: Samples
+        :type points: list[tuple(float, float)]
+        :param target: Value to reach
+        :type target: float
+        :return: The number of seconds, 0 when the target has been reached or None when the trend does not move towards the target
+        :rtype: float
+        """
+        regression = cls.linear_regression(points)
+        if regression is None:
+            return None
+        slope = regression[0]
+        remaining = target - points[-1][1]
+        if remaining == 0:
+            return 0.0
+        if slope == 0 or (remaining > 0) != (slope > 0):
+            return None
+        return remaining / slope
+
+    @staticmethod
+    def prune(samples, max_age, now):
+        """
+        Drop the samples which are older than the maximum age
+        :param samples: Samples, every sample is a dict with a 'time' key
+        :type samples: list[dict]
+        :param max_age: Maximum age in seconds
+        :type max_age: float
+        :param now: Current timestamp
+        :type now: float
+        :return: The remaining samples
+        :rtype: list[dict]
+        """
+        return [sample for sample in samples if now - sample['time'] <= max_age]
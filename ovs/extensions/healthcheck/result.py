@@ -92,6 +92,35 @@ class HCResults(object):
             """
             return lambda *args, **kwargs: getattr(self._result, item)(test_name=self._test_name, *args, **kwargs)
 
+    class HCResultRecorder(object):
+        """
+        Records all calls instead of forwarding them, to replay them on a result handler later on
+        Usage is to keep the output of tests which run concurrently together and in order
+        """
+        def __init__(self):
+            self._calls = []
+
+        def __getattr__(self, item):
+            """
+            Get attribute. Returns a method which records the call
+            :param item: item to get (method from HCResults)
+            :type item: str
+            :return: method which records the call
+            :rtype: method
+            """
+            return lambda *args, **kwargs: self._calls.append((item, args, kwargs))
+
+        def replay(self, result_handler):
+            """
+            Execute all recorded calls on the given result handler
+            :param result_handler: Instance of HCResults or HCResultCollector
+            :type result_handler: HCResults
+            :return: None
+            :rtype: NoneType
+            """
+            for item, args, kwargs in self._calls:
+                getattr(result_handler, item)(*args, **kwargs)
+
     LINE_COLOR = '\033[0m'
 
     def __init__(self, unattended=False, to_json=False):
@@ -150,9 +179,12 @@ class HCResults(object):
         if self.print_progress:
             print "{0}[{1}] {2}{3}".format(severity.color, print_value, self.LINE_COLOR, str(message))
 
-    def get_results(self):
+    def get_results(self, metrics=None):
         """
         Prints the result for check_mk
+        :param metrics: Metrics collected during the run. When given, the JSON output holds the test results under the 'result' key
+        and the metrics under the 'metrics' key. Otherwise it only holds the test results
+        :type metrics: dict
         :return: results
         :rtype: dict
         """
@@ -163,7 +195,10 @@ class HCResults(object):
                             print "{0} {1}".format(key, value["state"])
         if self.to_json:
             import json
-            print json.dumps(self.result_dict, indent=4, sort_keys=True)
+            output = self.result_dict
+            if metrics is not None:
+                output = {'result': self.result_dict, 'metrics': metrics}
+            print json.dumps(output, indent=4, sort_keys=True)
         return self.result_dict
 
     def failure(self, msg, add_to_result=True, code=ErrorCodes.default, **kwargs):
@@ -22,28 +22,38 @@ Alba Health Check Module
 from __future__ import absolute_import
 
 import os
+import json
 import math
 import uuid
 import time
 import hashlib
-import subprocess
 from ovs.dal.lists.albabackendlist import AlbaBackendList
-from ovs_extensions.api.client import OVSClient
 from ovs_extensions.constants.vpools import PROXY_CONFIG_ABM
 from ovs_extensions.db.arakoon.pyrakoon.pyrakoon.compat import ArakoonNotFound, ArakoonNoMaster, ArakoonNoMasterResult
 from ovs.extensions.generic.configuration import Configuration, NotFoundException
-from ovs.extensions.generic.sshclient import SSHClient
 from ovs.extensions.generic.system import System
 from ovs.extensions.healthcheck.config.error_codes import ErrorCodes
 from ovs.extensions.healthcheck.decorators import cluster_check
 from ovs.extensions.healthcheck.expose_to_cli import expose_to_cli, HealthCheckCLI
 from ovs.extensions.healthcheck.helpers.albacli import AlbaCLI
+from ovs.extensions.healthcheck.helpers.api import OVSClientPool
+from ovs.extensions.healthcheck.helpers.asd import ASDClientPool
 from ovs.extensions.healthcheck.helpers.backend import BackendHelper
+from ovs.extensions.healthcheck.helpers.cache import CacheHelper
+from ovs.extensions.healthcheck.helpers.disksafety import DiskSafetyAggregate
 from ovs.extensions.healthcheck.helpers.exceptions import AlbaException, AlbaTimeOutException,  ConfigNotMatchedException,\
-    ConnectionFailedException, DiskNotFoundException, ObjectNotFoundException
+    ConnectionFailedException, DiskNotFoundException, ObjectNotFoundException, ASDException, NodeUnreachableException, TaskTimeoutException
+from ovs.extensions.healthcheck.helpers.executor import Executor
+from ovs.extensions.healthcheck.helpers.filesystem import FilesystemHelper
+from ovs.extensions.healthcheck.helpers.helper import Helper
 from ovs.extensions.healthcheck.helpers.network import NetworkHelper
 from ovs.extensions.healthcheck.helpers.service import ServiceHelper
+from ovs.extensions.healthcheck.helpers.servicestatus import ServiceStatusHelper
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
+from ovs.extensions.healthcheck.helpers.statistics import StatisticsHelper
+from ovs.extensions.healthcheck.helpers.trend import TrendHelper
 from ovs.extensions.healthcheck.logger import Logger
+from ovs.extensions.healthcheck.result import HCResults
 from ovs.extensions.services.servicefactory import ServiceFactory
 from ovs.lib.alba import AlbaController
 from ovs_extensions.generic.toolbox import ExtensionsToolbox
@@ -54,13 +64,24 @@ class AlbaHealthCheck(object):
     A healthcheck for Alba storage layer
     """
     MODULE = 'alba'
-    TEMP_FILE_SIZE = 1024 ** 2
+    TEMP_FILE_SIZE = 1024 ** 2  # Default size of the object uploaded through the proxies
     LOCAL_SR = System.get_my_storagerouter()
     LOCAL_ID = System.get_my_machine_id()
-    TEMP_FILE_LOC = '/tmp/ovs-hc.xml'  # To be put in alba file
-    TEMP_FILE_FETCHED_LOC = '/tmp/ovs-hc-fetched.xml'  # Fetched (from alba) file location
+    TEMP_FILE_NAME = 'ovs-hc-{0}.xml'  # To be put in alba file. Formatted with the object key
+    TEMP_FILE_FETCHED_NAME = 'ovs-hc-fetched-{0}.xml'  # Fetched (from alba) file name. Formatted with the object key
     NAMESPACE_TIMEOUT = 30  # In seconds
+    NAMESPACE_DELETE_WORKERS = 8
+    NAMESPACE_POLL_INTERVAL = 1  # In seconds
+    NAMESPACE_NOT_FOUND_ERROR = 'Namespace_does_not_exist'  # Error of the ALBA manager when showing a namespace which does not exist
+    TEST_NAMESPACE_PREFIX = 'ovs-healthcheck-ns-{0}-{1}'  # Formatted with the preset and the local id
+    BENCH_NAMESPACE_PREFIX = 'ovs-healthcheck-bench-{0}-{1}'  # Formatted with the preset and the local id
     BASE_NAMESPACE_KEY = 'ovs-healthcheck-'
+    ASD_SAMPLE_CACHE_KEY = 'alba_asd_sample_{0}'  # Formatted with the guid of the backend
+    PROXY_BENCH_CACHE_KEY = 'alba_proxy_bench_{0}_{1}'  # Formatted with the name of the proxy service and the preset
+    PERSISTENT_NAMESPACE_CACHE_KEY = 'alba_proxy_namespace_{0}_{1}'  # Formatted with the name of the proxy service and the preset
+    DISK_SAFETY_CACHE_KEY = 'alba_disk_safety_{0}_{1}_{2}'  # Formatted with the name of the backend, the policy and whether errored OSDs count as dead
+    NSM_LOAD_CACHE_KEY = 'alba_nsm_load_{0}'  # Formatted with the guid of the backend
+    NSM_LOAD_SAMPLE_INTERVAL = 3600  # In seconds. Keeps the history small when the healthcheck runs often
 
     logger = Logger("healthcheck-healthcheck_alba")
 
@@ -76,18 +97,33 @@ class AlbaHealthCheck(object):
         :type backend_name: str
         :param config: path of the configuration file for the abm
         :type config: str
-        :return: returns a dict that consists of lists with working disks and defective disks
+        :return: returns a dict that consists of lists with working, defective and slow disks
         :rtype: dict
         """
-        working_disks = []
-        broken_disks = []
-        result = {"working": working_disks, "broken": broken_disks}
+        probes = cls._prepare_asd_probes(result_handler, asds, backend_name, config)
+        cls._execute_asd_probes(probes)
+        return cls._report_asd_probes(result_handler, probes, backend_name)
 
+    @classmethod
+    def _prepare_asd_probes(cls, result_handler, asds, backend_name, config):
+        """
+        Determines where every ASD of a backend can be reached
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param asds: list of alba ASDs
+        :type asds: list[dict]
+        :param backend_name: name of a existing backend
+        :type backend_name: str
+        :param config: path of the configuration file for the abm
+        :type config: str
+        :return: a probe for every ASD, in the order of the given ASDs
+        :rtype: list[dict]
+        """
         result_handler.info('Checking separate ASDs for backend {0}:'.format(backend_name), add_to_result=False)
 
         # check if asds are working
         if len(asds) == 0:
-            return result
+            return []
         # Map long id to ip
         osd_mapping = {}
         try:
@@ -100,84 +136,282 @@ class AlbaHealthCheck(object):
         except AlbaException as ex:
             result_handler.failure('Could not fetch osd list from Alba. Got {0}'.format(str(ex)), code=ErrorCodes.alba_cmd_fail)
             raise
-        for asd in asds:
+        return [{'asd_id': asd['asd_id'],
+                 'ip': osd_mapping.get(asd['asd_id']),  # Fetch ip of the asd with list-osds
+                 'port': asd.get('port'),
+                 'status': asd['status'],
+                 'status_detail': asd.get('status_detail'),
+                 'task': None} for asd in asds]
+
+    @classmethod
+    def _sample_asd_probes(cls, result_handler, probes, backend, sample_fraction):
+        """
+        Selects the probes to execute during this run
+        Every ASD belongs to one of ceil(1 / sample_fraction) slices, based on a hash of its id. Every run probes the next slice
+        so every ASD is probed within that amount of runs. ASDs in error and ASDs which failed their last probe are always included
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param probes: probes of a backend as returned by _prepare_asd_probes
+        :type probes: list[dict]
+        :param backend: information about the backend
+        :type backend: dict
+        :param sample_fraction: fraction of the ASDs to probe
+        :type sample_fraction: float
+        :return: the probes to execute, in their original order
+        :rtype: list[dict]
+        """
+        if sample_fraction >= 1 or len(probes) == 0:
+            return probes
+        slices = int(math.ceil(1 / sample_fraction))
+        cache_key = cls.ASD_SAMPLE_CACHE_KEY.format(backend['guid'])
+        try:
+            state = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            state = None
+        if not isinstance(state, dict) or state.get('slices') != slices:
+            state = {'cursor': 0, 'slices': slices, 'failing': []}
+        failing = set(state['failing'])
+        selected = [probe for probe in probes
+                    if int(hashlib.md5(probe['asd_id']).hexdigest(), 16) % slices == state['cursor'] or
+                    probe['asd_id'] in failing or probe['status'] == 'error']
+        result_handler.info('Probing {0} of the {1} ASDs of backend {2} (slice {3} of {4}, {5} recently failing)'
+                            .format(len(selected), len(probes), backend['name'], state['cursor'] + 1, slices, len(failing)),
+                            add_to_result=False)
+        state['cursor'] = (state['cursor'] + 1) % slices
+        CacheHelper.set(key=cache_key, item=state)
+        return selected
+
+    @classmethod
+    def _remember_failing_asds(cls, backend, result_disks):
+        """
+        Keeps track of the failing ASDs of a backend so the next sampled run probes them again
+        :param backend: information about the backend
+        :type backend: dict
+        :param result_disks: outcome of the probes, as returned by _report_asd_probes
+        :type result_disks: dict
+        :return: None
+        :rtype: NoneType
+        """
+        cache_key = cls.ASD_SAMPLE_CACHE_KEY.format(backend['guid'])
+        try:
+            state = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            return
+        failing = set(state['failing']).difference(result_disks['working']).union(result_disks['broken'])
+        state['failing'] = sorted(failing)
+        CacheHelper.set(key=cache_key, item=state)
+
+    @classmethod
+    def _execute_asd_probes(cls, probes):
+        """
+        Probes the ASDs concurrently. The amount of simultaneous probes is limited in total and per host
+        The task holding the outcome is attached to every probe. ASDs in error are not probed
+        Once a node turns out to be unreachable, the remaining ASDs on that node are no longer probed
+        :param probes: probes as returned by _prepare_asd_probes
+        :type probes: list[dict]
+        :return: None
+        :rtype: NoneType
+        """
+        unreachable_nodes = {}
+        executor = Executor(workers=Helper.asd_probe_workers, group_limit=Helper.asd_probe_workers_per_host)
+        for probe in probes:
+            if probe['status'] == 'error':
+                continue
             key = '{0}{1}'.format(cls.BASE_NAMESPACE_KEY, str(uuid.uuid4()))
-            disk_asd_id = asd['asd_id']
             value = str(time.time())
-            if asd['status'] == 'error':
+            probe['task'] = executor.submit(cls._probe_asd_on_node,
+                                            args=(unreachable_nodes, probe['ip'], probe['port'], probe['asd_id'], key, value),
+                                            group=probe['ip'])
+        executor.run()
+
+    @classmethod
+    def _probe_asd_on_node(cls, unreachable_nodes, ip_address, port, long_id, key, value):
+        """
+        Probes an ASD unless its node was found to be unreachable by an earlier probe
+        When the probe fails, the node is checked to distinguish a broken ASD from an unreachable node
+        :param unreachable_nodes: ips of the unreachable nodes, mapped to the error of the probe which failed. Shared by all probes
+        :type unreachable_nodes: dict
+        :param ip_address: ip of the ASD
+        :type ip_address: str
+        :param port: port of the ASD
+        :type port: int
+        :param long_id: long id of the ASD
+        :type long_id: str
+        :param key: key of the object
+        :type key: str
+        :param value: value of the object
+        :type value: str
+        :raises NodeUnreachableException: when the node of the ASD is unreachable
+        :return: the outcome of the probe, see _probe_asd
+        :rtype: dict
+        """
+        if ip_address in unreachable_nodes:
+            raise NodeUnreachableException('Node {0} is unreachable: {1}'.format(ip_address, unreachable_nodes[ip_address]))
+        try:
+            return cls._probe_asd(ip_address, port, long_id, key, value)
+        except (AlbaException, ASDException) as ex:
+            if ip_address is not None and port and NetworkHelper.is_host_reachable(ip_address, port, timeout=Helper.asd_probe_node_timeout) is False:
+                unreachable_nodes[ip_address] = str(ex)
+                raise NodeUnreachableException('Node {0} is unreachable: {1}'.format(ip_address, str(ex)))
+            raise
+
+    @classmethod
+    def _report_asd_probes(cls, result_handler, probes, backend_name):
+        """
+        Reports the outcome of the probes of a backend
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param probes: executed probes of a backend
+        :type probes: list[dict]
+        :param backend_name: name of a existing backend
+        :type backend_name: str
+        :return: returns a dict that consists of lists with working, defective and slow disks
+        :rtype: dict
+        """
+        working_disks = []
+        broken_disks = []
+        unreachable_nodes = {}
+        latencies = {}  # Probes through the alba cli include the startup of the process and are not compared to native probes
+        result = {"working": working_disks, "broken": broken_disks, "slow": []}
+        for probe in probes:
+            disk_asd_id = probe['asd_id']
+            ip_address = probe['ip']
+            if probe['task'] is None:
                 broken_disks.append(disk_asd_id)
                 # @todo check with other ops for this logging. Perhaps filter on status_details
-                result_handler.warning('ASD test with DISK_ID {0} failed because: {1}'.format(disk_asd_id, asd['status_detail']),
+                result_handler.warning('ASD test with DISK_ID {0} failed because: {1}'.format(disk_asd_id, probe['status_detail']),
                                        code=ErrorCodes.osd_broken)
                 continue
-            # Fetch ip of the asd with list-asds
-            ip_address = osd_mapping.get(disk_asd_id)
             try:
-                # Check if disk is missing
-                if not asd.get('port'):
-                    raise DiskNotFoundException('Disk is missing')
-                # Put object
-                AlbaCLI.run(command='asd-set',
-                            named_params={'host': ip_address, 'port': str(asd.get('port')),
-                                          'long-id': disk_asd_id},
-                            extra_params=[key, value])
-                # Get object
-                fetched_object = AlbaCLI.run(command='asd-multi-get',
-                                             named_params={'host': ip_address, 'port': str(asd.get('port')), 'long-id': disk_asd_id},
-                                             extra_params=[key],
-                                             to_json=False)
-                # Check if put/get is successful
-                if 'None' in fetched_object:
+                outcome = probe['task'].get()
+                if outcome['found'] is False:
                     # test failed!
-                    raise ObjectNotFoundException(fetched_object)
+                    raise ObjectNotFoundException('Object was not found')
                 # Test successful!
                 result_handler.success('ASD test with DISK_ID {0} succeeded!'.format(disk_asd_id))
                 working_disks.append(disk_asd_id)
-
-                # Delete object
-                AlbaCLI.run(command='asd-delete',
-                            named_params={'host': ip_address, 'port': str(asd.get('port')), 'long-id': disk_asd_id},
-                            extra_params=[key])
+                latencies.setdefault(outcome['method'], {})[disk_asd_id] = outcome['latency']
             except ObjectNotFoundException:
                 broken_disks.append(disk_asd_id)
                 # @TODO validate with other ops. #asds is important
                 result_handler.warning('ASD test with disk-id {0} failed on node {1}!'.format(disk_asd_id, ip_address),
                                        code=ErrorCodes.osd_object_download_fail)
-            except (AlbaException, DiskNotFoundException) as ex:
+            except NodeUnreachableException as ex:
+                broken_disks.append(disk_asd_id)
+                unreachable_nodes.setdefault(ip_address, {'error': str(ex), 'asds': []})['asds'].append(disk_asd_id)
+            except (AlbaException, ASDException, DiskNotFoundException) as ex:
                 # @TODO validate with other ops. #asds is important
                 broken_disks.append(disk_asd_id)
                 result_handler.warning('ASD test with DISK_ID {0} failed  on node {1} with {2}'.format(disk_asd_id, ip_address, str(ex)),
                                        code=ErrorCodes.alba_cmd_fail)
+        # Report an unreachable node once instead of once for every ASD on it
+        for ip_address, node_info in sorted(unreachable_nodes.iteritems()):
+            result_handler.warning('{0}. The {1} ASD(s) of backend {2} on this node could not be tested: {3}'
+                                   .format(node_info['error'], len(node_info['asds']), backend_name, ', '.join(node_info['asds'])),
+                                   code=ErrorCodes.osd_node_unreachable)
+        result['slow'] = cls._report_asd_latencies(result_handler, probes, latencies, backend_name)
         return result
 
     @classmethod
-    @expose_to_cli(MODULE, 'proxy-test', HealthCheckCLI.ADDON_TYPE,
-                   help='Verifies that the proxies are able to perform basic operations',
-                   short_help='Test if proxy basic operations')
-    def check_if_proxies_work(cls, result_handler):
+    def _report_asd_latencies(cls, result_handler, probes, latencies, backend_name):
         """
-        Checks if all Alba Proxies work on a local machine, it creates a namespace and tries to put and object
+        Reports the latency distribution per backend and per node and flags ASDs which are a lot slower than the others
         :param result_handler: logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
-        :return: None
-        :rtype: NoneType
+        :param probes: executed probes of a backend
+        :type probes: list[dict]
+        :param latencies: average latency of an operation for every working ASD, by the client used to probe it
+        :type latencies: dict
+        :param backend_name: name of a existing backend
+        :type backend_name: str
+        :return: the slow ASDs
+        :rtype: list[str]
         """
-        namespace_params = {'bucket_count': (list, None),
-                            'logical': (int, None),
-                            'storage': (int, None),
-                            'storage_per_osd': (list, None)}
+        ip_mapping = dict((probe['asd_id'], probe['ip']) for probe in probes)
+        slow_disks = []
+        for method, samples in sorted(latencies.iteritems()):
+            distribution = StatisticsHelper.distribution(samples.values())
+            result_handler.info('ASD latency for backend {0} ({1} probes): median {2:.4f}s, p95 {3:.4f}s, max {4:.4f}s over {5} ASDs'
+                                .format(backend_name, method, distribution['median'], distribution['p95'], distribution['max'], distribution['count']),
+                                add_to_result=False)
+            node_samples = {}
+            for asd_id, latency in samples.iteritems():
+                node_samples.setdefault(ip_mapping[asd_id], []).append(latency)
+            for ip_address, node_latencies in sorted(node_samples.iteritems()):
+                node_distribution = StatisticsHelper.distribution(node_latencies)
+                result_handler.info('ASD latency for backend {0} on node {1}: median {2:.4f}s, max {3:.4f}s over {4} ASDs'
+                                    .format(backend_name, ip_address, node_distribution['median'], node_distribution['max'], node_distribution['count']),
+                                    add_to_result=False)
+            outliers = StatisticsHelper.find_outliers(samples,
+                                                      threshold=Helper.asd_probe_slow_threshold,
+                                                      minimum_value=Helper.asd_probe_slow_minimum_latency)
+            for asd_id in sorted(outliers, key=lambda a: samples[a], reverse=True):
+                slow_disks.append(asd_id)
+                result_handler.warning('ASD test with DISK_ID {0} on node {1} took {2:.4f}s per operation while the median for backend {3} is {4:.4f}s'
+                                       .format(asd_id, ip_mapping[asd_id], samples[asd_id], backend_name, distribution['median']),
+                                       code=ErrorCodes.osd_slow)
+        return slow_disks
 
-        result_handler.info('Checking the ALBA proxies.', add_to_result=False)
+    @classmethod
+    def _probe_asd(cls, ip_address, port, long_id, key, value):
+        """
+        Puts, fetches and deletes an object on an ASD
+        The native ASD client is used when enabled. When the native client fails, the probe is retried through the alba cli
+        so an ASD is only considered broken when the alba cli fails as well
+        :param ip_address: ip of the ASD
+        :type ip_address: str
+        :param port: port of the ASD
+        :type port: int
+        :param long_id: long id of the ASD
+        :type long_id: str
+        :param key: key of the object
+        :type key: str
+        :param value: value of the object
+        :type value: str
+        :raises AlbaException: when a call through the alba cli failed
+        :raises DiskNotFoundException: when the ASD has no port
+        :return: whether the object could be fetched after putting it, the client used ('native' or 'cli')
+        and the average duration of a single operation (in seconds)
+        :rtype: dict
+        """
+        # Check if disk is missing
+        if not port:
+            raise DiskNotFoundException('Disk is missing')
+        start = time.time()
+        if Helper.asd_probe_native is True:
+            client = ASDClientPool.get_client(ip_address, port, long_id, timeout=Helper.asd_probe_timeout)
+            try:
+                client.set(key, value)
+                found = client.get(key) == value
+                if found is True:
+                    client.delete(key)
+                return {'found': found, 'method': 'native', 'latency': (time.time() - start) / (3 if found is True else 2)}
+            except ASDException as ex:
+                cls.logger.warning('Falling back to the alba cli for ASD {0}: {1}'.format(long_id, str(ex)))
+                start = time.time()
+        named_params = {'host': ip_address, 'port': str(port), 'long-id': long_id}
+        AlbaCLI.run(command='asd-set', named_params=named_params, extra_params=[key, value])
+        fetched_object = AlbaCLI.run(command='asd-multi-get', named_params=named_params, extra_params=[key], to_json=False)
+        found = 'None' not in fetched_object
+        if found is True:
+            AlbaCLI.run(command='asd-delete', named_params=named_params, extra_params=[key])
+        return {'found': found, 'method': 'cli', 'latency': (time.time() - start) / (3 if found is True else 2)}
 
-        amount_of_presets_not_working = []
-        # ignore possible subprocess output
-        fnull = open(os.devnull, 'w')
-        # try put/get/verify on all available proxies on the local node
+    @classmethod
+    def _get_proxy_presets(cls, result_handler):
+        """
+        Determines the presets in use for every proxy on the local node
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :return: every combination of a proxy and a preset in use and the names of the proxies which are not configured correctly
+        :rtype: tuple(list[dict], list[str])
+        """
+        proxy_presets = []
+        broken_proxies = []
         local_proxies = ServiceHelper.get_local_proxy_services()
         if len(local_proxies) == 0:
             result_handler.info('Found no proxies.', add_to_result=False)
-            return amount_of_presets_not_working
-        api_cache = {}
+            return proxy_presets, broken_proxies
         for service in local_proxies:
             try:
                 result_handler.info('Checking ALBA proxy {0}.'.format(service.name), add_to_result=False)
@@ -196,10 +430,12 @@ class AlbaHealthCheck(object):
                 if abm_name is None:
                     raise ConfigNotMatchedException('Proxy config for proxy {0} does not have the correct format on node {1} with port {2}.'.format(service.name, ip, service.ports[0]))
                 abm_config = Configuration.get_configuration_path(PROXY_CONFIG_ABM.format(service.alba_proxy.storagedriver.vpool.guid, service.alba_proxy.guid))
+                # Proxies connected to the same ALBA manager share the same client configuration
+                abm_identifier = json.dumps(proxy_client_cfg, sort_keys=True)
 
                 # Determine presets / backend
                 try:
-                    presets = AlbaCLI.run(command='list-presets', config=abm_config)
+                    presets = AlbaCLI.run(command='list-presets', config=abm_config, cluster_identifier=abm_identifier)
                 except AlbaException:
                     result_handler.failure('Listing the presets has failed. Please check the arakoon config path. We used {0}'.format(abm_config),
                                            code=ErrorCodes.alba_cmd_fail)
@@ -210,232 +446,696 @@ class AlbaHealthCheck(object):
                     if preset['in_use'] is False:
                         result_handler.skip('Preset {0} is not in use and will not be checked'.format(preset['name']))
                         continue
-                    preset_name = preset['name']
-                    # Encapsulation try for cleanup
-                    try:
-                        # Generate new namespace name using the preset
-                        namespace_key_prefix = 'ovs-healthcheck-ns-{0}-{1}'.format(preset_name, AlbaHealthCheck.LOCAL_ID)
-                        namespace_key = '{0}_{1}'.format(namespace_key_prefix, uuid.uuid4())
-                        object_key = 'ovs-healthcheck-obj-{0}'.format(str(uuid.uuid4()))
-                        # Create namespace
-                        AlbaCLI.run(command='proxy-create-namespace',
-                                    named_params={'host': ip, 'port': service.ports[0]},
-                                    extra_params=[namespace_key, preset_name])
-                        # Wait until fully created
-                        namespace_start_time = time.time()
-                        for index in xrange(2):
-                            # Running twice because the first one could give a false positive as the osds will alert the nsm
-                            # and the nsm would respond with got messages but these were not the ones we are after
-                            AlbaCLI.run(command='deliver-messages', config=abm_config)
-                        while True:
-                            if time.time() - namespace_start_time > AlbaHealthCheck.NAMESPACE_TIMEOUT:
-                                raise AlbaTimeOutException('Creating namespace has timed out after {0}s'.format(time.time() - namespace_start_time), 'deliver-messages')
-                            list_ns_osds_output = AlbaCLI.run(command='list-ns-osds', config=abm_config, extra_params=[namespace_key])
-                            # Example output: [[0, [u'Active']], [3, [u'Active']]]
-                            namespace_ready = True
-                            for osd_info in list_ns_osds_output:
-                                if osd_info[1][0] != 'Active':
-                                    # If we found an OSD not Active, check if preset is satisfiable
-                                    namespace_ready = False
-                                    break
-                            if namespace_ready is True:
-                                break
-                            else:
-                                result_handler.info('Not all OSDs have responded to the creation message. Fetching the safety', add_to_result=False)
-                                try:
-                                    # Fetch the preset information on the Framework
-                                    # This add an extra delay for the messages to propagate too
-                                    vpool = service.alba_proxy.storagedriver.vpool
-                                    alba_backend_guid = vpool.metadata['backend']['backend_info']['alba_backend_guid']
-                                    api_url = 'alba/backends/{0}'.format(alba_backend_guid)
-                                    if api_url not in api_cache:
-                                        connection_info = vpool.metadata['backend']['backend_info']['connection_info']
-                                        api_client = OVSClient(connection_info['host'], connection_info['port'], (connection_info['client_id'], connection_info['client_secret']))
-                                        start = time.time()
-                                        _presets = api_client.get(api_url, params={'contents': 'presets'})['presets']
-                                        api_cache[api_url] = _presets
-                                        result_handler.info('Fetching the safety took {0} seconds'.format(time.time() - start))
-                                    _presets = api_cache[api_url]
-                                    _preset = filter(lambda p: p['name'] == preset_name, _presets)[0]
-                                    if _preset['is_available'] is True:
-                                        # Preset satisfiable, don't care about osds availability
-                                        result_handler.info('Requested preset is available, no longer waiting on \'deliver_messages\'', add_to_result=False)
-                                        break
-                                    else:
-                                        raise ValueError('Requested preset is marked as unavailable. Please check the disk safety'.format(time.time() - namespace_start_time))
-                                except ValueError:
-                                    raise
-                                except Exception:
-                                    msg = 'Could not query the preset data. Checking the preset might timeout'
-                                    result_handler.warning(msg)
-                                    cls.logger.exception(msg)
-                                    # Sleep for syncing purposes
-                                    time.sleep(1)
-                        result_handler.success('Namespace successfully created on proxy {0} with preset {1}!'.format(service.name, preset_name),
-                                               code=ErrorCodes.proxy_namespace_create)
-                        namespace_info = AlbaCLI.run(command='show-namespace', config=abm_config, extra_params=[namespace_key])
-                        ExtensionsToolbox.verify_required_params(required_params=namespace_params, actual_params=namespace_info)
-                        result_handler.success('Namespace successfully fetched on proxy {0} with preset {1}!'.format(service.name, preset_name),
-                                               code=ErrorCodes.proxy_namespace_fetch)
-
-                        # Put test object to given dir
-                        with open(AlbaHealthCheck.TEMP_FILE_LOC, 'wb') as output_file:
-                            output_file.write(os.urandom(AlbaHealthCheck.TEMP_FILE_SIZE))
-                        AlbaCLI.run(command='proxy-upload-object',
-                                    named_params={'host': ip, 'port': service.ports[0]},
-                                    extra_params=[namespace_key, AlbaHealthCheck.TEMP_FILE_LOC, object_key])
-                        result_handler.success('Successfully uploaded the object to namespace {0}'.format(namespace_key),
-                                               code=ErrorCodes.proxy_upload_obj)
-                        # download object
-                        AlbaCLI.run(command='proxy-download-object',
-                                    named_params={'host': ip, 'port': service.ports[0]},
-                                    extra_params=[namespace_key, object_key, AlbaHealthCheck.TEMP_FILE_FETCHED_LOC])
-                        result_handler.success('Successfully downloaded the object to namespace {0}'.format(namespace_key),
-                                               code=ErrorCodes.proxy_download_obj)
-                        # check if files exists - issue #57
-                        if not(os.path.isfile(AlbaHealthCheck.TEMP_FILE_FETCHED_LOC) and os.path.isfile(AlbaHealthCheck.TEMP_FILE_LOC)):
-                            # creation of object failed
-                            raise ObjectNotFoundException(ValueError('Creation of object has failed'))
-                        hash_original = hashlib.md5(open(AlbaHealthCheck.TEMP_FILE_LOC, 'rb').read()).hexdigest()
-                        hash_fetched = hashlib.md5(open(AlbaHealthCheck.TEMP_FILE_FETCHED_LOC, 'rb').read()).hexdigest()
-
-                        if hash_original == hash_fetched:
-                            result_handler.success('Fetched object {0} from namespace {1} on proxy {2} with preset {3} matches the created object!'.format(object_key, namespace_key, service.name, preset_name),
-                                                   code=ErrorCodes.proxy_verify_obj)
-                        else:
-                            result_handler.failure('Fetched object {0} from namespace {1} on proxy {2} with preset {3} does not match the created object!'.format(object_key, namespace_key, service.name, preset_name),
-                                                   code=ErrorCodes.proxy_verify_obj_fail)
-
-                    except ValueError:
-                        result_handler.failure('The preset is not available for use')
-                    except ObjectNotFoundException as ex:
-                        amount_of_presets_not_working.append(preset_name)
-                        result_handler.failure('Failed to put object on namespace {0} failed on proxy {1}with preset {2} With error {3}'.format(namespace_key, service.name, preset_name, ex))
-                    except AlbaTimeOutException as ex:
-                        result_handler.failure(str(ex))
-                    except AlbaException as ex:
-                        code = ErrorCodes.alba_cmd_fail
-                        if ex.alba_command == 'proxy-create-namespace':
-                            result_handler.failure('Create namespace has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
-                                                   code=code)
-                        elif ex.alba_command == 'show-namespace':
-                            result_handler.failure('Show namespace has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
-                                                   code=code)
-                        elif ex.alba_command == 'proxy-upload-object':
-                            result_handler.failure('Uploading the object has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
-                                                   code=code)
-                        elif ex.alba_command == 'proxy-download-object':
-                            result_handler.failure('Downloading the object has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
-                                                   code=code)
-                    finally:
-                        # Delete the created namespace and preset
-                        subprocess.call(['rm', str(AlbaHealthCheck.TEMP_FILE_LOC)], stdout=fnull, stderr=subprocess.STDOUT)
-                        subprocess.call(['rm', str(AlbaHealthCheck.TEMP_FILE_FETCHED_LOC)], stdout=fnull, stderr=subprocess.STDOUT)
-                        try:
-                            namespaces = AlbaCLI.run(command='list-namespaces', config=abm_config)
-                            namespaces_to_remove = []
-                            proxy_named_params = {'host': ip, 'port': service.ports[0]}
-                            for namespace in namespaces:
-                                if namespace['name'].startswith(namespace_key_prefix):
-                                    namespaces_to_remove.append(namespace['name'])
-                            for namespace_name in namespaces_to_remove:
-                                if namespace_name == namespace_key:
-                                    result_handler.info('Deleting namespace {0}.'.format(namespace_name))
-                                else:
-                                    result_handler.warning('Deleting namespace {0} which was leftover from a previous run.'.format(namespace_name))
-
-                                AlbaCLI.run(command='proxy-delete-namespace',
-                                            named_params=proxy_named_params,
-                                            extra_params=[namespace_name])
-
-                                namespace_delete_start = time.time()
-                                while True:
-                                    try:
-                                        AlbaCLI.run(command='show-namespace', config=abm_config, extra_params=[namespace_name])  # Will fail if the namespace does not exist
-                                    except AlbaException:
-                                        result_handler.success('Namespace {0} successfully removed.'.format(namespace_name))
-                                        break
-                                    if time.time() - namespace_delete_start > AlbaHealthCheck.NAMESPACE_TIMEOUT:
-                                        raise AlbaTimeOutException('Delete namespace has timed out after {0}s'.format(time.time() - namespace_start_time), 'show-namespace')
-
-                                # be tidy, and make the proxy forget the namespace
-                                try:
-                                    AlbaCLI.run(command='proxy-statistics',
-                                                named_params=proxy_named_params,
-                                                extra_params=['--forget', namespace_name])
-                                except:
-                                    result_handler.warning('Failed to make proxy forget namespace {0}.'.format(namespace_name))
-                        except AlbaException as ex:
-                            if ex.alba_command == 'list-namespaces':
-                                result_handler.failure(
-                                    'list namespaces has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(
-                                        str(ex), namespace_key, service.name, preset_name))
-                            elif ex.alba_command == 'proxy-delete-namespace':
-                                result_handler.failure(
-                                    'Delete namespace has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(
-                                        str(ex), namespace_key, service.name, preset_name))
-
-            except subprocess.CalledProcessError as ex:
-                # this should stay for the deletion of the remaining files
-                amount_of_presets_not_working.append(service.name)
-                result_handler.failure('Proxy {0} has some problems. Got {1} as error'.format(service.name, ex),
-                                       code=ErrorCodes.proxy_problems)
-
+                    proxy_presets.append({'service': service,
+                                          'ip': ip,
+                                          'abm_config': abm_config,
+                                          'abm_identifier': abm_identifier,
+                                          'preset_name': preset['name']})
             except ConfigNotMatchedException as ex:
-                amount_of_presets_not_working.append(service.name)
+                broken_proxies.append(service.name)
                 result_handler.failure('Proxy {0} has some problems. Got {1} as error'.format(service.name, ex),
                                        code=ErrorCodes.proxy_problems)
+        return proxy_presets, broken_proxies
+
+    @classmethod
+    @expose_to_cli(MODULE, 'proxy-test', HealthCheckCLI.ADDON_TYPE,
+                   help='Verifies that the proxies are able to perform basic operations',
+                   short_help='Test if proxy basic operations')
+    @expose_to_cli.option('--concurrency', '-c', type=int, default=4,
+                          help='Maximum number of proxy and preset combinations to test at the same time')
+    @expose_to_cli.option('--object-size', '-o', type=int, default=TEMP_FILE_SIZE,
+                          help='Size (in bytes) of the object to upload and download through every proxy')
+    @expose_to_cli.option('--persistent-namespace', '-p', is_flag=True,
+                          help='Re-use a long-lived namespace per proxy and preset instead of creating and removing one every run')
+    def check_if_proxies_work(cls, result_handler, concurrency=4, object_size=TEMP_FILE_SIZE, persistent_namespace=False):
+        """
+        Checks if all Alba Proxies work on a local machine, it creates a namespace and tries to put and object
+        Every combination of a proxy and a preset is tested independently, multiple combinations are tested at the same time
+        In persistent mode, the namespace is re-used across runs and only replaced once it exceeds the maximum age
+        Stale persistent namespaces are removed by the proxy-namespace-gc test
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param concurrency: Maximum number of proxy and preset combinations to test at the same time
+        :type concurrency: int
+        :param object_size: Size (in bytes) of the object to upload and download through every proxy
+        :type object_size: int
+        :param persistent_namespace: Re-use a long-lived namespace per proxy and preset. Defaults to the persistent_namespace settings of the healthcheck
+        :type persistent_namespace: bool
+        :return: None
+        :rtype: NoneType
+        """
+        result_handler.info('Checking the ALBA proxies.', add_to_result=False)
+        persistent_namespace = persistent_namespace or Helper.persistent_namespace_enabled
+
+        amount_of_presets_not_working = []
+        # try put/get/verify on all available proxies on the local node
+        proxy_presets, broken_proxies = cls._get_proxy_presets(result_handler)
+        amount_of_presets_not_working.extend(broken_proxies)
+        # Combinations of the same ALBA manager and preset are not tested at the same time as they would compete for the same OSDs
+        executor = Executor(workers=max(1, concurrency), group_limit=1)
+        recorded_tests = []
+        for proxy_preset in proxy_presets:
+            recorder = HCResults.HCResultRecorder()
+            created_namespaces = []
+            task = executor.submit(cls._check_proxy_preset,
+                                   args=(recorder, proxy_preset['service'], proxy_preset['ip'], proxy_preset['abm_config'], proxy_preset['preset_name'], object_size,
+                                         created_namespaces, persistent_namespace),
+                                   group=(proxy_preset['abm_identifier'], proxy_preset['preset_name']))
+            recorded_tests.append((recorder, task, proxy_preset, created_namespaces))
+        executor.run()
+        namespaces_to_remove = []
+        for recorder, task, proxy_preset, created_namespaces in recorded_tests:
+            recorder.replay(result_handler)
+            namespaces_to_remove.extend((namespace_name, proxy_preset) for namespace_name in created_namespaces)
+            try:
+                amount_of_presets_not_working.extend(task.get())
+            except Exception as ex:
+                cls.logger.error('Testing a preset failed unexpectedly: {0}'.format(task.traceback))
+                result_handler.exception('Testing a preset failed unexpectedly: {0}'.format(str(ex)), code=ErrorCodes.proxy_problems)
+        if persistent_namespace is False:
+            cls._remove_test_namespaces(result_handler, proxy_presets, AlbaHealthCheck.TEST_NAMESPACE_PREFIX, namespaces_to_remove)
+        return amount_of_presets_not_working
+
+    @classmethod
+    def _check_proxy_preset(cls, result_handler, service, ip, abm_config, preset_name, object_size, created_namespaces, persistent_namespace=False):
+        """
+        Creates a namespace with the given preset through the proxy, puts an object and fetches it
+        The created namespace is recorded so it can be removed together with the others once all presets have been tested
+        A persistent namespace is re-used instead and only the object is removed afterwards
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param service: the proxy service
+        :type service: ovs.dal.hybrids.service.Service
+        :param ip: ip the proxy is listening on
+        :type ip: str
+        :param abm_config: path of the configuration file for the abm
+        :type abm_config: str
+        :param preset_name: name of the preset to test
+        :type preset_name: str
+        :param object_size: size (in bytes) of the object to upload and download
+        :type object_size: int
+        :param created_namespaces: the names of the namespaces created by this test are appended to this list
+        :type created_namespaces: list[str]
+        :param persistent_namespace: re-use the persistent namespace of the proxy and preset
+        :type persistent_namespace: bool
+        :return: the presets which are not working
+        :rtype: list[str]
+        """
+        namespace_params = {'bucket_count': (list, None),
+                            'logical': (int, None),
+                            'storage': (int, None),
+                            'storage_per_osd': (list, None)}
+        presets_not_working = []
+        # Generate new namespace name using the preset
+        namespace_key = '{0}_{1}'.format(AlbaHealthCheck.TEST_NAMESPACE_PREFIX.format(preset_name, AlbaHealthCheck.LOCAL_ID), uuid.uuid4())
+        persistent_cache_key = cls.PERSISTENT_NAMESPACE_CACHE_KEY.format(service.name, preset_name)
+        object_uploaded = False
+        object_key = 'ovs-healthcheck-obj-{0}'.format(str(uuid.uuid4()))
+        temp_directory = FilesystemHelper.get_temp_directory()
+        temp_file = os.path.join(temp_directory, AlbaHealthCheck.TEMP_FILE_NAME.format(object_key))
+        temp_file_fetched = os.path.join(temp_directory, AlbaHealthCheck.TEMP_FILE_FETCHED_NAME.format(object_key))
+        # Encapsulation try for cleanup
+        try:
+            if persistent_namespace is True:
+                namespace_key = cls._get_persistent_namespace(result_handler, service, ip, abm_config, preset_name)
+            else:
+                cls._create_test_namespace(result_handler, service, ip, abm_config, namespace_key, preset_name, created_namespaces)
+                result_handler.success('Namespace successfully created on proxy {0} with preset {1}!'.format(service.name, preset_name),
+                                       code=ErrorCodes.proxy_namespace_create)
+            namespace_info = AlbaCLI.run(command='show-namespace', config=abm_config, extra_params=[namespace_key])
+            ExtensionsToolbox.verify_required_params(required_params=namespace_params, actual_params=namespace_info)
+            result_handler.success('Namespace successfully fetched on proxy {0} with preset {1}!'.format(service.name, preset_name),
+                                   code=ErrorCodes.proxy_namespace_fetch)
+
+            # Put test object to given dir. The checksum is known upfront thanks to the seeded generator
+            checksum_original = FilesystemHelper.write_random_file(temp_file, object_size, seed=uuid.uuid4().int)
+            AlbaCLI.run(command='proxy-upload-object',
+                        named_params={'host': ip, 'port': service.ports[0]},
+                        extra_params=[namespace_key, temp_file, object_key])
+            object_uploaded = True
+            result_handler.success('Successfully uploaded the object to namespace {0}'.format(namespace_key),
+                                   code=ErrorCodes.proxy_upload_obj)
+            # download object
+            AlbaCLI.run(command='proxy-download-object',
+                        named_params={'host': ip, 'port': service.ports[0]},
+                        extra_params=[namespace_key, object_key, temp_file_fetched])
+            result_handler.success('Successfully downloaded the object to namespace {0}'.format(namespace_key),
+                                   code=ErrorCodes.proxy_download_obj)
+            # check if files exists - issue #57
+            if not os.path.isfile(temp_file_fetched):
+                # creation of object failed
+                raise ObjectNotFoundException(ValueError('Creation of object has failed'))
+            size_fetched, checksum_fetched = FilesystemHelper.get_checksum_of_file(temp_file_fetched)
+
+            if size_fetched == object_size and checksum_fetched == checksum_original:
+                result_handler.success('Fetched object {0} from namespace {1} on proxy {2} with preset {3} matches the created object!'.format(object_key, namespace_key, service.name, preset_name),
+                                       code=ErrorCodes.proxy_verify_obj)
+            else:
+                result_handler.failure('Fetched object {0} from namespace {1} on proxy {2} with preset {3} does not match the created object!'.format(object_key, namespace_key, service.name, preset_name),
+                                       code=ErrorCodes.proxy_verify_obj_fail)
+
+        except ValueError:
+            result_handler.failure('The preset is not available for use')
+        except ObjectNotFoundException as ex:
+            presets_not_working.append(preset_name)
+            result_handler.failure('Failed to put object on namespace {0} failed on proxy {1}with preset {2} With error {3}'.format(namespace_key, service.name, preset_name, ex))
+        except AlbaTimeOutException as ex:
+            result_handler.failure(str(ex))
+        except AlbaException as ex:
+            if persistent_namespace is True:
+                # Start over with a new persistent namespace during the next run
+                CacheHelper.delete(key=persistent_cache_key)
+            code = ErrorCodes.alba_cmd_fail
+            if ex.alba_command == 'proxy-create-namespace':
+                result_handler.failure('Create namespace has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
+                                       code=code)
+            elif ex.alba_command == 'show-namespace':
+                result_handler.failure('Show namespace has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
+                                       code=code)
+            elif ex.alba_command == 'proxy-upload-object':
+                result_handler.failure('Uploading the object has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
+                                       code=code)
+            elif ex.alba_command == 'proxy-download-object':
+                result_handler.failure('Downloading the object has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(str(ex), namespace_key, service.name, preset_name),
+                                       code=code)
+        finally:
+            FilesystemHelper.remove_file(temp_file)
+            FilesystemHelper.remove_file(temp_file_fetched)
+            if persistent_namespace is True and object_uploaded is True:
+                try:
+                    AlbaCLI.run(command='proxy-delete-object',
+                                named_params={'host': ip, 'port': service.ports[0]},
+                                extra_params=[namespace_key, object_key])
+                except AlbaException:
+                    result_handler.warning('Failed to delete object {0} from namespace {1}. It will be removed together with the namespace'.format(object_key, namespace_key))
+        return presets_not_working
+
+    @classmethod
+    def _get_persistent_namespace_prefix(cls, service, preset_name):
+        """
+        Generates the prefix of the persistent namespaces of a proxy and preset. The creation time is appended to form the name
+        :param service: the proxy service
+        :type service: ovs.dal.hybrids.service.Service
+        :param preset_name: name of the preset
+        :type preset_name: str
+        :return: the prefix
+        :rtype: str
+        """
+        return 'ovs-healthcheck-persistent-{0}-{1}-{2}_'.format(preset_name, AlbaHealthCheck.LOCAL_ID, service.name)
+
+    @classmethod
+    def _get_persistent_namespace(cls, result_handler, service, ip, abm_config, preset_name):
+        """
+        Returns the persistent namespace of the proxy and preset
+        The namespace is re-used when it can still be fetched and is younger than the maximum age, otherwise a new one is created
+        The replaced namespace is left for the proxy-namespace-gc test
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param service: the proxy service
+        :type service: ovs.dal.hybrids.service.Service
+        :param ip: ip the proxy is listening on
+        :type ip: str
+        :param abm_config: path of the configuration file for the abm
+        :type abm_config: str
+        :param preset_name: name of the preset
+        :type preset_name: str
+        :raises ValueError: when the preset is not available
+        :raises AlbaTimeOutException: when the new namespace was not ready in time
+        :raises AlbaException: when a command towards ALBA failed
+        :return: name of the namespace
+        :rtype: str
+        """
+        cache_key = cls.PERSISTENT_NAMESPACE_CACHE_KEY.format(service.name, preset_name)
+        try:
+            namespace = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            namespace = None
+        if isinstance(namespace, dict):
+            if time.time() - namespace['created'] < Helper.persistent_namespace_max_age:
+                try:
+                    AlbaCLI.run(command='show-namespace', config=abm_config, extra_params=[namespace['name']])
+                    result_handler.success('Re-using namespace {0} on proxy {1} with preset {2}'.format(namespace['name'], service.name, preset_name),
+                                           code=ErrorCodes.proxy_namespace_create)
+                    return namespace['name']
+                except AlbaException:
+                    result_handler.warning('Namespace {0} can no longer be fetched. Creating a new one'.format(namespace['name']))
+            else:
+                result_handler.info('Namespace {0} exceeds the maximum age. Creating a new one'.format(namespace['name']), add_to_result=False)
+        created = int(time.time())
+        namespace_key = '{0}{1}'.format(cls._get_persistent_namespace_prefix(service, preset_name), created)
+        cls._create_test_namespace(result_handler, service, ip, abm_config, namespace_key, preset_name)
+        CacheHelper.set(key=cache_key, item={'name': namespace_key, 'created': created})
+        result_handler.success('Namespace successfully created on proxy {0} with preset {1}!'.format(service.name, preset_name),
+                               code=ErrorCodes.proxy_namespace_create)
+        return namespace_key
+
+    @classmethod
+    @expose_to_cli(MODULE, 'proxy-namespace-gc', HealthCheckCLI.ADDON_TYPE,
+                   help='Removes the persistent proxy-test namespaces which are no longer in use',
+                   short_help='Remove stale proxy-test namespaces')
+    def collect_persistent_namespaces(cls, result_handler):
+        """
+        Removes the persistent namespaces of the proxies on the local machine which were replaced or lost track of
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :return: None
+        :rtype: NoneType
+        """
+        result_handler.info('Removing stale persistent namespaces.', add_to_result=False)
+        proxy_presets, _ = cls._get_proxy_presets(result_handler)
+        namespaces_per_abm = {}
+        namespaces_to_remove = []
+        for proxy_preset in proxy_presets:
+            service = proxy_preset['service']
+            abm_config = proxy_preset['abm_config']
+            preset_name = proxy_preset['preset_name']
+            try:
+                if abm_config not in namespaces_per_abm:
+                    namespaces_per_abm[abm_config] = [namespace['name'] for namespace in AlbaCLI.run_iter(command='list-namespaces', config=abm_config)]
+            except AlbaException as ex:
+                result_handler.failure('Listing the namespaces of {0} has failed with {1}'.format(proxy_preset['abm_identifier'], str(ex)),
+                                       code=ErrorCodes.alba_cmd_fail)
+                continue
+            try:
+                current_namespace = CacheHelper.get(key=cls.PERSISTENT_NAMESPACE_CACHE_KEY.format(service.name, preset_name))['name']
+            except TypeError:  # Nothing has been cached yet
+                current_namespace = None
+            namespace_prefix = cls._get_persistent_namespace_prefix(service, preset_name)
+            stale_namespaces = [name for name in namespaces_per_abm[abm_config] if name.startswith(namespace_prefix) and name != current_namespace]
+            if len(stale_namespaces) == 0:
+                result_handler.success('No stale namespaces found for proxy {0} with preset {1}'.format(service.name, preset_name))
+                continue
+            for namespace_name in stale_namespaces:
+                result_handler.info('Deleting stale namespace {0}.'.format(namespace_name))
+                namespaces_to_remove.append((namespace_name, proxy_preset))
+        cls._remove_namespaces(result_handler, namespaces_to_remove)
+
+    @classmethod
+    def _create_test_namespace(cls, result_handler, service, ip, abm_config, namespace_key, preset_name, created_namespaces=None):
+        """
+        Creates a namespace through the proxy and waits until its OSDs are active or the preset is available
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param service: the proxy service
+        :type service: ovs.dal.hybrids.service.Service
+        :param ip: ip the proxy is listening on
+        :type ip: str
+        :param abm_config: path of the configuration file for the abm
+        :type abm_config: str
+        :param namespace_key: name of the namespace to create
+        :type namespace_key: str
+        :param preset_name: name of the preset to create the namespace with
+        :type preset_name: str
+        :param created_namespaces: the name of the namespace is appended to this list once the proxy created it
+        :type created_namespaces: list[str]
+        :raises ValueError: when the preset is not available
+        :raises AlbaTimeOutException: when the namespace was not ready in time
+        :raises AlbaException: when a command towards ALBA failed
+        :return: None
+        :rtype: NoneType
+        """
+        # Create namespace
+        AlbaCLI.run(command='proxy-create-namespace',
+                    named_params={'host': ip, 'port': service.ports[0]},
+                    extra_params=[namespace_key, preset_name])
+        if created_namespaces is not None:
+            created_namespaces.append(namespace_key)
+        # Wait until fully created
+        namespace_start_time = time.time()
+        for index in xrange(2):
+            # Running twice because the first one could give a false positive as the osds will alert the nsm
+            # and the nsm would respond with got messages but these were not the ones we are after
+            AlbaCLI.run(command='deliver-messages', config=abm_config)
+        while True:
+            if time.time() - namespace_start_time > AlbaHealthCheck.NAMESPACE_TIMEOUT:
+                raise AlbaTimeOutException('Creating namespace has timed out after {0}s'.format(time.time() - namespace_start_time), 'deliver-messages')
+            list_ns_osds_output = AlbaCLI.run(command='list-ns-osds', config=abm_config, extra_params=[namespace_key])
+            # Example output: [[0, [u'Active']], [3, [u'Active']]]
+            namespace_ready = True
+            for osd_info in list_ns_osds_output:
+                if osd_info[1][0] != 'Active':
+                    # If we found an OSD not Active, check if preset is satisfiable
+                    namespace_ready = False
+                    break
+            if namespace_ready is True:
+                break
+            else:
+                result_handler.info('Not all OSDs have responded to the creation message. Fetching the safety', add_to_result=False)
+                try:
+                    # Fetch the preset information on the Framework
+                    # This add an extra delay for the messages to propagate too
+                    vpool = service.alba_proxy.storagedriver.vpool
+                    alba_backend_guid = vpool.metadata['backend']['backend_info']['alba_backend_guid']
+                    api_url = 'alba/backends/{0}'.format(alba_backend_guid)
+                    connection_info = vpool.metadata['backend']['backend_info']['connection_info']
+                    start = time.time()
+                    _presets = OVSClientPool.get(connection_info, api_url, params={'contents': 'presets'})['presets']
+                    result_handler.info('Fetching the safety took {0} seconds'.format(time.time() - start), add_to_result=False)
+                    _preset = filter(lambda p: p['name'] == preset_name, _presets)[0]
+                    if _preset['is_available'] is True:
+                        # Preset satisfiable, don't care about osds availability
+                        result_handler.info('Requested preset is available, no longer waiting on \'deliver_messages\'', add_to_result=False)
+                        break
+                    else:
+                        raise ValueError('Requested preset is marked as unavailable. Please check the disk safety'.format(time.time() - namespace_start_time))
+                except ValueError:
+                    raise
+                except Exception:
+                    msg = 'Could not query the preset data. Checking the preset might timeout'
+                    result_handler.warning(msg)
+                    cls.logger.exception(msg)
+                    # Sleep for syncing purposes
+                    time.sleep(1)
+
+    @classmethod
+    def _remove_test_namespaces(cls, result_handler, proxy_presets, namespace_prefix, created_namespaces):
+        """
+        Deletes the namespaces created by a test, together with the namespaces left over by previous runs of that test
+        Every ALBA manager is listed only once, regardless of the amount of proxies and presets using it
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param proxy_presets: every combination of a proxy and a preset which was tested, as returned by _get_proxy_presets
+        :type proxy_presets: list[dict]
+        :param namespace_prefix: prefix of the namespaces of the test, formatted with the preset and the local id
+        :type namespace_prefix: str
+        :param created_namespaces: name of every namespace created during this run with the proxy and preset it was created for
+        :type created_namespaces: list[tuple(str, dict)]
+        :return: None
+        :rtype: NoneType
+        """
+        namespaces_to_remove = list(created_namespaces)
+        for namespace_name, _ in namespaces_to_remove:
+            result_handler.info('Deleting namespace {0}.'.format(namespace_name))
+        created_names = set(namespace_name for namespace_name, _ in created_namespaces)
+        proxy_presets_per_abm = {}
+        for proxy_preset in proxy_presets:
+            proxy_presets_per_abm.setdefault(proxy_preset['abm_config'], []).append(proxy_preset)
+        for abm_config, abm_proxy_presets in proxy_presets_per_abm.iteritems():
+            # Namespace names are <prefix>_<uuid>, the separator avoids matching presets which start with the name of another preset
+            prefixes = dict(('{0}_'.format(namespace_prefix.format(proxy_preset['preset_name'], AlbaHealthCheck.LOCAL_ID)), proxy_preset)
+                            for proxy_preset in abm_proxy_presets)
+            common_prefix = os.path.commonprefix(prefixes.keys())
+            try:
+                # Streamed, so only the matching names are kept in memory
+                for namespace in AlbaCLI.run_iter(command='list-namespaces', config=abm_config):
+                    namespace_name = namespace['name']
+                    if not namespace_name.startswith(common_prefix) or namespace_name in created_names:
+                        continue
+                    for prefix, proxy_preset in prefixes.iteritems():
+                        if namespace_name.startswith(prefix):
+                            result_handler.warning('Deleting namespace {0} which was leftover from a previous run.'.format(namespace_name))
+                            namespaces_to_remove.append((namespace_name, proxy_preset))
+                            break
+            except AlbaException as ex:
+                result_handler.failure('list namespaces has failed with {0} on {1}'.format(str(ex), abm_proxy_presets[0]['abm_identifier']))
+        cls._remove_namespaces(result_handler, namespaces_to_remove)
+
+    @classmethod
+    def _remove_namespaces(cls, result_handler, namespaces):
+        """
+        Deletes namespaces through their proxies, waits until all of them are gone and makes the proxies forget about them
+        The deletes are issued concurrently, after which the namespaces are polled together until they are gone or the timeout expires
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param namespaces: name of every namespace to remove with the proxy and preset to remove it through
+        :type namespaces: list[tuple(str, dict)]
+        :return: None
+        :rtype: NoneType
+        """
+        if len(namespaces) == 0:
+            return
+        executor = Executor(workers=AlbaHealthCheck.NAMESPACE_DELETE_WORKERS)
+        for namespace_name, proxy_preset in namespaces:
+            executor.submit(AlbaCLI.run, kwargs={'command': 'proxy-delete-namespace',
+                                                 'named_params': {'host': proxy_preset['ip'], 'port': proxy_preset['service'].ports[0]},
+                                                 'extra_params': [namespace_name]})
+        pending = {}
+        for (namespace_name, proxy_preset), task in zip(namespaces, executor.run()):
+            if task.exception is None:
+                pending[namespace_name] = proxy_preset
+            else:
+                result_handler.failure('Delete namespace has failed with {0} on namespace {1} with proxy {2} with preset {3}'.format(
+                    str(task.exception), namespace_name, proxy_preset['service'].name, proxy_preset['preset_name']))
+
+        namespace_delete_start = time.time()
+        last_errors = {}
+        while len(pending) > 0 and time.time() - namespace_delete_start <= AlbaHealthCheck.NAMESPACE_TIMEOUT:
+            for namespace_name in pending.keys():
+                try:
+                    AlbaCLI.run(command='show-namespace', config=pending[namespace_name]['abm_config'], extra_params=[namespace_name])  # Will fail if the namespace does not exist
+                    continue
+                except AlbaTimeOutException as ex:
+                    last_errors[namespace_name] = ex
+                    continue
+                except AlbaException as ex:
+                    if AlbaHealthCheck.NAMESPACE_NOT_FOUND_ERROR not in ex.message:
+                        last_errors[namespace_name] = ex
+                        continue
+                    result_handler.success('Namespace {0} successfully removed.'.format(namespace_name))
+                proxy_preset = pending.pop(namespace_name)
+                # be tidy, and make the proxy forget the namespace
+                try:
+                    AlbaCLI.run(command='proxy-statistics',
+                                named_params={'host': proxy_preset['ip'], 'port': proxy_preset['service'].ports[0]},
+                                extra_params=['--forget', namespace_name])
+                except:
+                    result_handler.warning('Failed to make proxy forget namespace {0}.'.format(namespace_name))
+            if len(pending) > 0:
+                time.sleep(AlbaHealthCheck.NAMESPACE_POLL_INTERVAL)
+        for namespace_name in pending:
+            message = 'Delete namespace {0} has timed out after {1}s'.format(namespace_name, time.time() - namespace_delete_start)
+            if namespace_name in last_errors:
+                message = '{0}, the last check failed with {1}'.format(message, str(last_errors[namespace_name]))
+            result_handler.failure(message)
+
+    @classmethod
+    @expose_to_cli(MODULE, 'proxy-bench', HealthCheckCLI.ADDON_TYPE,
+                   help='Measures the throughput and latency of the proxies for every preset in use',
+                   short_help='Benchmark the proxies')
+    @expose_to_cli.option('--object-count', '-n', type=int, default=10,
+                          help='Number of objects to upload and download per proxy and preset')
+    @expose_to_cli.option('--object-size', '-o', type=int, default=TEMP_FILE_SIZE,
+                          help='Size (in bytes) of every object')
+    @expose_to_cli.option('--min-throughput', '-t', type=float,
+                          help='Minimum throughput in MB/s for uploads and downloads. Defaults to the proxy_bench settings of the healthcheck')
+    @expose_to_cli.option('--max-latency', '-l', type=float,
+                          help='Maximum 99th percentile latency in seconds for uploads and downloads. Defaults to the proxy_bench settings of the healthcheck')
+    def benchmark_proxies(cls, result_handler, object_count=10, object_size=TEMP_FILE_SIZE, min_throughput=None, max_latency=None):
+        """
+        Uploads and downloads a number of objects through every proxy on the local machine for every preset in use
+        The throughput and latency percentiles are compared with the thresholds and with the results of previous runs
+        Combinations are benchmarked one after the other so they do not influence each other
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param object_count: Number of objects to upload and download per proxy and preset
+        :type object_count: int
+        :param object_size: Size (in bytes) of every object
+        :type object_size: int
+        :param min_throughput: Minimum throughput in MB/s. Defaults to the proxy_bench settings of the healthcheck
+        :type min_throughput: float
+        :param max_latency: Maximum 99th percentile latency in seconds. Defaults to the proxy_bench settings of the healthcheck
+        :type max_latency: float
+        :return: None
+        :rtype: NoneType
+        """
+        if object_count < 1 or object_size < 1:
+            return result_handler.failure('The object count and object size should be at least 1')
+        min_throughput = Helper.proxy_bench_min_throughput if min_throughput is None else min_throughput
+        max_latency = Helper.proxy_bench_max_latency if max_latency is None else max_latency
+        result_handler.info('Benchmarking the ALBA proxies.', add_to_result=False)
+        proxy_presets, _ = cls._get_proxy_presets(result_handler)
+        namespaces_to_remove = []
+        for proxy_preset in proxy_presets:
+            created_namespaces = []
+            timings = cls._benchmark_proxy_preset(result_handler, proxy_preset, object_count, object_size, created_namespaces)
+            namespaces_to_remove.extend((namespace_name, proxy_preset) for namespace_name in created_namespaces)
+            if timings is not None:
+                cls._report_proxy_benchmark(result_handler, proxy_preset, timings, object_size, min_throughput, max_latency)
+        cls._remove_test_namespaces(result_handler, proxy_presets, AlbaHealthCheck.BENCH_NAMESPACE_PREFIX, namespaces_to_remove)
+
+    @classmethod
+    def _benchmark_proxy_preset(cls, result_handler, proxy_preset, object_count, object_size, created_namespaces):
+        """
+        Creates a namespace with the given preset through the proxy and times the upload and download of a number of objects
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param proxy_preset: the proxy and preset to benchmark, as returned by _get_proxy_presets
+        :type proxy_preset: dict
+        :param object_count: Number of objects to upload and download
+        :type object_count: int
+        :param object_size: Size (in bytes) of every object
+        :type object_size: int
+        :param created_namespaces: the names of the namespaces created by the benchmark are appended to this list
+        :type created_namespaces: list[str]
+        :return: the duration of every upload and download or None when the benchmark failed
+        :rtype: dict
+        """
+        service = proxy_preset['service']
+        ip = proxy_preset['ip']
+        abm_config = proxy_preset['abm_config']
+        preset_name = proxy_preset['preset_name']
+        proxy_named_params = {'host': ip, 'port': service.ports[0]}
+        namespace_key = '{0}_{1}'.format(AlbaHealthCheck.BENCH_NAMESPACE_PREFIX.format(preset_name, AlbaHealthCheck.LOCAL_ID), uuid.uuid4())
+        temp_directory = FilesystemHelper.get_temp_directory()
+        temp_file = os.path.join(temp_directory, AlbaHealthCheck.TEMP_FILE_NAME.format(namespace_key))
+        temp_file_fetched = os.path.join(temp_directory, AlbaHealthCheck.TEMP_FILE_FETCHED_NAME.format(namespace_key))
+        timings = {'upload': [], 'download': []}
+        try:
+            cls._create_test_namespace(result_handler, service, ip, abm_config, namespace_key, preset_name, created_namespaces)
+            FilesystemHelper.write_random_file(temp_file, object_size, seed=uuid.uuid4().int)
+            object_keys = ['ovs-healthcheck-obj-{0}'.format(index) for index in xrange(object_count)]
+            for object_key in object_keys:
+                start = time.time()
+                AlbaCLI.run(command='proxy-upload-object', named_params=proxy_named_params, extra_params=[namespace_key, temp_file, object_key])
+                timings['upload'].append(time.time() - start)
+            for object_key in object_keys:
+                start = time.time()
+                AlbaCLI.run(command='proxy-download-object', named_params=proxy_named_params, extra_params=[namespace_key, object_key, temp_file_fetched])
+                timings['download'].append(time.time() - start)
+                FilesystemHelper.remove_file(temp_file_fetched)
+            return timings
+        except ValueError:
+            result_handler.failure('The preset is not available for use')
+        except AlbaException as ex:
+            result_handler.failure('Benchmarking proxy {0} with preset {1} has failed with {2}'.format(service.name, preset_name, str(ex)),
+                                   code=ErrorCodes.alba_cmd_fail)
+        finally:
+            FilesystemHelper.remove_file(temp_file)
+            FilesystemHelper.remove_file(temp_file_fetched)
+
+    @classmethod
+    def _report_proxy_benchmark(cls, result_handler, proxy_preset, timings, object_size, min_throughput, max_latency):
+        """
+        Reports the throughput and latency of a benchmark and compares them with the thresholds and with the previous runs
+        The results of the last runs are kept in the volatile store
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param proxy_preset: the benchmarked proxy and preset, as returned by _get_proxy_presets
+        :type proxy_preset: dict
+        :param timings: the duration of every upload and download
+        :type timings: dict
+        :param object_size: Size (in bytes) of every object
+        :type object_size: int
+        :param min_throughput: Minimum throughput in MB/s
+        :type min_throughput: float
+        :param max_latency: Maximum 99th percentile latency in seconds
+        :type max_latency: float
+        :return: None
+        :rtype: NoneType
+        """
+        service_name = proxy_preset['service'].name
+        preset_name = proxy_preset['preset_name']
+        cache_key = cls.PROXY_BENCH_CACHE_KEY.format(service_name, preset_name)
+        try:
+            history = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            history = None
+        if not isinstance(history, list):
+            history = []
+        summary = {'time': int(time.time())}
+        for operation in ['upload', 'download']:
+            durations = timings[operation]
+            throughput = len(durations) * object_size / max(sum(durations), 0.000001) / 1000 ** 2
+            latencies = dict(('p{0}'.format(percentile), StatisticsHelper.percentile(durations, percentile)) for percentile in [50, 95, 99])
+            summary[operation] = dict(throughput=throughput, **latencies)
+            identifier = '{0} through proxy {1} with preset {2}'.format(operation.capitalize(), service_name, preset_name)
+            result_handler.info('{0}: {1:.2f} MB/s, p50 {2:.3f}s, p95 {3:.3f}s, p99 {4:.3f}s'.format(identifier, throughput, latencies['p50'], latencies['p95'], latencies['p99']),
+                                add_to_result=False)
+            problems = []
+            if throughput < min_throughput:
+                problems.append('the throughput of {0:.2f} MB/s is below {1} MB/s'.format(throughput, min_throughput))
+            if latencies['p99'] > max_latency:
+                problems.append('the p99 latency of {0:.3f}s is above {1}s'.format(latencies['p99'], max_latency))
+            if len(problems) > 0:
+                result_handler.warning('{0}: {1}'.format(identifier, ' and '.join(problems)), code=ErrorCodes.proxy_bench_threshold)
+            else:
+                result_handler.success('{0} performs within the thresholds'.format(identifier), code=ErrorCodes.proxy_bench_ok)
+            previous_throughputs = [entry[operation]['throughput'] for entry in history if operation in entry]
+            if len(previous_throughputs) > 0:
+                reference = StatisticsHelper.median(previous_throughputs)
+                if throughput < reference * (1 - Helper.proxy_bench_max_degradation):
+                    result_handler.warning('{0}: the throughput of {1:.2f} MB/s dropped compared to {2:.2f} MB/s over the previous {3} run(s)'
+                                           .format(identifier, throughput, reference, len(previous_throughputs)),
+                                           code=ErrorCodes.proxy_bench_degraded)
+        CacheHelper.set(key=cache_key, item=(history + [summary])[-Helper.proxy_bench_history_size:])
 
     @staticmethod
     def _get_all_responding_backends(result_handler):
         """
         Fetches the responding alba backends. Logs when certain backends don't respond
+        The backends are collected concurrently, a backend which does not respond in time is reported and left out
         :param result_handler: logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :return: information about each alba backend
         :rtype: list[dict]
         """
         result = []
-        for alba_backend in BackendHelper.get_albabackends():
-            # check if backend would be available for vpool
+        alba_backends = list(BackendHelper.get_albabackends())
+        if len(alba_backends) == 0:
+            return result
+        executor = Executor(workers=Helper.backend_collection_workers)
+        for alba_backend in alba_backends:
+            executor.submit(AlbaHealthCheck._get_backend_information, args=(alba_backend,), timeout=Helper.backend_collection_timeout)
+        for alba_backend, task in zip(alba_backends, executor.run()):
             try:
-                # collect OSDs connected to a backend
-                osds = []
-                for local_stack in alba_backend.local_stack.itervalues():
-                    for osd_stack in local_stack.itervalues():
-                        for osd in osd_stack['osds'].itervalues():
-                            if alba_backend.guid != osd.get('claimed_by'):
-                                continue
-                            else:
-                                osds.append(osd)
-
-                # create result
-                result.append({
-                    'name': alba_backend.name,
-                    'alba_id': alba_backend.alba_id,
-                    'is_available_for_vpool': any(preset for preset in alba_backend.presets if preset.get('is_available') is True),
-                    'guid': alba_backend.guid,
-                    'backend_guid': alba_backend.backend_guid,
-                    'disks': osds,
-                    'type': alba_backend.scaling
-                })
+                result.append(task.get())
             except RuntimeError as ex:
                 result_handler.warning('Error occurred while unpacking alba backend {0}. Got {1}.'.format(alba_backend.name, ex))
+            except TaskTimeoutException:
+                result_handler.failure('Alba backend {0} did not return its information within {1}s. One of its ASD managers might not be responding'
+                                       .format(alba_backend.name, Helper.backend_collection_timeout),
+                                       code=ErrorCodes.alba_backend_unresponsive)
         return result
 
+    @staticmethod
+    def _get_backend_information(alba_backend):
+        """
+        Collects the information of an alba backend. Evaluating the dynamic properties contacts all ALBA nodes of the backend
+        :param alba_backend: the alba backend
+        :type alba_backend: ovs.dal.hybrids.albabackend.AlbaBackend
+        :return: information about the alba backend
+        :rtype: dict
+        """
+        # check if backend would be available for vpool
+        # collect OSDs connected to a backend
+        osds = []
+        for local_stack in alba_backend.local_stack.itervalues():
+            for osd_stack in local_stack.itervalues():
+                for osd in osd_stack['osds'].itervalues():
+                    if alba_backend.guid != osd.get('claimed_by'):
+                        continue
+                    else:
+                        osds.append(osd)
+
+        # create result
+        return {'name': alba_backend.name,
+                'alba_id': alba_backend.alba_id,
+                'is_available_for_vpool': any(preset for preset in alba_backend.presets if preset.get('is_available') is True),
+                'guid': alba_backend.guid,
+                'backend_guid': alba_backend.backend_guid,
+                'disks': osds,
+                'type': alba_backend.scaling}
+
     @staticmethod
     @cluster_check
     @expose_to_cli(MODULE, 'backend-test', HealthCheckCLI.ADDON_TYPE,
                    help='Verifies that the backends are still usable',
                    short_help='Test if backends are usable')
-    def check_backends(result_handler):
+    @expose_to_cli.option('--sample-fraction', '-f', type=float, default=1.0,
+                          help='Fraction of the ASDs to probe during this run. Every run probes another part of the ASDs so all ASDs are probed '
+                               'within 1/fraction runs. ASDs in error and ASDs which failed their last probe are always probed')
+    def check_backends(result_handler, sample_fraction=1.0):
         """
         Checks Alba as a whole
         :param result_handler: logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param sample_fraction: Fraction of the ASDs to probe during this run (0 < fraction <= 1)
+        :type sample_fraction: float
         :return: None
         :rtype: NoneType
         """
+        if not 0 < sample_fraction <= 1:
+            return result_handler.failure('The sample fraction should be bigger than 0 and at most 1, got {0}'.format(sample_fraction))
         result_handler.info('Checking available ALBA backends.', add_to_result=False)
         try:
             alba_backends = AlbaHealthCheck._get_all_responding_backends(result_handler)
@@ -445,6 +1145,7 @@ class AlbaHealthCheck(object):
             result_handler.success('We found {0} backend(s)!'.format(len(alba_backends)))
 
             result_handler.info('Checking the ALBA ASDs.', add_to_result=False)
+            backend_probes = []
             for backend in alba_backends:
                 backend_name = backend['name']
                 # Check disks of backend, ignore global backends
@@ -454,10 +1155,21 @@ class AlbaHealthCheck(object):
 
                 config = Configuration.get_configuration_path('/ovs/arakoon/{0}-abm/config'.format(backend_name))
                 try:
-                    result_disks = AlbaHealthCheck._check_backend_asds(result_handler, backend['disks'], backend_name, config)
+                    probes = AlbaHealthCheck._prepare_asd_probes(result_handler, backend['disks'], backend_name, config)
+                    backend_probes.append((backend, AlbaHealthCheck._sample_asd_probes(result_handler, probes, backend, sample_fraction)))
+                except Exception:
+                    result_handler.warning('Could not fetch the asd information for alba backend {0}'.format(backend_name))
+            # Probe the ASDs of all backends at once so the concurrency limits apply over all backends
+            AlbaHealthCheck._execute_asd_probes([probe for _, probes in backend_probes for probe in probes])
+            for backend, probes in backend_probes:
+                backend_name = backend['name']
+                try:
+                    result_disks = AlbaHealthCheck._report_asd_probes(result_handler, probes, backend_name)
                 except Exception:
                     result_handler.warning('Could not fetch the asd information for alba backend {0}'.format(backend_name))
                     continue
+                if sample_fraction < 1:
+                    AlbaHealthCheck._remember_failing_asds(backend, result_disks)
                 working_disks = result_disks['working']
                 defective_disks = result_disks['broken']
                 # Check if backend is available for vPool use
@@ -469,7 +1181,7 @@ class AlbaHealthCheck(object):
                                                .format(backend_name, len(working_disks), len(defective_disks), ', '.join(defective_disks)),
                                                code=ErrorCodes.osd_defective)
                 else:
-                    if len(working_disks) == 0 and len(defective_disks) == 0:
+                    if len(backend['disks']) == 0:
                         result_handler.skip('Alba backend {0} is not available for vPool use, there are no asds assigned to this backend!'.format(backend_name))
                     else:
                         result_handler.failure('Alba backend {0} is not available for vPool use, preset requirements not satisfied! There are {1} working asds AND {2} '
@@ -485,7 +1197,7 @@ class AlbaHealthCheck(object):
             result_handler.failure('Seems like an Arakoon has some problems: {0}'.format(str(e)),
                                    code=ErrorCodes.arakoon_problems)
 
-    @staticmethod
+    @classmethod
     @cluster_check
     @expose_to_cli(MODULE, 'disk-safety-test', HealthCheckCLI.ADDON_TYPE,
                    help='Verifies that namespaces have enough safety',
@@ -496,9 +1208,15 @@ class AlbaHealthCheck(object):
                           help='Backend(s) to skip checking for. Can be provided multiple times')
     @expose_to_cli.option('--include-errored-as-dead', '-i', is_flag=True,
                           help='OSDs with errors as treated as dead ones during the calculation')
-    def check_disk_safety(result_handler, backend=(), skip_backend=(), include_errored_as_dead=False):
+    @expose_to_cli.option('--top', '-t', type=int, default=10,
+                          help='Number of namespaces to list for every disk safety level which is not fully safe, the ones with the biggest share of their objects first')
+    @expose_to_cli.option('--list-namespaces', '-l', is_flag=True,
+                          help='List every namespace for every disk safety level which is not fully safe. Can produce a huge output')
+    def check_disk_safety(cls, result_handler, backend=(), skip_backend=(), include_errored_as_dead=False, top=10, list_namespaces=False):
         """
         Check safety of every namespace in every backend
+        Every run records a snapshot of the disk safety of every policy, the snapshots are used to follow up on the repair
+        and to forecast when the disk safety will reach zero
         :param result_handler: logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param backend: Backend(s) to check for (name does not fit the multiple options. This is to make it pretty for the CLI)
@@ -507,45 +1225,153 @@ class AlbaHealthCheck(object):
         :type skip_backend: tuple[str]
         :param include_errored_as_dead: OSDs with errors as treated as dead ones during the calculation
         :type include_errored_as_dead: bool
+        :param top: Number of namespaces to list for every disk safety level which is not fully safe
+        :type top: int
+        :param list_namespaces: List every namespace for every disk safety level which is not fully safe
+        :type list_namespaces: bool
         :return: None
         :rtype: NoneType
         """
-        def _get_output(namespaces_to_use):
-            return ',\n'.join(['{0} with {1}% of its objects'.format(n['namespace'], str(n['amount_in_bucket'])) for n in namespaces_to_use])
+        def _get_output(aggregate, level):
+            if list_namespaces is True:
+                return ',\n'.join(['{0} with {1}% of its objects'.format(n['namespace'], n['amount_in_bucket']) for n in aggregate.namespaces[level['safety']]])
+            output = ['{0} with {1:.5f}% of its objects'.format(namespace, percentage) for percentage, namespace in level['worst_namespaces']]
+            if level['namespace_count'] > len(output):
+                output.append('and {0} more namespace(s)'.format(level['namespace_count'] - len(output)))
+            return ',\n'.join(output)
 
-        results = AlbaHealthCheck.get_disk_safety(result_handler, backends_to_include=backend, backends_to_skip=skip_backend, include_errored_as_dead=include_errored_as_dead)
+        results = cls.get_disk_safety_summary(result_handler, backends_to_include=backend, backends_to_skip=skip_backend, include_errored_as_dead=include_errored_as_dead,
+                                              top_k=max(0, top), keep_namespaces=list_namespaces)
         for backend_name, policies in results.iteritems():
             result_handler.info('Checking disk safety on backend: {0}'.format(backend_name), add_to_result=False)
-            for policy_prefix, policy_details in policies.iteritems():
-                # '1,2' is policy_prefix and value is policy_details
-                # {'1,2': {'max_disk_safety': 2, 'current_disk_safety': {<namespaces in safety buckets>} }
-                result_handler.info('Checking policy {0} with max. disk safety {1}'.format(policy_prefix, policy_details['max_disk_safety']), add_to_result=False)
-                if len(policy_details['current_disk_safety'].values()) == 0:
+            for policy_prefix, aggregate in policies.iteritems():
+                # '1,2' is policy_prefix and value is the aggregated disk safety of the policy
+                max_disk_safety = aggregate.max_disk_safety
+                result_handler.info('Checking policy {0} with max. disk safety {1}'.format(policy_prefix, max_disk_safety), add_to_result=False)
+                levels = aggregate.get_levels()
+                if len(levels) == 0:
                     result_handler.skip('No data/namespaces found on backend {0}.'.format(backend_name), add_to_result=False)
                     continue
+                history = cls._record_disk_safety(backend_name, policy_prefix, aggregate, levels, include_errored_as_dead)
                 # If there is only 1 bucket category that is equal to the max_disk_safety, all your data is safe
-                if len(policy_details['current_disk_safety']) == 1 and policy_details['max_disk_safety'] in policy_details['current_disk_safety']:
+                if len(levels) == 1 and levels[0]['safety'] == max_disk_safety:
                     # all data is safe!
-                    result_handler.success('All data is safe on backend {0} with {1} namespace(s)'.format(backend_name, len(policy_details['current_disk_safety'][policy_details['max_disk_safety']])),
+                    result_handler.success('All data is safe on backend {0} with {1} namespace(s)'.format(backend_name, levels[0]['namespace_count']),
                                            code=ErrorCodes.disk_safety_ok)
                 else:
                     # Some data is not or less safe!
-                    for disk_safety, namespaces in policy_details['current_disk_safety'].iteritems():
-                        if disk_safety == policy_details['max_disk_safety']:
-                            result_handler.success('The disk safety of {0} namespace(s) is/are totally safe!'.format(len(namespaces)),
+                    for level in levels:
+                        disk_safety = level['safety']
+                        amount = '{0} namespace(s) ({1:.5f}% of the objects)'.format(level['namespace_count'], level['object_percentage'])
+                        if disk_safety == max_disk_safety:
+                            result_handler.success('The disk safety of {0} is/are totally safe!'.format(amount),
                                                    code=ErrorCodes.disk_safety_ok)
                         elif disk_safety > 0:
                             # Avoid failure override
-                            result_handler.warning('The disk safety of {0} namespace(s) is {1}, max. disk safety is {2}: \n{3}'.format(len(namespaces), disk_safety, policy_details['max_disk_safety'], _get_output(namespaces)),
+                            result_handler.warning('The disk safety of {0} is {1}, max. disk safety is {2}: \n{3}'.format(amount, disk_safety, max_disk_safety, _get_output(aggregate, level)),
                                                    code=ErrorCodes.disk_safety_warn)
-                        # @TODO: after x amount of hours in disk safety 0 put in error, else put in warning
                         elif disk_safety == 0:
-                            result_handler.failure('The disk safety of {0} namespace(s) is/are ZERO: \n{1}'.format(len(namespaces), _get_output(namespaces)),
+                            zero_hours = cls._get_zero_disk_safety_duration(history) / 3600.0
+                            duration = ' for at least {0:.1f} hour(s)'.format(zero_hours) if zero_hours > 0 else ''
+                            result_handler.failure('The disk safety of {0} is/are ZERO{1}: \n{2}'.format(amount, duration, _get_output(aggregate, level)),
                                                    code=ErrorCodes.disk_safety_error_zero)
                         else:
                             # Negative safety
-                            result_handler.failure('The disk safety of {0} namespace(s) is/are below ZERO, safety: {1}: \n{2}'.format(len(namespaces), disk_safety, _get_output(namespaces)),
+                            result_handler.failure('The disk safety of {0} is/are below ZERO, safety: {1}: \n{2}'.format(amount, disk_safety, _get_output(aggregate, level)),
                                                    code=ErrorCodes.disk_safety_error_negative)
+                cls._report_disk_safety_trend(result_handler, backend_name, policy_prefix, history)
+
+    @classmethod
+    def _record_disk_safety(cls, backend_name, policy_prefix, aggregate, levels, include_errored_as_dead=False):
+        """
+        Adds a snapshot of the disk safety of a policy to its history in the volatile store
+        Snapshots older than the configured history are dropped
+        :param backend_name: name of the backend
+        :type backend_name: str
+        :param policy_prefix: the policy, eg: '1,2'
+        :type policy_prefix: str
+        :param aggregate: the aggregated disk safety of the policy
+        :type aggregate: ovs.extensions.healthcheck.helpers.disksafety.DiskSafetyAggregate
+        :param levels: the safety levels of the policy, as returned by the aggregate
+        :type levels: list[dict]
+        :param include_errored_as_dead: whether OSDs with errors were treated as dead ones. Both calculations have their own history
+        :type include_errored_as_dead: bool
+        :return: the history of the policy, oldest snapshot first
+        :rtype: list[dict]
+        """
+        now = time.time()
+        cache_key = cls.DISK_SAFETY_CACHE_KEY.format(backend_name, policy_prefix, int(include_errored_as_dead))
+        try:
+            history = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            history = None
+        if not isinstance(history, list):
+            history = []
+        populated_safeties = [level['safety'] for level in levels if level['object_count'] > 0]
+        history = TrendHelper.prune(history, Helper.disk_safety_trend_history_hours * 3600, now)
+        history.append({'time': now,
+                        'objects': sum(level['object_count'] for level in levels),
+                        'degraded': sum(level['object_count'] for level in levels if level['safety'] < aggregate.max_disk_safety),
+                        'min_safety': min(populated_safeties) if len(populated_safeties) > 0 else aggregate.max_disk_safety})
+        CacheHelper.set(key=cache_key, item=history)
+        return history
+
+    @staticmethod
+    def _get_zero_disk_safety_duration(history):
+        """
+        Determines for how long the lowest disk safety has been zero or below, based on the latest consecutive snapshots
+        :param history: the history of a policy, oldest snapshot first
+        :type history: list[dict]
+        :return: the duration in seconds
+        :rtype: float
+        """
+        since = None
+        for snapshot in reversed(history):
+            if snapshot['min_safety'] > 0:
+                break
+            since = snapshot['time']
+        return 0 if since is None else history[-1]['time'] - since
+
+    @classmethod
+    def _report_disk_safety_trend(cls, result_handler, backend_name, policy_prefix, history):
+        """
+        Reports the repair rate of a policy and warns when the disk safety is expected to reach zero soon
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param backend_name: name of the backend
+        :type backend_name: str
+        :param policy_prefix: the policy, eg: '1,2'
+        :type policy_prefix: str
+        :param history: the history of the policy, oldest snapshot first
+        :type history: list[dict]
+        :return: None
+        :rtype: NoneType
+        """
+        identifier = 'Policy {0} on backend {1}'.format(policy_prefix, backend_name)
+        if len(history) < Helper.disk_safety_trend_min_samples:
+            result_handler.info('{0}: not enough snapshots yet to determine the disk safety trend'.format(identifier), add_to_result=False)
+            return
+        current = history[-1]
+        regression = TrendHelper.linear_regression([(snapshot['time'], snapshot['degraded']) for snapshot in history])
+        if regression is not None:
+            degraded_per_hour = regression[0] * 3600
+            if degraded_per_hour > 0:
+                result_handler.warning('{0}: {1:.0f} object(s) per hour lose safety faster than they are repaired'.format(identifier, degraded_per_hour),
+                                       code=ErrorCodes.disk_safety_repair_slow)
+            elif degraded_per_hour < 0 and current['degraded'] > 0:
+                result_handler.info('{0}: repairing {1:.0f} object(s) per hour, full disk safety expected in {2:.1f} hour(s)'
+                                    .format(identifier, -degraded_per_hour, current['degraded'] / -degraded_per_hour), add_to_result=False)
+        if current['min_safety'] <= 0:
+            return  # Reported by the disk safety levels
+        seconds_to_zero = TrendHelper.time_until([(snapshot['time'], snapshot['min_safety']) for snapshot in history], 0)
+        if seconds_to_zero is None:
+            return
+        hours_to_zero = seconds_to_zero / 3600.0
+        message = '{0}: the lowest disk safety is {1} and is expected to reach ZERO in {2:.1f} hour(s)'.format(identifier, current['min_safety'], hours_to_zero)
+        if hours_to_zero <= Helper.disk_safety_trend_forecast_hours:
+            result_handler.warning(message, code=ErrorCodes.disk_safety_forecast)
+        else:
+            result_handler.info(message, add_to_result=False)
 
     @classmethod
     def get_disk_safety(cls, result_handler, backends_to_include=(), backends_to_skip=(), include_errored_as_dead=False):
@@ -559,6 +1385,7 @@ class AlbaHealthCheck(object):
         {2: {'namespace': u'b4eef27e-ef54-4fe8-8658-cdfbda7ceae4_000000065', 'amount_in_bucket': 100}}}},
         'mybackend-global': {'1,2': {'max_disk_safety': 2, 'current_disk_safety':
         {1: {'namespace': u'e88c88c9-632c-4975-b39f-e9993e352560', 'amount_in_bucket': 100}}}}}
+        The output grows with the amount of namespaces, use get_disk_safety_summary for big backends
         :param result_handler: logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param backends_to_include: Backend(s) to check for
@@ -570,6 +1397,34 @@ class AlbaHealthCheck(object):
         :return: Safety of every namespace in every backend
         :rtype: dict
         """
+        summary = cls.get_disk_safety_summary(result_handler, backends_to_include=backends_to_include, backends_to_skip=backends_to_skip,
+                                              include_errored_as_dead=include_errored_as_dead, top_k=0, keep_namespaces=True)
+        disk_safety_overview = {}
+        for backend_name, policies in summary.iteritems():
+            disk_safety_overview[backend_name] = dict((policy_prefix, {'current_disk_safety': aggregate.namespaces, 'max_disk_safety': aggregate.max_disk_safety})
+                                                      for policy_prefix, aggregate in policies.iteritems())
+        return disk_safety_overview
+
+    @classmethod
+    def get_disk_safety_summary(cls, result_handler, backends_to_include=(), backends_to_skip=(), include_errored_as_dead=False, top_k=10, keep_namespaces=False):
+        """
+        Aggregate the safety of the namespaces in every backend per policy and safety level
+        Only the worst namespaces of every safety level are kept, unless keep_namespaces is set
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param backends_to_include: Backend(s) to check for
+        :type backends_to_include: tuple[str]
+        :param backends_to_skip: Backend(s) to skip checking for
+        :type backends_to_skip: tuple[str]
+        :param include_errored_as_dead: OSDs with errors as treated as dead ones during the calculation
+        :type include_errored_as_dead: bool
+        :param top_k: Number of namespaces with the biggest share of their objects to keep per safety level
+        :type top_k: int
+        :param keep_namespaces: Keep every namespace for every safety level
+        :type keep_namespaces: bool
+        :return: The aggregated safety (DiskSafetyAggregate) of every policy in every backend
+        :rtype: dict
+        """
         disk_safety_overview = {}
         for alba_backend in BackendHelper.get_albabackends():
             if backends_to_skip and alba_backend.name in backends_to_skip:
@@ -584,42 +1439,33 @@ class AlbaHealthCheck(object):
                 if include_errored_as_dead:
                     # @TODO Revisit once the https://github.com/openvstorage/alba/issues/441 has been resolved
                     extra_params.append('--include-errored-as-dead')
-                namespaces = AlbaCLI.run(command='get-disk-safety', config=config, extra_params=extra_params)
                 cache_eviction_prefix_preset_pairs = AlbaCLI.run(command='get-maintenance-config', config=config)['cache_eviction_prefix_preset_pairs']
                 presets = AlbaCLI.run(command='list-presets', config=config)
+
+                # collect in_use presets & their policies
+                for preset in presets:
+                    if not preset['in_use']:
+                        continue
+                    for policy in preset['policies']:
+                        aggregate = DiskSafetyAggregate(max_disk_safety=policy[1], top_k=top_k, keep_namespaces=keep_namespaces)
+                        disk_safety_overview[alba_backend.name]['{0},{1}'.format(str(policy[0]), str(policy[1]))] = aggregate
+
+                # collect namespaces. The output is streamed as it can become huge
+                ignorable_namespaces = tuple([cls.BASE_NAMESPACE_KEY] + cache_eviction_prefix_preset_pairs.keys())
+                for namespace in AlbaCLI.run_iter(command='get-disk-safety', config=config, extra_params=extra_params):
+                    namespace_name = namespace['namespace']
+                    if namespace_name.startswith(ignorable_namespaces):
+                        continue
+                    # calc total objects in namespace
+                    total_count = sum(bucket_safety['count'] for bucket_safety in namespace['bucket_safety'])
+                    for bucket_safety in namespace['bucket_safety']:
+                        safety = '{0},{1}'.format(str(bucket_safety['bucket'][0]), str(bucket_safety['bucket'][1]))
+                        disk_safety_overview[alba_backend.name][safety].add(namespace_name, bucket_safety['remaining_safety'], bucket_safety['count'], total_count)
             except AlbaException as ex:
                 result_handler.exception('Could not fetch alba information for backend {0} Message: {1}'.format(alba_backend.name, ex),
                                          code=ErrorCodes.alba_cmd_fail)
-                # Do not execute further
-                continue
-
-            # collect in_use presets & their policies
-            for preset in presets:
-                if not preset['in_use']:
-                    continue
-                for policy in preset['policies']:
-                    disk_safety_overview[alba_backend.name]['{0},{1}'.format(str(policy[0]), str(policy[1]))] = {'current_disk_safety': {}, 'max_disk_safety': policy[1]}
-
-            # collect namespaces
-            ignorable_namespaces = [cls.BASE_NAMESPACE_KEY] + cache_eviction_prefix_preset_pairs.keys()
-            test_worthy_namespaces = (item for item in namespaces if not item['namespace'].startswith(tuple(ignorable_namespaces)))
-            for namespace in test_worthy_namespaces:
-                # calc total objects in namespace
-                total_count = 0
-                for bucket_safety in namespace['bucket_safety']:
-                    total_count += bucket_safety['count']
-
-                for bucket_safety in namespace['bucket_safety']:
-                    # calc safety bucket
-                    calculated_disk_safety = bucket_safety['remaining_safety']
-                    safety = '{0},{1}'.format(str(bucket_safety['bucket'][0]), str(bucket_safety['bucket'][1]))
-                    current_disk_safety = disk_safety_overview[alba_backend.name][safety]['current_disk_safety']
-                    to_be_added_namespace = {'namespace': namespace['namespace'],
-                                             'amount_in_bucket': "%.5f" % (float(bucket_safety['count'])/float(total_count)*100)}
-                    if calculated_disk_safety in current_disk_safety:
-                        current_disk_safety[calculated_disk_safety].append(to_be_added_namespace)
-                    else:
-                        current_disk_safety[calculated_disk_safety] = [to_be_added_namespace]
+                # Do not report a partial overview
+                disk_safety_overview[alba_backend.name] = {}
         return disk_safety_overview
 
     # @todo: incorporate asd-manager code to check the service
@@ -636,14 +1482,15 @@ class AlbaHealthCheck(object):
         :rtype: NoneType
         """
         result_handler.info('Checking LOCAL ALBA services: ', add_to_result=False)
-        client = SSHClient(System.get_my_storagerouter())
+        client = SSHClientPool.get_client(System.get_my_storagerouter())
         service_manager = ServiceFactory.get_manager()
         services = [service for service in service_manager.list_services(client=client) if service.startswith(AlbaHealthCheck.MODULE)]
         if len(services) == 0:
             result_handler.skip('Found no LOCAL ALBA services.')
             return
+        statuses = ServiceStatusHelper.get_service_statuses(services, client, service_manager)
         for service_name in services:
-            if service_manager.get_service_status(service_name, client) == 'active':
+            if statuses[service_name] == 'active':
                 result_handler.success('Service {0} is running!'.format(service_name),
                                        code=ErrorCodes.alba_service_running)
             else:
@@ -694,6 +1541,7 @@ class AlbaHealthCheck(object):
     def check_nsm_load(cls, result_handler, max_load=None, use_total_capacity=False, total_capacity_warning=None, total_capacity_error=None):
         """
         Checks all NSM services registered within the Framework and will report their load
+        The amount of namespaces is recorded to project when the NSMs of every backend will reach the thresholds
         :param result_handler: logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param max_load: Maximum load percentage before marking it as overloaded. Defaults to ovs/framework/plugins/alba/config|nsm.maxload
@@ -710,6 +1558,9 @@ class AlbaHealthCheck(object):
         """
         max_nsm_load_config = Configuration.get('ovs/framework/plugins/alba/config|nsm.maxload')
         max_load = max_load or max_nsm_load_config
+        # Collect the NSM information of all backends at once, an unresponsive backend does not hold up the others
+        executor = Executor(workers=Helper.backend_collection_workers)
+        collected = []
         for alba_backend in AlbaBackendList.get_albabackends():
             if alba_backend.abm_cluster is None:
                 result_handler.failure('No ABM cluster found for ALBA Backend {0}'.format(alba_backend.name))
@@ -720,31 +1571,41 @@ class AlbaHealthCheck(object):
             if len(alba_backend.nsm_clusters) == 0:
                 result_handler.failure('ALBA Backend {0} does not have any registered NSM services'.format(alba_backend.name))
                 continue
+            task = executor.submit(cls._get_nsm_information, args=(alba_backend, use_total_capacity), timeout=Helper.backend_collection_timeout)
+            collected.append((alba_backend, task))
+        executor.run()
+        for alba_backend, task in collected:
+            try:
+                nsm_information = task.get()
+            except TaskTimeoutException:
+                result_handler.failure('The NSM information of ALBA Backend {0} could not be collected within {1}s'.format(alba_backend.name, Helper.backend_collection_timeout),
+                                       code=ErrorCodes.alba_backend_unresponsive)
+                continue
+            except AlbaException as ex:
+                result_handler.failure('Could not list the NSM hosts of ALBA Backend {0}: {1}'.format(alba_backend.name, ex),
+                                       code=ErrorCodes.alba_cmd_fail)
+                continue
             internal = alba_backend.abm_cluster.abm_services[0].service.is_internal
+            maximum_capacity_before_overload = AlbaHealthCheck._get_nsm_max_capacity_before_overload(alba_backend, max_nsm_load_config)
+            # The default thresholds depend on the capacity of the backend
+            capacity_warning = total_capacity_warning or math.ceil(maximum_capacity_before_overload * 1.0/5)
+            capacity_error = total_capacity_error or math.ceil(maximum_capacity_before_overload * 1.0/20)
+            current_capacity = nsm_information['namespaces']
             if use_total_capacity:
-                maximum_capacity_before_overload = AlbaHealthCheck._get_nsm_max_capacity_before_overload(alba_backend, max_nsm_load_config)
-                total_capacity_warning = total_capacity_warning or math.ceil(maximum_capacity_before_overload * 1.0/5)
-                total_capacity_error = total_capacity_error or math.ceil(maximum_capacity_before_overload * 1.0/20)
-                config = Configuration.get_configuration_path(key=alba_backend.abm_cluster.config_location)
-                hosts_data = AlbaCLI.run(command='list-nsm-hosts', config=config)
-                current_capacity = sum([host['namespaces_count'] for host in hosts_data if not host['lost']])
                 remaining_capacity = maximum_capacity_before_overload - current_capacity
-                if remaining_capacity > total_capacity_warning and remaining_capacity > total_capacity_error:  # Only error could be specified
+                if remaining_capacity > capacity_warning and remaining_capacity > capacity_error:  # Only error could be specified
                     result_handler.success('NSMs for backend {0} have enough capacity remaining ({1}/{2} used)'.format(alba_backend.name, current_capacity, maximum_capacity_before_overload),
                                            code=ErrorCodes.nsm_load_ok)
-                elif total_capacity_warning >= remaining_capacity > total_capacity_error:
+                elif capacity_warning >= remaining_capacity > capacity_error:
                     result_handler.warning('NSMs for backend {0} have reached the warning threshold '
-                                           '({1} namespaces had to be remaining, {2}/{3} used)'.format(alba_backend.name, total_capacity_warning, current_capacity, maximum_capacity_before_overload),
+                                           '({1} namespaces had to be remaining, {2}/{3} used)'.format(alba_backend.name, capacity_warning, current_capacity, maximum_capacity_before_overload),
                                            code=ErrorCodes.nsm_load_ok)
                 else:
                     result_handler.failure('NSMs for backend {0} have reached the error threshold '
-                                           '({1} namespaces had to be remaining, ({2}/{3} used)'.format(alba_backend.name, total_capacity_error, current_capacity, maximum_capacity_before_overload),
+                                           '({1} namespaces had to be remaining, ({2}/{3} used)'.format(alba_backend.name, capacity_error, current_capacity, maximum_capacity_before_overload),
                                            code=ErrorCodes.nsm_load_ok)
             else:
-                nsm_loads = {}
-                sorted_nsm_clusters = sorted(alba_backend.nsm_clusters, key=lambda k: k.number)
-                for nsm_cluster in sorted_nsm_clusters:
-                    nsm_loads[nsm_cluster.number] = AlbaController.get_load(nsm_cluster)
+                nsm_loads = nsm_information['loads']
                 overloaded = min(nsm_loads.values()) >= max_load
                 if overloaded is False:
                     result_handler.success('NSMs for backend {0} are not overloaded'.format(alba_backend.name),
@@ -756,6 +1617,76 @@ class AlbaHealthCheck(object):
                     else:
                         result_handler.failure('NSMs for backend {0} are overloaded. Please add your own NSM clusters to the backend'.format(alba_backend.name),
                                                code=ErrorCodes.nsm_load_failure)
+            cls._report_nsm_forecast(result_handler, alba_backend, current_capacity, maximum_capacity_before_overload - capacity_warning, maximum_capacity_before_overload - capacity_error)
+
+    @staticmethod
+    def _get_nsm_information(alba_backend, use_total_capacity):
+        """
+        Collects the amount of namespaces on the NSM hosts of a backend and, unless only the total capacity is used, the load of every NSM cluster
+        :param alba_backend: AlbaBackend object to use
+        :type alba_backend: ovs.dal.hybrids.albabackend.AlbaBackend
+        :param use_total_capacity: Only the total capacity is checked, the load of the NSM clusters is not needed
+        :type use_total_capacity: bool
+        :return: The amount of namespaces and the load of every NSM cluster by number
+        :rtype: dict
+        """
+        config = Configuration.get_configuration_path(key=alba_backend.abm_cluster.config_location)
+        hosts_data = AlbaCLI.run(command='list-nsm-hosts', config=config)
+        information = {'namespaces': sum([host['namespaces_count'] for host in hosts_data if not host['lost']])}
+        if use_total_capacity is False:
+            information['loads'] = dict((nsm_cluster.number, AlbaController.get_load(nsm_cluster)) for nsm_cluster in alba_backend.nsm_clusters)
+        return information
+
+    @classmethod
+    def _report_nsm_forecast(cls, result_handler, alba_backend, current_capacity, warning_capacity, error_capacity):
+        """
+        Records the amount of namespaces of a backend and projects when the NSMs will reach the warning and error thresholds
+        :param result_handler: logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param alba_backend: AlbaBackend object to use
+        :type alba_backend: ovs.dal.hybrids.albabackend.AlbaBackend
+        :param current_capacity: Current amount of namespaces
+        :type current_capacity: int
+        :param warning_capacity: Amount of namespaces at which the warning threshold is reached
+        :type warning_capacity: float
+        :param error_capacity: Amount of namespaces at which the error threshold is reached
+        :type error_capacity: float
+        :return: None
+        :rtype: NoneType
+        """
+        now = time.time()
+        cache_key = cls.NSM_LOAD_CACHE_KEY.format(alba_backend.guid)
+        try:
+            history = CacheHelper.get(key=cache_key)
+        except TypeError:  # Nothing has been cached yet
+            history = None
+        if not isinstance(history, list):
+            history = []
+        history = TrendHelper.prune(history, Helper.nsm_forecast_history_days * 86400, now)
+        points = [(sample['time'], sample['namespaces']) for sample in history] + [(now, current_capacity)]
+        if len(history) == 0 or now - history[-1]['time'] >= cls.NSM_LOAD_SAMPLE_INTERVAL:
+            history.append({'time': now, 'namespaces': current_capacity})
+        CacheHelper.set(key=cache_key, item=history)
+
+        if len(points) < Helper.nsm_forecast_min_samples:
+            result_handler.info('Not enough samples yet to forecast the NSM load of backend {0}'.format(alba_backend.name), add_to_result=False)
+            return
+        if current_capacity >= error_capacity:
+            return  # Reported by the load check
+        regression = TrendHelper.linear_regression(points)
+        seconds_to_error = TrendHelper.time_until(points, error_capacity)
+        if regression is None or seconds_to_error is None:
+            result_handler.info('The amount of namespaces on backend {0} is not growing'.format(alba_backend.name), add_to_result=False)
+            return
+        projection = 'NSMs for backend {0} grow by {1:.1f} namespaces per day and are expected to reach the error threshold in {2:.1f} day(s)'\
+            .format(alba_backend.name, regression[0] * 86400, seconds_to_error / 86400)
+        if current_capacity < warning_capacity:
+            seconds_to_warning = TrendHelper.time_until(points, warning_capacity)
+            projection = '{0} and the warning threshold in {1:.1f} day(s)'.format(projection, seconds_to_warning / 86400)
+        if seconds_to_error / 86400 <= Helper.nsm_forecast_days:
+            result_handler.warning(projection, code=ErrorCodes.nsm_load_forecast)
+        else:
+            result_handler.info(projection, add_to_result=False)
 
     @staticmethod
     def _get_nsm_max_capacity_before_overload(alba_backend, max_load=None):
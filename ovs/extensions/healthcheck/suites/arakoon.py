@@ -21,26 +21,25 @@ Arakoon Health Check module
 """
 from __future__ import absolute_import
 
-import os
-import json
 import time
-import Queue
 import socket
-import operator
 from datetime import timedelta
 from collections import OrderedDict
-from threading import Thread
-from ovs_extensions.constants.config import CACC_LOCATION
-from ovs_extensions.constants.arakoon import ARAKOON_BASE
-from ovs.extensions.db.arakooninstaller import ArakoonClusterConfig, ArakoonInstaller
+from ovs.extensions.db.arakooninstaller import ArakoonInstaller
 from ovs_extensions.db.arakoon.pyrakoon.pyrakoon.compat import ArakoonNoMaster, ArakoonNoMasterResult
-from ovs.extensions.generic.configuration import Configuration
-from ovs.extensions.generic.sshclient import SSHClient, TimeOutException, NotAuthenticatedException, UnableToConnectException
+from ovs.extensions.generic.sshclient import TimeOutException, NotAuthenticatedException, UnableToConnectException
 from ovs_extensions.generic.toolbox import ExtensionsToolbox
 from ovs.extensions.healthcheck.decorators import cluster_check
 from ovs.extensions.healthcheck.config.error_codes import ErrorCodes
 from ovs.extensions.healthcheck.expose_to_cli import expose_to_cli, HealthCheckCLI
+from ovs.extensions.healthcheck.helpers.arakoon import ArakoonClusterHelper
+from ovs.extensions.healthcheck.helpers.exceptions import TaskTimeoutException
+from ovs.extensions.healthcheck.helpers.executor import Executor
+from ovs.extensions.healthcheck.helpers.helper import Helper
 from ovs.extensions.healthcheck.helpers.network import NetworkHelper
+from ovs.extensions.healthcheck.helpers.nodestatus import NodeStatusHelper
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
+from ovs.extensions.healthcheck.helpers.tlog import TlogHelper
 from ovs.extensions.healthcheck.logger import Logger
 from ovs.extensions.services.servicefactory import ServiceFactory
 
@@ -63,30 +62,24 @@ class ArakoonHealthCheck(object):
         :rtype: dict(str, list[dict])
         """
         result_handler.info('Fetching available arakoon clusters.', add_to_result=False)
-        arakoon_clusters = {}
-        for cluster_name in list(Configuration.list(ARAKOON_BASE)) + ['cacc']:
-            # Determine Arakoon type
-            is_cacc = cluster_name == 'cacc'
-            arakoon_config = ArakoonClusterConfig(cluster_id=cluster_name, load_config=not is_cacc)
-            if is_cacc is True:
-                with open(CACC_LOCATION) as config_file:
-                    contents = config_file.read()
-                arakoon_config.read_config(contents=contents)
-            try:
-                arakoon_client = ArakoonInstaller.build_client(arakoon_config)
-            except (ArakoonNoMaster, ArakoonNoMasterResult) as ex:
-                result_handler.failure('Unable to find a master for Arakoon cluster {0}. (Message: {1})'.format(cluster_name, str(ex)),
+        clusters, errors = ArakoonClusterHelper.get_clusters()
+        for cluster_name, exception, trace in errors:
+            if isinstance(exception, (ArakoonNoMaster, ArakoonNoMasterResult)):
+                result_handler.failure('Unable to find a master for Arakoon cluster {0}. (Message: {1})'.format(cluster_name, str(exception)),
                                        code=ErrorCodes.master_none)
-            except Exception as ex:
-                msg = 'Unable to connect to Arakoon cluster {0}. (Message: {1})'.format(cluster_name, str(ex))
+            elif isinstance(exception, TaskTimeoutException):
+                result_handler.failure('Arakoon cluster {0} could not be reached in time. (Message: {1})'.format(cluster_name, str(exception)),
+                                       code=ErrorCodes.arakoon_node_unresponsive)
+            else:
+                msg = 'Unable to connect to Arakoon cluster {0}. (Message: {1})'.format(cluster_name, str(exception))
                 result_handler.exception(msg, code=ErrorCodes.unhandled_exception)
-                cls.logger.exception(msg)
-                continue
-            metadata = json.loads(arakoon_client.get(ArakoonInstaller.METADATA_KEY))
-            cluster_type = metadata['cluster_type']
-            if cluster_type not in arakoon_clusters:
-                arakoon_clusters[cluster_type] = []
-            arakoon_clusters[cluster_type].append({'cluster_name': cluster_name, 'client': arakoon_client, 'config': arakoon_config})
+                cls.logger.error('{0}\n{1}'.format(msg, trace))
+        # Every test adds its own results to the cluster information
+        arakoon_clusters = {}
+        for cluster in clusters:
+            if cluster['cluster_type'] not in arakoon_clusters:
+                arakoon_clusters[cluster['cluster_type']] = []
+            arakoon_clusters[cluster['cluster_type']].append({'cluster_name': cluster['cluster_name'], 'client': cluster['client'], 'config': cluster['config']})
         return arakoon_clusters
 
     @classmethod
@@ -95,58 +88,135 @@ class ArakoonHealthCheck(object):
                    help='Verify if nodes are missing and if nodes are catching up to the master',
                    short_help='Test if there are nodes missing/catching up')
     @expose_to_cli.option('--max-transactions-behind', '-m', type=int, default=10, help='The number of transactions that a slave can be behind a master before logging a failure')
-    def check_node_status(cls, result_handler, max_transactions_behind=10):
+    @expose_to_cli.option('--sample-interval', '-i', type=float,
+                          help='Seconds between the two samples used to determine whether lagging nodes are catching up. 0 to take a single sample. '
+                               'Defaults to the arakoon_node_status settings of the healthcheck')
+    def check_node_status(cls, result_handler, max_transactions_behind=10, sample_interval=None):
         """
         Checks the status of every node within the Arakoon cluster
         This check will report what nodes are currently missing and what nodes are catching up to the master
+        The statistics of all clusters are retrieved concurrently. Clusters with lagging nodes are sampled a second time
+        to determine whether these nodes are catching up or falling further behind
         :param result_handler: Logging object
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param max_transactions_behind: The number of transactions that a slave can be behind a master before logging a failure
         :type max_transactions_behind: int
+        :param sample_interval: Seconds between the two samples. 0 to take a single sample
+        :type sample_interval: float
         :return: None
         :rtype: NoneType
         """
+        sample_interval = Helper.arakoon_node_status_sample_interval if sample_interval is None else sample_interval
         result_handler.info('Starting Arakoon nodes test.', add_to_result=False)
         arakoon_clusters = cls._get_arakoon_clusters(result_handler)
-        for cluster_type, clusters in arakoon_clusters.iteritems():
+        clusters = []
+        for cluster_type, _clusters in arakoon_clusters.iteritems():
             result_handler.info('Fetching the status of {0} Arakoons'.format(cluster_type), add_to_result=False)
-            for cluster in clusters:
-                arakoon_client = cluster['client']
-                cluster_name = cluster['cluster_name']
-                arakoon_config = cluster['config']
-                # Map the node ids to the object for easier lookups
-                node_info = dict((node.name, node) for node in arakoon_config.nodes)
-                identifier = 'Arakoon cluster {0}'.format(cluster_name)
-                try:
-                    statistics = arakoon_client._client.statistics()
-                    node_is = statistics['node_is']
-                    # Look for any missing nodes within the cluster
-                    missing_ids = list(set(node_info.keys()) - set(node_is.keys()))
-                    if len(missing_ids) > 0:
-                        for missing_id in missing_ids:
-                            node_config = node_info[missing_id]
-                            result_handler.failure('{0} is missing node: {1}'.format(identifier, '{0} ({1}:{2})'.format(node_config.name, node_config.ip, node_config.client_port)),
-                                                   code=ErrorCodes.node_missing)
-                    highest_id = max(node_is.iteritems(), key=operator.itemgetter(1))[0]
-                    for node_id, transactions in node_is.iteritems():
-                        if node_id == highest_id:
-                            continue
-                        transactions_behind = node_is[highest_id] - transactions
-                        node_config = node_info[node_id]
-                        log = 'Node {0} ({1}:{2}) for {3} {{0}} ({4}/{5})'.format(node_config.name, node_config.ip, node_config.client_port,
-                                                                                  identifier, transactions_behind, max_transactions_behind)
-                        if transactions == 0:
-                            result_handler.warning(log.format('is catching up'), code=ErrorCodes.slave_catch_up)
-                        elif transactions_behind > max_transactions_behind:
-                            result_handler.failure(log.format('is behind the master'), code=ErrorCodes.master_behind)
-                        else:
-                            result_handler.success(log.format('is up to date'), code=ErrorCodes.node_up_to_date)
-                except (ArakoonNoMaster, ArakoonNoMasterResult) as ex:
-                    result_handler.failure('{0} cannot find a master. (Message: {1})'.format(identifier, str(ex)), code=ErrorCodes.master_none)
-                except Exception as ex:
-                    cls.logger.exception('Unhandled exception during the nodes check')
-                    result_handler.exception('Testing {0} threw an unhandled exception. (Message: {1})'.format(identifier, str(ex)),
-                                             code=ErrorCodes.unhandled_exception)
+            clusters.extend(_clusters)
+        first_samples = cls._sample_transactions(clusters)
+        lagging_clusters = []
+        for cluster, task in zip(clusters, first_samples):
+            if task.exception is None and NodeStatusHelper.has_lagging_nodes(task.result, max_transactions_behind) is True:
+                lagging_clusters.append(cluster)
+        second_samples = {}
+        if sample_interval > 0 and len(lagging_clusters) > 0:
+            result_handler.info('Sampling {0} Arakoon cluster(s) with lagging nodes again in {1}s'.format(len(lagging_clusters), sample_interval), add_to_result=False)
+            time.sleep(sample_interval)
+            for cluster, task in zip(lagging_clusters, cls._sample_transactions(lagging_clusters)):
+                second_samples[cluster['cluster_name']] = task
+        for cluster, task in zip(clusters, first_samples):
+            cls._report_node_status(result_handler, cluster, task, second_samples.get(cluster['cluster_name']), max_transactions_behind)
+
+    @classmethod
+    def _sample_transactions(cls, clusters):
+        """
+        Retrieve the amount of transactions of every node of the given Arakoon clusters concurrently
+        :param clusters: Clusters to sample, as returned by _get_arakoon_clusters
+        :type clusters: list[dict]
+        :return: The task of every cluster, holding the amount of transactions of every node
+        :rtype: list[ovs.extensions.healthcheck.helpers.executor.ExecutorTask]
+        """
+        executor = Executor(workers=Helper.arakoon_collection_workers)
+        for cluster in clusters:
+            executor.submit(cls._get_node_transactions, args=(cluster['client'],), timeout=Helper.arakoon_collection_node_timeout)
+        tasks = executor.run(timeout=Helper.arakoon_collection_timeout)
+        for cluster, task in zip(clusters, tasks):
+            if task.timed_out is True:
+                # The abandoned task might still be using the client
+                ArakoonClusterHelper.discard_client(cluster['cluster_name'])
+        return tasks
+
+    @staticmethod
+    def _get_node_transactions(arakoon_client):
+        """
+        Retrieve the amount of transactions of every node of an Arakoon cluster
+        :param arakoon_client: Client towards the Arakoon cluster
+        :type arakoon_client: ovs_extensions.db.arakoon.pyrakoon.client.PyrakoonClient
+        :return: The amount of transactions for every node name
+        :rtype: dict
+        """
+        return arakoon_client._client.statistics()['node_is']
+
+    @classmethod
+    def _report_node_status(cls, result_handler, cluster, first_sample, second_sample, max_transactions_behind):
+        """
+        Report the missing and lagging nodes of an Arakoon cluster
+        :param result_handler: Logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param cluster: The Arakoon cluster, as returned by _get_arakoon_clusters
+        :type cluster: dict
+        :param first_sample: Task which retrieved the amount of transactions of every node
+        :type first_sample: ovs.extensions.healthcheck.helpers.executor.ExecutorTask
+        :param second_sample: Task which retrieved the amount of transactions of every node again, None when the cluster was sampled only once
+        :type second_sample: ovs.extensions.healthcheck.helpers.executor.ExecutorTask
+        :param max_transactions_behind: The number of transactions that a slave can be behind a master before logging a failure
+        :type max_transactions_behind: int
+        :return: None
+        :rtype: NoneType
+        """
+        cluster_name = cluster['cluster_name']
+        arakoon_config = cluster['config']
+        # Map the node ids to the object for easier lookups
+        node_info = dict((node.name, node) for node in arakoon_config.nodes)
+        identifier = 'Arakoon cluster {0}'.format(cluster_name)
+        try:
+            node_is = first_sample.get()
+            # Look for any missing nodes within the cluster
+            missing_ids = list(set(node_info.keys()) - set(node_is.keys()))
+            if len(missing_ids) > 0:
+                for missing_id in missing_ids:
+                    node_config = node_info[missing_id]
+                    result_handler.failure('{0} is missing node: {1}'.format(identifier, '{0} ({1}:{2})'.format(node_config.name, node_config.ip, node_config.client_port)),
+                                           code=ErrorCodes.node_missing)
+            later_node_is = None
+            elapsed = 0
+            if second_sample is not None and second_sample.exception is None:
+                later_node_is = second_sample.result
+                elapsed = second_sample.start_time - first_sample.start_time
+            node_states = NodeStatusHelper.get_node_states(node_is, max_transactions_behind, later_node_is=later_node_is, elapsed=elapsed)
+            for node_id, (state, transactions_behind, rate) in node_states.iteritems():
+                node_config = node_info[node_id]
+                log = 'Node {0} ({1}:{2}) for {3} {{0}} ({4}/{5})'.format(node_config.name, node_config.ip, node_config.client_port,
+                                                                          identifier, transactions_behind, max_transactions_behind)
+                if state == NodeStatusHelper.FALLING_BEHIND:
+                    result_handler.failure(log.format('is falling further behind the master at {0:.1f} transactions/s'.format(-rate)), code=ErrorCodes.node_falling_behind)
+                elif state == NodeStatusHelper.CATCHING_UP:
+                    if rate is not None and rate > 0:
+                        result_handler.warning(log.format('is behind the master but catching up at {0:.1f} transactions/s'.format(rate)), code=ErrorCodes.slave_catch_up)
+                    else:
+                        result_handler.warning(log.format('is catching up'), code=ErrorCodes.slave_catch_up)
+                elif state == NodeStatusHelper.BEHIND:
+                    result_handler.failure(log.format('is behind the master'), code=ErrorCodes.master_behind)
+                else:
+                    result_handler.success(log.format('is up to date'), code=ErrorCodes.node_up_to_date)
+        except (ArakoonNoMaster, ArakoonNoMasterResult) as ex:
+            result_handler.failure('{0} cannot find a master. (Message: {1})'.format(identifier, str(ex)), code=ErrorCodes.master_none)
+        except TaskTimeoutException as ex:
+            result_handler.failure('{0} did not return its statistics in time. (Message: {1})'.format(identifier, str(ex)), code=ErrorCodes.arakoon_node_unresponsive)
+        except Exception as ex:
+            cls.logger.exception('Unhandled exception during the nodes check')
+            result_handler.exception('Testing {0} threw an unhandled exception. (Message: {1})'.format(identifier, str(ex)),
+                                     code=ErrorCodes.unhandled_exception)
 
     @classmethod
     @cluster_check
@@ -186,6 +256,9 @@ class ArakoonHealthCheck(object):
                                     message = 'Connection to {0} could not be established due to an unhandled exception.'.format(identifier_log)
                                     cls.logger.exception(message)
                                     result_handler.exception(message, code=ErrorCodes.unhandled_exception)
+                            elif step == 'timeout':
+                                result_handler.failure('Testing the connection to {0} timed out ({1})'.format(identifier_log, exception),
+                                                       code=ErrorCodes.arakoon_node_unresponsive)
                         continue
                     if stats['result'] is True:
                         result_handler.success('Connection established to {0}'.format(identifier_log),
@@ -195,7 +268,7 @@ class ArakoonHealthCheck(object):
                                                code=ErrorCodes.arakoon_connection_failure)
 
     @classmethod
-    def _get_port_connections(cls, result_handler, arakoon_clusters, batch_size=10):
+    def _get_port_connections(cls, result_handler, arakoon_clusters, batch_size=None):
         """
         Retrieve tlog/tlx stat information for a Arakoon cluster concurrently
         Note: this will mutate the given arakoon_clusters dict
@@ -203,8 +276,9 @@ class ArakoonHealthCheck(object):
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param arakoon_clusters: Information about all arakoon clusters, sorted by type and given config
         :type arakoon_clusters: dict
-        :param batch_size: Amount of workers to collect the Arakoon information.
+        :param batch_size: Amount of workers to collect the Arakoon information. Defaults to the configured amount
         Every worker will initiate a connection
+        :type batch_size: int
         :return: Dict with tlog/tlx contents for every node config
         Example return:
         {CFG: {ovs.extensions.db.arakooninstaller.ArakoonClusterConfig object: {ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig object: {'result': True,
@@ -213,7 +287,8 @@ class ArakoonHealthCheck(object):
                                                                                                                                                       'errors': []}}}
         :rtype: dict
         """
-        queue = Queue.Queue()
+        executor = Executor(workers=batch_size or Helper.arakoon_collection_workers)
+        collected = []
         # Prep work
         for cluster_type, clusters in arakoon_clusters.iteritems():
             for cluster in clusters:
@@ -224,37 +299,54 @@ class ArakoonHealthCheck(object):
                     result = {'errors': [],
                               'result': False}
                     cluster['connection_result'][node_config] = result
-                    queue.put((cluster_name, node_config, result))
-
-        for _ in xrange(batch_size):
-            thread = Thread(target=cls._connection_worker, args=(queue, result_handler))
-            thread.setDaemon(True)  # Setting threads as "daemon" allows main program to exit eventually even if these don't finish correctly.
-            thread.start()
-        # Wait for all results
-        queue.join()
+                    task = executor.submit(cls._test_connection, args=(result_handler, cluster_name, node_config),
+                                           timeout=Helper.arakoon_collection_node_timeout)
+                    collected.append((task, result))
+        executor.run(timeout=Helper.arakoon_collection_timeout)
+        for task, result in collected:
+            cls._store_task_outcome(task, result, 'test_connection')
         return arakoon_clusters
 
     @staticmethod
-    def _connection_worker(queue, result_handler):
+    def _store_task_outcome(task, result, step):
         """
-        Worker method to retrieve file descriptors
-        :param queue: Queue to use
-        :param result_handler: Logging object
+        Store the result of a finished task or the error it ran into
+        :param task: The executed task
+        :type task: ovs.extensions.healthcheck.helpers.executor.ExecutorTask
+        :param result: Result information of the node, containing the 'errors' and 'result' keys
+        :type result: dict
+        :param step: Step to register the error for when the task failed
+        :type step: str
         :return: None
         :rtype: NoneType
         """
-        while not queue.empty():
-            cluster_name, _node_config, _results = queue.get()
-            errors = _results['errors']
-            identifier = 'Arakoon cluster {0} on node {1}'.format(cluster_name, _node_config.ip)
-            result_handler.info('Testing the connection to {0}'.format(identifier), add_to_result=False)
-            try:
-                _results['result'] = NetworkHelper.check_port_connection(_node_config.client_port, _node_config.ip)
-            except Exception as ex:
-                errors.append(('test_connection', ex))
-                result_handler.warning('Could not test the connection to {0} ({1})'.format(identifier, str(ex)), add_to_result=False)
-            finally:
-                queue.task_done()
+        try:
+            result['result'] = task.get()
+        except TaskTimeoutException as ex:
+            result['errors'].append(('timeout', ex))
+        except Exception as ex:
+            result['errors'].append((step, ex))
+
+    @staticmethod
+    def _test_connection(result_handler, cluster_name, node_config):
+        """
+        Test the connection towards an Arakoon node
+        :param result_handler: Logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param cluster_name: Name of the Arakoon cluster
+        :type cluster_name: str
+        :param node_config: Configuration of the Arakoon node
+        :type node_config: ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig
+        :return: True when a connection could be established
+        :rtype: bool
+        """
+        identifier = 'Arakoon cluster {0} on node {1}'.format(cluster_name, node_config.ip)
+        result_handler.info('Testing the connection to {0}'.format(identifier), add_to_result=False)
+        try:
+            return NetworkHelper.check_port_connection(node_config.client_port, node_config.ip)
+        except Exception as ex:
+            result_handler.warning('Could not test the connection to {0} ({1})'.format(identifier, str(ex)), add_to_result=False)
+            raise
 
     @classmethod
     @cluster_check
@@ -316,19 +408,21 @@ class ArakoonHealthCheck(object):
                                     message = 'Unable to list the contents of the tlog directory ({0}) for {1}'.format(node.tlog_dir, identifier_log)
                                     cls.logger.exception(message)
                                     result_handler.exception(message, code=ErrorCodes.unhandled_exception)
+                            elif step == 'timeout':
+                                result_handler.warning('Retrieving the collapse information of {0} timed out ({1})'.format(identifier_log, exception),
+                                                       code=ErrorCodes.arakoon_node_unresponsive)
                         continue
                     tlx_files = stats['result']['tlx']
                     tlog_files = stats['result']['tlog']
-                    headdb_files = stats['result']['headDB']
+                    headdb_size = stats['result']['headdb_size']
                     avail_size = stats['result']['avail_size']
 
-                    if any(item is None for item in [tlx_files, tlog_files, avail_size]):
+                    if avail_size is None:
                         # Exception occurred but no errors were logged
                         result_handler.exception('Either the tlx or tlog files or available size could be found in/of the tlog directory ({0}) for {1}'.format(node.tlog_dir, identifier_log),
                                                  code=ErrorCodes.tlx_tlog_not_found)
                         continue
-                    if len(headdb_files) > 0:
-                        headdb_size = sum([int(i[2]) for i in headdb_files])
+                    if headdb_size > 0:
                         collapse_size_msg = 'Spare space for local collapse is'
                         if avail_size >= headdb_size * 4:
                             result_handler.success('{0} sufficient (n > 4x head.db size)'.format(collapse_size_msg))
@@ -339,15 +433,15 @@ class ArakoonHealthCheck(object):
                         else:
                             result_handler.failure('{0} insufficient (n <2 x head.db size'.format(collapse_size_msg))
 
-                    if len(tlog_files) == 0:
+                    if tlog_files['count'] == 0:
                         # A tlog should always be present
                         result_handler.failure('{0} has no open tlog'.format(identifier_log), code=ErrorCodes.tlog_not_found)
                         continue
-                    if len(tlx_files) < min_tlx_amount:
-                        result_handler.skip('{0} only has {1} tlx, not worth collapsing (required: {2})'.format(identifier_log, len(tlx_files), min_tlx_amount))
+                    if tlx_files['count'] < min_tlx_amount:
+                        result_handler.skip('{0} only has {1} tlx, not worth collapsing (required: {2})'.format(identifier_log, tlx_files['count'], min_tlx_amount))
                         continue
                     # Compare youngest tlog and oldest tlx timestamp
-                    seconds_difference = int(tlog_files[-1][0]) - int(tlx_files[0][0])
+                    seconds_difference = tlog_files['youngest'] - tlx_files['oldest']
                     if max_age_seconds > seconds_difference:
                         result_handler.success('{0} should not be collapsed. The oldest tlx is at least {1} days younger than the youngest tlog (actual age: {2})'.format(identifier_log, max_collapse_age, str(timedelta(seconds=seconds_difference))),
                                                code=ErrorCodes.collapse_ok)
@@ -355,7 +449,7 @@ class ArakoonHealthCheck(object):
                         result_handler.failure('{0} should be collapsed. The oldest tlx is currently {1} old'.format(identifier_log, str(timedelta(seconds=seconds_difference))), code=ErrorCodes.collapse_not_ok)
 
     @classmethod
-    def _retrieve_stats(cls, result_handler, arakoon_clusters, batch_size=10):
+    def _retrieve_stats(cls, result_handler, arakoon_clusters, batch_size=None):
         """
         Retrieve tlog/tlx stat information for a Arakoon cluster concurrently
         Note: this will mutate the given arakoon_clusters dict
@@ -363,20 +457,20 @@ class ArakoonHealthCheck(object):
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param arakoon_clusters: Information about all arakoon clusters, sorted by type and given config
         :type arakoon_clusters: dict
-        :param batch_size: Amount of workers to collect the Arakoon information.
+        :param batch_size: Amount of workers to collect the Arakoon information. Defaults to the configured amount
         Every worker means a connection towards a different node
-        :return: Dict with tlog/tlx contents for every node config
+        :type batch_size: int
+        :return: Dict with the tlog/tlx summary for every node config
         Example return:
-        {CFG: {ovs.extensions.db.arakooninstaller.ArakoonClusterConfig object: {ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig object: {'result': {'tlx': [['1513174398', '/opt/OpenvStorage/db/arakoon/config/tlogs/3393.tlx']],
-                                                                                                                                                                'tlog': [['1513178427', '/opt/OpenvStorage/db/arakoon/config/tlogs/3394.tlog']]},
-                                                                                                                                                     'errors': []},
-                                                                                ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig object: {'result': {'tlx': [['1513166090', '/opt/OpenvStorage/db/arakoon/config/tlogs/3392.tlx'], ['1513174418', '/opt/OpenvStorage/db/arakoon/config/tlogs/3393.tlx']],
-                                                                                                                                                                'tlog': [['1513178427', '/opt/OpenvStorage/db/arakoon/config/tlogs/3394.tlog']]}, 'errors': []}, <ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig object at 0x7fb3a84db090>: {'output': {'tlx': [['1513174358', '/opt/OpenvStorage/db/arakoon/config/tlogs/3393.tlx']], 'tlog': [['1513178427', '/opt/OpenvStorage/db/arakoon/config/tlogs/3394.tlog']]},
-                                                                                                                                                      'errors': []}}}
+        {CFG: {ovs.extensions.db.arakooninstaller.ArakoonClusterConfig object: {ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig object: {'result': {'tlx': {'count': 2, 'oldest': 1513166090, 'youngest': 1513174418},
+                                                                                                                                                                'tlog': {'count': 1, 'oldest': 1513178427, 'youngest': 1513178427},
+                                                                                                                                                                'headdb_size': 104857600,
+                                                                                                                                                                'avail_size': 5368709120},
+                                                                                                                                                     'errors': []}}}
         :rtype: dict
         """
-        queue = Queue.Queue()
-        clients = {}
+        executor = Executor(workers=batch_size or Helper.arakoon_collection_workers, group_limit=1)
+        collected = []
         # Prep work
         for cluster_type, clusters in arakoon_clusters.iteritems():
             for cluster in clusters:
@@ -385,76 +479,46 @@ class ArakoonHealthCheck(object):
                 cluster['collapse_result'] = {}
                 for node_config in arakoon_config.nodes:
                     result = {'errors': [],
-                              'result': {'tlx': [],
-                                         'tlog': [],
-                                         'headDB': [],
-                                         'avail_size': None}}
+                              'result': None}
                     cluster['collapse_result'][node_config] = result
                     # Build SSHClients outside the threads to avoid GIL
                     try:
-                        client = clients.get(node_config.ip)
-                        if client is None:
-                            client = SSHClient(node_config.ip, timeout=5)
-                            clients[node_config.ip] = client
+                        SSHClientPool.get_client(node_config.ip, timeout=5)
                     except Exception as ex:
                         result['errors'].append(('build_client', ex))
                         continue
-                    queue.put((cluster_name, node_config, result))
-        # Limit to one session for every node.
-        # Every process will fork from this one, creating a new session instead of using the already existing channel
-        # There might be an issue issue if a ssh session would take too long causing all workers to connect to that one node
-        # and therefore hitting the MaxSessions again (theory)
-        for _ in xrange(min(len(clients.keys()), batch_size)):
-            thread = Thread(target=cls._collapse_worker, args=(queue, clients, result_handler))
-            thread.setDaemon(True)  # Setting threads as "daemon" allows main program to exit eventually even if these don't finish correctly.
-            thread.start()
-        # Wait for all results
-        queue.join()
+                    # Limit to one session for every node, as every session towards the same node competes for its MaxSessions
+                    task = executor.submit(cls._get_collapse_information, args=(result_handler, cluster_name, node_config),
+                                           group=node_config.ip, timeout=Helper.arakoon_collection_node_timeout)
+                    collected.append((task, result))
+        executor.run(timeout=Helper.arakoon_collection_timeout)
+        for task, result in collected:
+            cls._store_task_outcome(task, result, 'stat_dir')
         return arakoon_clusters
 
-    @staticmethod
-    def _collapse_worker(queue, clients, result_handler):
+    @classmethod
+    def _get_collapse_information(cls, result_handler, cluster_name, node_config):
         """
-        Worker method to retrieve file descriptors
-        :param queue: Queue to use
-        :param clients: SSHClients to choose from
+        Summarize the tlog, tlx and head.db files of an Arakoon node and retrieve the available space in its tlog directory
         :param result_handler: Logging object
-        :return: None
-        :rtype: NoneType
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param cluster_name: Name of the Arakoon cluster
+        :type cluster_name: str
+        :param node_config: Configuration of the Arakoon node
+        :type node_config: ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig
+        :return: The amount, oldest and youngest modification time of the tlx and tlog files,
+        the total size of the head.db files and the available size (in bytes)
+        :rtype: dict
         """
-        while not queue.empty():
-            cluster_name, _node_config, _results = queue.get()
-            errors = _results['errors']
-            output = _results['result']
-            identifier = 'Arakoon cluster {0} on node {1}'.format(cluster_name, _node_config.ip)
-            result_handler.info('Retrieving collapse information for {0}'.format(identifier), add_to_result=False)
-            try:
-                _client = clients[_node_config.ip]
-                tlog_dir = _node_config.tlog_dir
-                path = os.path.join(tlog_dir, '*')
-                try:
-                    # List the contents of the tlog directory and sort by oldest modification date
-                    # Example output: (timestamp, name, size (bits)
-                    # 01111 file.tlog 101
-                    # 01112 file2.tlog 102
-                    timestamp_files = _client.run('stat -c "%Y %n %s" {0}'.format(path), allow_insecure=True)
-                    output['avail_size'] = _client.run("df {0} | tail -1 | awk '{{print $4}}'".format(path), allow_insecure=True)
-                except Exception as _ex:
-                    errors.append(('stat_dir', _ex))
-                    raise
-                # Sort and separate the timestamp item files
-                for split_entry in sorted((timestamp_file.split() for timestamp_file in timestamp_files.splitlines()), key=lambda split: int(split[0])):
-                    file_name = split_entry[1]
-                    if file_name.endswith('tlx'):
-                        output['tlx'].append(split_entry)
-                    elif file_name.endswith('tlog'):
-                        output['tlog'].append(split_entry)
-                    elif file_name.rsplit('/')[-1].startswith('head.db'):
-                        output['headDB'].append(split_entry)
-            except Exception as _ex:
-                result_handler.warning('Could not retrieve the collapse information for {0} ({1})'.format(identifier, str(_ex)), add_to_result=False)
-            finally:
-                queue.task_done()
+        identifier = 'Arakoon cluster {0} on node {1}'.format(cluster_name, node_config.ip)
+        result_handler.info('Retrieving collapse information for {0}'.format(identifier), add_to_result=False)
+        try:
+            with SSHClientPool.session(node_config.ip) as client:
+                probe_output = client.run(TlogHelper.get_collapse_probe(node_config.tlog_dir), allow_insecure=True)
+            return TlogHelper.parse_collapse_probe(probe_output)
+        except Exception as ex:
+            result_handler.warning('Could not retrieve the collapse information for {0} ({1})'.format(identifier, str(ex)), add_to_result=False)
+            raise
 
     @classmethod
     @cluster_check
@@ -550,6 +614,9 @@ class ArakoonHealthCheck(object):
                                     message = 'Unable to list the file descriptors for {0}'.format(identifier_log)
                                     cls.logger.exception(message)
                                     result_handler.exception(message, ErrorCodes.unhandled_exception)
+                            elif step == 'timeout':
+                                result_handler.warning('Retrieving the file descriptor information of {0} timed out ({1})'.format(identifier_log, exception),
+                                                       code=ErrorCodes.arakoon_node_unresponsive)
                         continue
                     fds = stats['result']['fds']
                     filtered_fds = [i for i in fds if i.split()[-1].strip('(').strip(')') in passed_connections]
@@ -565,7 +632,7 @@ class ArakoonHealthCheck(object):
                                                code=ErrorCodes.arakoon_fd_ok)
 
     @classmethod
-    def _get_filedescriptors(cls, result_handler, arakoon_clusters, batch_size=10):
+    def _get_filedescriptors(cls, result_handler, arakoon_clusters, batch_size=None):
         """
         Retrieve tlog/tlx stat information for a Arakoon cluster concurrently
         Note: this will mutate the given arakoon_clusters dict
@@ -573,13 +640,15 @@ class ArakoonHealthCheck(object):
         :type result_handler: ovs.extensions.healthcheck.result.HCResults
         :param arakoon_clusters: Information about all Arakoon clusters, sorted by type and given config
         :type arakoon_clusters: dict
-        :param batch_size: Amount of workers to collect the Arakoon information.
+        :param batch_size: Amount of workers to collect the Arakoon information. Defaults to the configured amount
         Every worker means a connection towards a different node
+        :type batch_size: int
         :return: Dict with file descriptors contents for every node config
         :rtype: dict
         """
-        queue = Queue.Queue()
-        clients = {}
+        executor = Executor(workers=batch_size or Helper.arakoon_collection_workers, group_limit=1)
+        collected = []
+        service_manager = ServiceFactory.get_manager()
         # Prep work
         for cluster_type, clusters in arakoon_clusters.iteritems():
             for cluster in clusters:
@@ -589,61 +658,46 @@ class ArakoonHealthCheck(object):
                 for node_config in arakoon_config.nodes:
                     result = {'errors': [],
                               'result': {'fds': []}}
+                    cluster['fd_result'][node_config] = result
                     # Build SSHClients outside the threads to avoid GIL
                     try:
-                        client = clients.get(node_config.ip)
-                        if client is None:
-                            client = SSHClient(node_config.ip, timeout=5)
-                            clients[node_config.ip] = client
+                        SSHClientPool.get_client(node_config.ip, timeout=5)
                     except Exception as ex:
                         result['errors'].append(('build_client', ex))
                         continue
-                    cluster['fd_result'][node_config] = result
-                    queue.put((cluster_name, node_config, result))
-        service_manager = ServiceFactory.get_manager()
-        # Limit to one session for every node.
-        # Every process will fork from this one, creating a new session instead of using the already existing channel
-        # There might be an issue issue if a ssh session would take too long causing all workers to connect to that one node
-        # and therefore hitting the MaxSessions again (theory)
-        for _ in xrange(min(len(clients.keys()), batch_size)):
-            thread = Thread(target=cls._fd_worker, args=(queue, clients, result_handler, service_manager))
-            thread.setDaemon(True)  # Setting threads as "daemon" allows main program to exit eventually even if these don't finish correctly.
-            thread.start()
-        # Wait for all results
-        queue.join()
+                    # Limit to one session for every node, as every session towards the same node competes for its MaxSessions
+                    task = executor.submit(cls._get_node_filedescriptors, args=(result_handler, cluster_name, node_config, service_manager),
+                                           group=node_config.ip, timeout=Helper.arakoon_collection_node_timeout)
+                    collected.append((task, result))
+        executor.run(timeout=Helper.arakoon_collection_timeout)
+        for task, result in collected:
+            cls._store_task_outcome(task, result, 'lsof')
         return arakoon_clusters
 
     @staticmethod
-    def _fd_worker(queue, clients, result_handler, service_manager):
+    def _get_node_filedescriptors(result_handler, cluster_name, node_config, service_manager):
         """
-        Worker method to retrieve file descriptors
-        :param queue: Queue to use
-        :param clients: SSHClients to choose from
+        Retrieve the open network file descriptors of an Arakoon node
         :param result_handler: Logging object
+        :type result_handler: ovs.extensions.healthcheck.result.HCResults
+        :param cluster_name: Name of the Arakoon cluster
+        :type cluster_name: str
+        :param node_config: Configuration of the Arakoon node
+        :type node_config: ovs_extensions.db.arakoon.arakooninstaller.ArakoonNodeConfig
         :param service_manager: Service manager instance
-        :return: None
-        :rtype: NoneType
+        :return: The file descriptors
+        :rtype: dict
         """
-        while not queue.empty():
-            cluster_name, _node_config, _results = queue.get(False)
-            errors = _results['errors']
-            output = _results['result']
-            identifier = 'Arakoon cluster {0} on node {1}'.format(cluster_name, _node_config.ip)
-            result_handler.info('Retrieving file descriptor information for {0}'.format(identifier), add_to_result=False)
-            try:
-                client = clients[_node_config.ip]
-                try:
-                    # Handle config Arakoon
-                    cluster_name = cluster_name if cluster_name != 'cacc' else 'config'
-                    service_name = ArakoonInstaller.get_service_name_for_cluster(cluster_name)
-                    pid = service_manager.get_service_pid(service_name, client)
-                    file_descriptors = client.run(['lsof', '-i', '-a', '-p', pid]).splitlines()[1:]
-                except Exception as _ex:
-                    errors.append(('lsof', _ex))
-                    raise
-                output['fds'] = file_descriptors
-            except Exception as _ex:
-                result_handler.warning(
-                    'Could not retrieve the file descriptor information for {0} ({1})'.format(identifier, str(_ex)), add_to_result=False)
-            finally:
-                queue.task_done()
+        identifier = 'Arakoon cluster {0} on node {1}'.format(cluster_name, node_config.ip)
+        result_handler.info('Retrieving file descriptor information for {0}'.format(identifier), add_to_result=False)
+        try:
+            # Handle config Arakoon
+            cluster_name = cluster_name if cluster_name != 'cacc' else 'config'
+            service_name = ArakoonInstaller.get_service_name_for_cluster(cluster_name)
+            with SSHClientPool.session(node_config.ip) as client:
+                pid = service_manager.get_service_pid(service_name, client)
+                file_descriptors = client.run(['lsof', '-i', '-a', '-p', pid]).splitlines()[1:]
+        except Exception as ex:
+            result_handler.warning('Could not retrieve the file descriptor information for {0} ({1})'.format(identifier, str(ex)), add_to_result=False)
+            raise
+        return {'fds': file_descriptors}
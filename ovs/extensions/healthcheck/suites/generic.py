@@ -27,7 +27,6 @@ from ovs.dal.hybrids.storagerouter import StorageRouter
 from ovs.dal.lists.domainlist import DomainList
 from ovs.dal.lists.vpoollist import VPoolList
 from ovs.extensions.generic.configuration import Configuration
-from ovs.extensions.generic.sshclient import SSHClient
 from ovs.extensions.generic.system import System
 from ovs.extensions.healthcheck.config.error_codes import ErrorCodes
 from ovs.extensions.healthcheck.expose_to_cli import expose_to_cli, HealthCheckCLI
@@ -35,6 +34,8 @@ from ovs.extensions.healthcheck.helpers.filesystem import FilesystemHelper
 from ovs.extensions.healthcheck.helpers.helper import Helper
 from ovs.extensions.healthcheck.helpers.network import NetworkHelper
 from ovs.extensions.healthcheck.helpers.rabbitmq import RabbitMQ
+from ovs.extensions.healthcheck.helpers.servicestatus import ServiceStatusHelper
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
 from ovs.extensions.packages.packagefactory import PackageFactory
 from ovs.extensions.services.servicefactory import ServiceFactory
 from ovs.lib.storagerouter import StorageRouterController
@@ -223,7 +224,7 @@ class OpenvStorageHealthCheck(object):
         :rtype: NoneType
         """
         result_handler.info('Checking OVS packages: ', add_to_result=False)
-        client = SSHClient(OpenvStorageHealthCheck.LOCAL_SR)
+        client = SSHClientPool.get_client(OpenvStorageHealthCheck.LOCAL_SR)
         package_manager = PackageFactory.get_manager()
         # Get all base packages
         base_packages = set()
@@ -262,13 +263,14 @@ class OpenvStorageHealthCheck(object):
         :rtype: NoneType
         """
         result_handler.info('Checking local ovs services.')
-        client = SSHClient(System.get_my_storagerouter())
+        client = SSHClientPool.get_client(System.get_my_storagerouter())
         service_manager = ServiceFactory.get_manager()
         services = [service for service in service_manager.list_services(client=client) if service.startswith(OpenvStorageHealthCheck.MODULE)]
         if len(services) == 0:
             result_handler.warning('Found no local ovs services.')
+        statuses = ServiceStatusHelper.get_service_statuses(services, client, service_manager)
         for service_name in services:
-            if service_manager.get_service_status(service_name, client) == 'active':
+            if statuses[service_name] == 'active':
                 result_handler.success('Service {0} is running!'.format(service_name), code=ErrorCodes.process_fwk)
             else:
                 result_handler.failure('Service {0} is not running, please check this.'.format(service_name), code=ErrorCodes.process_fwk)
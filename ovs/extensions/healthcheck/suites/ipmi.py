@@ -20,9 +20,9 @@ from __future__ import absolute_import
 from ovs.dal.lists.albanodelist import AlbaNodeList
 from ovs.extensions.generic.configuration import Configuration
 from ovs_extensions.generic.ipmi import IPMIController, IPMITimeOutException, IPMICallException
-from ovs.extensions.generic.sshclient import SSHClient
 from ovs.extensions.generic.system import System
 from ovs.extensions.healthcheck.expose_to_cli import expose_to_cli, HealthCheckCLI
+from ovs.extensions.healthcheck.helpers.sshpool import SSHClientPool
 from ovs.extensions.healthcheck.logger import Logger
 
 
@@ -55,7 +55,7 @@ class IPMIHealthCheck(object):
                 controller = IPMIController(ip=ip,
                                             username=ipmi_config.get('username'),
                                             password=ipmi_config.get('password'),
-                                            client=SSHClient(System.get_my_storagerouter()))
+                                            client=SSHClientPool.get_client(System.get_my_storagerouter()))
             except:
                 result_handler.failure('IPMI settings are not valid for AlbaNode with ID {0}'.format(node_id))
                 continue
@@ -0,0 +1,253 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+import socket
+import struct
+from threading import Thread
+from ovs.extensions.healthcheck.helpers.asd import ASDClient, ASDClientPool, ASDProtocol, ASDReader
+from ovs.extensions.healthcheck.helpers.exceptions import ASDException, ASDProtocolException
+from ovs.extensions.healthcheck.helpers.metrics import MetricsHelper
+
+
+class FakeASDServer(object):
+    """
+    Minimal in-memory ASD which understands the prologue, multi-get and apply
+    """
+    def __init__(self, long_id, supported_codes=(ASDProtocol.MULTI_GET, ASDProtocol.APPLY)):
+        self.long_id = long_id
+        self.supported_codes = supported_codes
+        self.store = {}
+        self.connections = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen(5)
+        self.port = self._socket.getsockname()[1]
+        self._thread = Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @staticmethod
+    def _receive(connection, length):
+        data = ''
+        while len(data) < length:
+            chunk = connection.recv(length - len(data))
+            if not chunk:
+                raise EOFError()
+            data += chunk
+        return data
+
+    def _serve(self):
+        while True:
+            try:
+                connection, _ = self._socket.accept()
+            except socket.error:
+                return
+            self.connections += 1
+            try:
+                self._handle(connection)
+            except (EOFError, socket.error):
+                pass
+            finally:
+                connection.close()
+
+    def _handle(self, connection):
+        magic = self._receive(connection, 4)
+        version = struct.unpack('<i', self._receive(connection, 4))[0]
+        long_id = None
+        if self._receive(connection, 1) == '\x01':
+            long_id = self._receive(connection, struct.unpack('<i', self._receive(connection, 4))[0])
+        if magic != ASDProtocol.MAGIC or version != ASDProtocol.VERSION:
+            connection.sendall(ASDProtocol.int32_to(ASDProtocol.RC_PROTOCOL_VERSION_MISMATCH))
+            return
+        if long_id is not None and long_id != self.long_id:
+            connection.sendall(ASDProtocol.int32_to(ASDProtocol.RC_ASD_ID_MISMATCH))
+            return
+        connection.sendall(ASDProtocol.int32_to(ASDProtocol.RC_OK) + ASDProtocol.string_to(self.long_id))
+        while True:
+            reader = ASDReader(self._receive(connection, struct.unpack('<i', self._receive(connection, 4))[0]))
+            code = reader.int32_from()
+            if code not in self.supported_codes:
+                response = ASDProtocol.int32_to(ASDProtocol.RC_UNKNOWN_OPERATION)
+            elif code == ASDProtocol.MULTI_GET:
+                keys = reader.list_from(reader.string_from)
+                values = [self.store.get(key) for key in keys]
+                encode = lambda value: ASDProtocol.string_to(value) + ASDProtocol.int32_to(ASDProtocol.CHECKSUM_NONE)
+                response = ASDProtocol.int32_to(ASDProtocol.RC_OK) + ASDProtocol.list_to(lambda value: ASDProtocol.option_to(encode, value), values)
+            else:
+                reader.list_from(lambda: None)  # No asserts are sent by the client
+                for _ in xrange(reader.int32_from()):
+                    if reader.int32_from() == ASDProtocol.UPDATE_SET:
+                        key = reader.string_from()
+                        self.store[key] = reader.string_from()
+                        reader.int32_from()
+                        reader.bool_from()
+                    else:
+                        self.store.pop(reader.string_from(), None)
+                response = ASDProtocol.int32_to(ASDProtocol.RC_OK)
+            connection.sendall(ASDProtocol.string_to(response))
+
+    def stop(self):
+        self._socket.close()
+
+
+class ScriptedASDServer(object):
+    """
+    ASD which expects literal requests and answers them with literal responses, independent of ASDProtocol
+    """
+    def __init__(self, conversation):
+        self.conversation = conversation
+        self.mismatches = []
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen(1)
+        self.port = self._socket.getsockname()[1]
+        self._thread = Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _serve(self):
+        connection, _ = self._socket.accept()
+        try:
+            for expected_request, response in self.conversation:
+                request = FakeASDServer._receive(connection, len(expected_request))
+                if request != expected_request:
+                    self.mismatches.append(request)
+                    return
+                connection.sendall(response)
+        except (EOFError, socket.error):
+            pass
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._socket.close()
+
+
+class ASDProtocolTest(object):
+
+    @staticmethod
+    def test_prologue():
+        assert ASDProtocol.prologue('asd') == 'aLbA' '\x01\x00\x00\x00' '\x01' '\x03\x00\x00\x00' 'asd'
+        assert ASDProtocol.prologue(None) == 'aLbA' '\x01\x00\x00\x00' '\x00'
+
+    @staticmethod
+    def test_multi_get():
+        # Llio lists are written in reverse order, followed by the priority
+        assert ASDProtocol.multi_get(['a', 'bc']) == '\x02\x00\x00\x00' '\x02\x00\x00\x00' 'bc' '\x01\x00\x00\x00' 'a' '\x00\x00\x00\x00'
+
+    @staticmethod
+    def test_apply():
+        assert ASDProtocol.apply(sets={'k': 'v'}) == ('\x00\x00\x00\x00'  # No asserts
+                                                      '\x01\x00\x00\x00'  # One update
+                                                      '\x01\x00\x00\x00' '\x01\x00\x00\x00' 'k' '\x01\x00\x00\x00' 'v' '\x01\x00\x00\x00' '\x00'
+                                                      '\x00\x00\x00\x00')
+        assert ASDProtocol.apply(deletes=['k']) == '\x00\x00\x00\x00' '\x01\x00\x00\x00' '\x02\x00\x00\x00' '\x01\x00\x00\x00' 'k' '\x00\x00\x00\x00'
+
+    @staticmethod
+    def test_reader():
+        reader = ASDReader('\x02\x00\x00\x00' '\x00' '\x01' '\x02\x00\x00\x00' 'ab')
+        assert reader.list_from(lambda: reader.option_from(reader.string_from)) == ['ab', None]
+        for read in [reader.int32_from, ASDReader('\x02').bool_from]:
+            try:
+                read()
+                assert False, 'Invalid data should not be accepted'
+            except ASDProtocolException:
+                pass
+
+    @staticmethod
+    def test_get_with_literal_frames():
+        server = ScriptedASDServer([('aLbA' '\x01\x00\x00\x00' '\x01' '\x0b\x00\x00\x00' 'asd_long_id',
+                                     '\x00\x00\x00\x00' '\x0b\x00\x00\x00' 'asd_long_id'),
+                                    ('\x13\x00\x00\x00' '\x02\x00\x00\x00' '\x01\x00\x00\x00' '\x03\x00\x00\x00' 'key' '\x00\x00\x00\x00',
+                                     '\x16\x00\x00\x00' '\x00\x00\x00\x00' '\x01\x00\x00\x00' '\x01' '\x05\x00\x00\x00' 'value' '\x01\x00\x00\x00')])
+        client = ASDClient('127.0.0.1', server.port, 'asd_long_id', timeout=5)
+        try:
+            assert client.get('key') == 'value'
+            assert server.mismatches == []
+        finally:
+            client.close()
+            server.stop()
+
+
+class ASDClientTest(object):
+
+    @staticmethod
+    def _run_against_server(test, **kwargs):
+        """
+        Run a test against a new fake ASD with an empty client pool and empty metrics
+        """
+        ASDClientPool.clear()
+        MetricsHelper.clear()
+        server = FakeASDServer('asd_long_id', **kwargs)
+        try:
+            test(server)
+        finally:
+            ASDClientPool.clear()
+            server.stop()
+
+    @staticmethod
+    def _assert_raises(exception_type, function, *args):
+        try:
+            function(*args)
+        except exception_type:
+            return
+        assert False, '{0} was not raised'.format(exception_type.__name__)
+
+    @staticmethod
+    def test_set_get_delete():
+        def _test(server):
+            client = ASDClientPool.get_client('127.0.0.1', server.port, 'asd_long_id')
+            client.set('ovs-healthcheck-key', 'value')
+            assert server.store == {'ovs-healthcheck-key': 'value'}
+            assert client.get('ovs-healthcheck-key') == 'value'
+            client.delete('ovs-healthcheck-key')
+            assert client.get('ovs-healthcheck-key') is None
+            assert server.store == {}
+            target = '127.0.0.1:{0}'.format(server.port)
+            assert MetricsHelper.get_metrics()['asd']['get'][target]['count'] == 2
+        ASDClientTest._run_against_server(_test)
+
+    @staticmethod
+    def test_connection_is_pooled():
+        def _test(server):
+            for _ in xrange(3):
+                client = ASDClientPool.get_client('127.0.0.1', server.port, 'asd_long_id')
+                client.set('key', 'value')
+                client.get('key')
+                client.delete('key')
+            assert server.connections == 1
+        ASDClientTest._run_against_server(_test)
+
+    @staticmethod
+    def test_wrong_long_id():
+        def _test(server):
+            client = ASDClientPool.get_client('127.0.0.1', server.port, 'other_long_id')
+            ASDClientTest._assert_raises(ASDProtocolException, client.get, 'key')
+        ASDClientTest._run_against_server(_test)
+
+    @staticmethod
+    def test_unsupported_request():
+        def _test(server):
+            client = ASDClientPool.get_client('127.0.0.1', server.port, 'asd_long_id')
+            ASDClientTest._assert_raises(ASDProtocolException, client.get, 'key')
+        ASDClientTest._run_against_server(_test, supported_codes=(ASDProtocol.APPLY,))
+
+    @staticmethod
+    def test_unreachable_asd():
+        def _test(server):
+            server.stop()
+            client = ASDClientPool.get_client('127.0.0.1', server.port, 'asd_long_id', timeout=1)
+            ASDClientTest._assert_raises(ASDException, client.set, 'key', 'value')
+        ASDClientTest._run_against_server(_test)
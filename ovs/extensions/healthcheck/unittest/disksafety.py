@@ -0,0 +1,51 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+from ovs.extensions.healthcheck.helpers.disksafety import DiskSafetyAggregate
+
+
+class DiskSafetyTest(object):
+
+    @staticmethod
+    def _fill(aggregate):
+        # 100 fully safe namespaces, 5 of which have part of their objects at a lower safety
+        for index in xrange(100):
+            namespace = 'namespace_{0}'.format(index)
+            if index < 5:
+                aggregate.add(namespace, 2, 100 - index * 10, 100)
+                aggregate.add(namespace, 1, index * 10, 100)
+            else:
+                aggregate.add(namespace, 2, 100, 100)
+
+    @staticmethod
+    def test_levels():
+        aggregate = DiskSafetyAggregate(max_disk_safety=2, top_k=3)
+        DiskSafetyTest._fill(aggregate)
+        levels = aggregate.get_levels()
+        assert [level['safety'] for level in levels] == [1, 2]
+        assert [level['namespace_count'] for level in levels] == [5, 100]
+        assert levels[0]['object_count'] == 100
+        assert abs(levels[0]['object_percentage'] - 1.0) < 1e-7
+        # Only the namespaces with the biggest share of their objects at the level are kept
+        assert [namespace for _, namespace in levels[0]['worst_namespaces']] == ['namespace_4', 'namespace_3', 'namespace_2']
+        assert aggregate.namespaces == {}
+
+    @staticmethod
+    def test_keep_namespaces():
+        aggregate = DiskSafetyAggregate(max_disk_safety=2, top_k=0, keep_namespaces=True)
+        DiskSafetyTest._fill(aggregate)
+        assert len(aggregate.namespaces[2]) == 100
+        assert aggregate.namespaces[1][1] == {'namespace': 'namespace_1', 'amount_in_bucket': '10.00000'}
+        assert aggregate.get_levels()[0]['worst_namespaces'] == []
@@ -0,0 +1,110 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+import time
+import collections
+from threading import Lock
+from ovs.extensions.healthcheck.helpers.exceptions import TaskTimeoutException
+from ovs.extensions.healthcheck.helpers.executor import Executor
+
+
+class ConcurrencyTracker(object):
+    """
+    Keeps track of the maximum amount of tasks which were running at the same time, in total and per group
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.running = collections.Counter()
+        self.max_running = collections.Counter()
+
+    def track(self, group, value):
+        with self.lock:
+            for key in [group, 'total']:
+                self.running[key] += 1
+                self.max_running[key] = max(self.max_running[key], self.running[key])
+        time.sleep(0.01)
+        with self.lock:
+            for key in [group, 'total']:
+                self.running[key] -= 1
+        return value
+
+
+class ExecutorTest(object):
+
+    @staticmethod
+    def test_results_are_ordered():
+        tracker = ConcurrencyTracker()
+        executor = Executor(workers=4)
+        tasks = [executor.submit(tracker.track, args=('host', value)) for value in xrange(20)]
+        executor.run()
+        assert [task.get() for task in tasks] == range(20)
+        assert tracker.max_running['total'] == 4
+
+    @staticmethod
+    def test_group_limit():
+        tracker = ConcurrencyTracker()
+        executor = Executor(workers=10, group_limit=2)
+        for value in xrange(30):
+            executor.submit(tracker.track, args=('host_{0}'.format(value % 3), value), group='host_{0}'.format(value % 3))
+        executor.run()
+        for host in ['host_0', 'host_1', 'host_2']:
+            assert tracker.max_running[host] == 2
+        assert tracker.max_running['total'] <= 6
+
+    @staticmethod
+    def test_exceptions_are_captured():
+        def _fail(value):
+            raise ValueError(value)
+        tracker = ConcurrencyTracker()
+        executor = Executor(workers=2)
+        failing = executor.submit(_fail, args=('broken',))
+        working = executor.submit(tracker.track, args=('host', 'working'))
+        executor.run()
+        assert working.get() == 'working'
+        assert isinstance(failing.exception, ValueError)
+        assert 'broken' in failing.traceback
+        try:
+            failing.get()
+            assert False, 'The exception of the task should have been raised'
+        except ValueError:
+            pass
+
+    @staticmethod
+    def test_timeouts():
+        tracker = ConcurrencyTracker()
+        executor = Executor(workers=1)
+        hanging = executor.submit(time.sleep, args=(5,), timeout=0.1)
+        # Picked up by a replacement worker once the hanging task has been abandoned
+        working = executor.submit(tracker.track, args=('host', 'working'), timeout=1)
+        start = time.time()
+        executor.run(timeout=2)
+        assert time.time() - start < 1
+        assert working.get() == 'working'
+        assert hanging.timed_out is True
+        try:
+            hanging.get()
+            assert False, 'The timeout of the task should have been raised'
+        except TaskTimeoutException:
+            pass
+
+    @staticmethod
+    def test_overall_timeout():
+        tracker = ConcurrencyTracker()
+        executor = Executor(workers=1)
+        executor.submit(time.sleep, args=(5,))
+        never_started = executor.submit(tracker.track, args=('host', 'never'))
+        executor.run(timeout=0.1)
+        assert never_started.timed_out is True
+        assert isinstance(never_started.exception, TaskTimeoutException)
@@ -0,0 +1,52 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+import os
+import zlib
+import shutil
+import tempfile
+from ovs.extensions.healthcheck.helpers.filesystem import FilesystemHelper
+
+
+class FilesystemTest(object):
+
+    @staticmethod
+    def test_random_file_checksum():
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'object')
+            size = FilesystemHelper.CHUNK_SIZE * 3 + 17
+            checksum = FilesystemHelper.write_random_file(filename, size, seed=1234)
+            with open(filename, 'rb') as input_file:
+                assert checksum == zlib.crc32(input_file.read()) & 0xffffffff
+            assert FilesystemHelper.get_checksum_of_file(filename) == (size, checksum)
+            # The same seed generates the same contents, another seed does not
+            assert FilesystemHelper.write_random_file(filename, size, seed=1234) == checksum
+            assert FilesystemHelper.write_random_file(filename, size, seed=4321) != checksum
+        finally:
+            shutil.rmtree(directory)
+
+    @staticmethod
+    def test_remove_file():
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'object')
+            FilesystemHelper.write_random_file(filename, 10, seed=1)
+            FilesystemHelper.remove_file(filename)
+            assert os.path.exists(filename) is False
+            # Removing a file which does not exist is not an error
+            FilesystemHelper.remove_file(filename)
+        finally:
+            shutil.rmtree(directory)
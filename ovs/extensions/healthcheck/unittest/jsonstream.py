@@ -0,0 +1,75 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+import json
+from StringIO import StringIO
+from ovs.extensions.healthcheck.helpers.jsonstream import AlbaJSONStream
+
+
+class AlbaJSONStreamTest(object):
+
+    @staticmethod
+    def _stream(output, chunk_size=7):
+        return AlbaJSONStream(StringIO(output).read, chunk_size=chunk_size)
+
+    @staticmethod
+    def test_items_are_yielded():
+        result = [{'namespace': 'ns_{0}'.format(i), 'bucket_safety': [{'bucket': [1, 2, 1, 2], 'count': i * 1000, 'remaining_safety': 2}]} for i in xrange(50)]
+        output = json.dumps({'success': True, 'result': result}, indent=2)
+        for chunk_size in [1, 3, 7, 64, 4096]:
+            assert list(AlbaJSONStreamTest._stream(output, chunk_size).iter_result()) == result
+
+    @staticmethod
+    def test_empty_result():
+        assert list(AlbaJSONStreamTest._stream('{"success":true,"result":[ ]}').iter_result()) == []
+
+    @staticmethod
+    def test_numbers_split_over_chunks():
+        assert list(AlbaJSONStreamTest._stream('{"success":true,"result":[123456789,2]}', chunk_size=3).iter_result()) == [123456789, 2]
+
+    @staticmethod
+    def test_non_ascii_is_filtered():
+        output = '{"success":true,"result":["na\xc3\xafve"]}'
+        assert list(AlbaJSONStreamTest._stream(output, chunk_size=2).iter_result()) == ['nave']
+
+    @staticmethod
+    def test_error():
+        output = json.dumps({'success': False, 'error': {'message': 'Namespace manager is down', 'exception_code': 5}})
+        try:
+            list(AlbaJSONStreamTest._stream(output).iter_result())
+            assert False, 'The error of the ALBA call should have been raised'
+        except RuntimeError as ex:
+            assert str(ex) == 'Namespace manager is down'
+
+    @staticmethod
+    def test_truncated_output():
+        try:
+            list(AlbaJSONStreamTest._stream('{"success":true,"result":[{"namespace": "a"}, {"names').iter_result())
+            assert False, 'Truncated output should not be accepted'
+        except ValueError:
+            pass
+
+    @staticmethod
+    def test_early_termination():
+        read_sizes = []
+
+        def _read(size):
+            read_sizes.append(size)
+            return '{"success":true,"result":[1,' if len(read_sizes) == 1 else '2,'
+        stream = AlbaJSONStream(_read)
+        for item in stream.iter_result():
+            if item == 2:
+                break
+        assert len(read_sizes) <= 3
@@ -0,0 +1,45 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+from ovs.extensions.healthcheck.helpers.metrics import MetricsHelper
+
+
+class MetricsTest(object):
+
+    @staticmethod
+    def test_histogram_buckets():
+        MetricsHelper.clear()
+        for duration in [0.01, 0.07, 0.07, 2, 1000]:
+            MetricsHelper.record_latency('alba_cli', 'list-presets', 'mybackend-abm', duration)
+        MetricsHelper.record_latency('alba_cli', 'list-presets', 'mybackend-abm', 0.3, failed=True)
+        histogram = MetricsHelper.get_metrics()['alba_cli']['list-presets']['mybackend-abm']
+        assert histogram['count'] == 6
+        assert histogram['failures'] == 1
+        assert histogram['min'] == 0.01
+        assert histogram['max'] == 1000
+        assert histogram['buckets']['<=0.05'] == 1
+        assert histogram['buckets']['<=0.1'] == 2
+        assert histogram['buckets']['<=0.5'] == 1
+        assert histogram['buckets']['<=2.5'] == 1
+        assert histogram['buckets']['+Inf'] == 1
+
+    @staticmethod
+    def test_targets_are_separated():
+        MetricsHelper.clear()
+        MetricsHelper.record_latency('alba_cli', 'asd-set', '10.100.1.1:8600', 0.1)
+        MetricsHelper.record_latency('alba_cli', 'asd-set', '10.100.1.2:8600', 0.1)
+        assert sorted(MetricsHelper.get_metrics()['alba_cli']['asd-set'].keys()) == ['10.100.1.1:8600', '10.100.1.2:8600']
+        MetricsHelper.clear()
+        assert MetricsHelper.get_metrics() == {}
@@ -0,0 +1,79 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+from ovs.extensions.healthcheck.helpers.nodestatus import NodeStatusHelper
+
+
+class NodeStatusTest(object):
+
+    @staticmethod
+    def test_transactions_behind():
+        assert NodeStatusHelper.get_transactions_behind({'node_1': 1000, 'node_2': 990, 'node_3': 0}) == {'node_2': 10, 'node_3': 1000}
+        assert NodeStatusHelper.get_transactions_behind({'node_1': 1000}) == {}
+        # A cluster which did not report any node must not raise
+        assert NodeStatusHelper.get_transactions_behind({}) == {}
+
+    @staticmethod
+    def test_has_lagging_nodes():
+        assert NodeStatusHelper.has_lagging_nodes({'node_1': 1000, 'node_2': 990}, 10) is False
+        assert NodeStatusHelper.has_lagging_nodes({'node_1': 1000, 'node_2': 989}, 10) is True
+        # A node without any transaction is catching up
+        assert NodeStatusHelper.has_lagging_nodes({'node_1': 5, 'node_2': 0}, 10) is True
+        assert NodeStatusHelper.has_lagging_nodes({}, 10) is False
+
+    @staticmethod
+    def test_catching_up():
+        states = NodeStatusHelper.get_node_states({'node_1': 1000, 'node_2': 500}, 10, later_node_is={'node_1': 1010, 'node_2': 810}, elapsed=2)
+        assert states == {'node_2': (NodeStatusHelper.CATCHING_UP, 500, 150.0)}
+
+    @staticmethod
+    def test_falling_behind():
+        states = NodeStatusHelper.get_node_states({'node_1': 1000, 'node_2': 500}, 10, later_node_is={'node_1': 1200, 'node_2': 510}, elapsed=2)
+        assert states == {'node_2': (NodeStatusHelper.FALLING_BEHIND, 500, -95.0)}
+        # A node without transactions which does not progress is falling behind as well
+        states = NodeStatusHelper.get_node_states({'node_1': 1000, 'node_2': 0}, 10, later_node_is={'node_1': 1010, 'node_2': 0}, elapsed=1)
+        assert states == {'node_2': (NodeStatusHelper.FALLING_BEHIND, 1000, -10.0)}
+
+    @staticmethod
+    def test_behind_without_progress():
+        states = NodeStatusHelper.get_node_states({'node_1': 1000, 'node_2': 500}, 10, later_node_is={'node_1': 1000, 'node_2': 500}, elapsed=2)
+        assert states == {'node_2': (NodeStatusHelper.BEHIND, 500, 0.0)}
+
+    @staticmethod
+    def test_node_missing_from_second_sample():
+        states = NodeStatusHelper.get_node_states({'node_1': 1000, 'node_2': 500, 'node_3': 995}, 10,
+                                                  later_node_is={'node_1': 1010, 'node_3': 1005}, elapsed=2)
+        assert states == {'node_2': (NodeStatusHelper.BEHIND, 500, None),
+                          'node_3': (NodeStatusHelper.UP_TO_DATE, 5, 0.0)}
+        # Nothing could be sampled the second time
+        states = NodeStatusHelper.get_node_states({'node_1': 1000, 'node_2': 0}, 10, later_node_is={}, elapsed=2)
+        assert states == {'node_2': (NodeStatusHelper.CATCHING_UP, 1000, None)}
+
+    @staticmethod
+    def test_single_sample():
+        # A sample interval of 0 results in a single sample: lagging nodes are classified by their amount of transactions only
+        node_is = {'node_1': 1000, 'node_2': 0, 'node_3': 500, 'node_4': 1000}
+        for later_node_is, elapsed in [(None, 0), (dict(node_is), 0)]:
+            states = NodeStatusHelper.get_node_states(node_is, 10, later_node_is=later_node_is, elapsed=elapsed)
+            assert len(states) == 3
+            assert states['node_2'] == (NodeStatusHelper.CATCHING_UP, 1000, None)
+            assert states['node_3'] == (NodeStatusHelper.BEHIND, 500, None)
+            # Either node_1 or node_4 is the reference node
+            assert states.get('node_1', states.get('node_4')) == (NodeStatusHelper.UP_TO_DATE, 0, None)
+
+    @staticmethod
+    def test_no_nodes():
+        assert NodeStatusHelper.get_node_states({}, 10) == {}
+        assert NodeStatusHelper.get_node_states({}, 10, later_node_is={}, elapsed=2) == {}
@@ -0,0 +1,60 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+import sys
+import json
+from StringIO import StringIO
+from ovs.extensions.healthcheck.helpers.metrics import MetricsHelper
+from ovs.extensions.healthcheck.result import HCResults
+
+
+class ResultTest(object):
+
+    @staticmethod
+    def _get_json_output(result_handler, metrics=None):
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            result_handler.get_results(metrics=metrics)
+            return json.loads(sys.stdout.getvalue())
+        finally:
+            sys.stdout = stdout
+
+    @staticmethod
+    def test_metrics_in_json_output():
+        MetricsHelper.clear()
+        result_handler = HCResults(to_json=True)
+        result_handler.success('All good', test_name='alba-proxy-test')
+        MetricsHelper.record_latency('alba_cli', 'list-presets', 'mybackend-abm', 0.07)
+        output = ResultTest._get_json_output(result_handler, metrics=MetricsHelper.get_metrics())
+        assert sorted(output.keys()) == ['metrics', 'result']
+        assert output['result']['alba-proxy-test']['state'] == 'SUCCESS'
+        assert output['metrics']['alba_cli']['list-presets']['mybackend-abm']['count'] == 1
+        # The metrics are only part of the printed document, not of the test results
+        assert 'metrics' not in result_handler.result_dict
+
+    @staticmethod
+    def test_test_named_metrics():
+        result_handler = HCResults(to_json=True)
+        result_handler.failure('Not good', test_name='metrics')
+        output = ResultTest._get_json_output(result_handler, metrics={})
+        assert output['result']['metrics']['state'] == 'FAILED'
+        assert output['metrics'] == {}
+
+    @staticmethod
+    def test_no_metrics():
+        result_handler = HCResults(to_json=True)
+        result_handler.success('All good', test_name='alba-proxy-test')
+        assert ResultTest._get_json_output(result_handler).keys() == ['alba-proxy-test']
@@ -0,0 +1,121 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+from ovs.extensions.healthcheck.helpers.servicestatus import ServiceStatusHelper
+
+SYSTEMCTL_SHOW_OUTPUT = """Id=ovs-workers.service
+LoadState=loaded
+ActiveState=active
+
+Id=ovs-arakoon-config.service
+LoadState=loaded
+ActiveState=failed
+
+Id=ovs-unknown.service
+LoadState=not-found
+ActiveState=inactive
+"""
+
+INITCTL_LIST_OUTPUT = """ovs-workers start/running, process 1234
+ovs-arakoon-config stop/waiting
+ovs-volumedriver_mypool start/running, process 5678
+tty1 start/running, process 1001
+"""
+
+
+class FakeClient(object):
+    """
+    Client which returns canned output and records the commands it was asked to run
+    """
+    def __init__(self, init_system, outputs):
+        self.ip = '10.100.1.1'
+        self.init_system = init_system
+        self.outputs = outputs
+        self.commands = []
+
+    def run(self, command):
+        self.commands.append(command)
+        if command == ['cat', '/proc/1/comm']:
+            return self.init_system
+        output = self.outputs[command[0]]
+        if isinstance(output, Exception):
+            raise output
+        return output
+
+
+class FakeServiceManager(object):
+    """
+    Service manager which reports every service as 'inactive' and records the services it was asked for
+    """
+    def __init__(self):
+        self.requested = []
+
+    def get_service_status(self, name, client):
+        _ = client
+        self.requested.append(name)
+        return 'inactive'
+
+
+class ServiceStatusTest(object):
+
+    @staticmethod
+    def test_parse_systemctl_show():
+        statuses = ServiceStatusHelper._parse_systemctl_show(SYSTEMCTL_SHOW_OUTPUT, ['ovs-workers', 'ovs-arakoon-config', 'ovs-unknown', 'ovs-missing'])
+        assert statuses == {'ovs-workers': 'active', 'ovs-arakoon-config': 'failed'}
+
+    @staticmethod
+    def test_parse_initctl_list():
+        statuses = ServiceStatusHelper._parse_initctl_list(INITCTL_LIST_OUTPUT, ['ovs-workers', 'ovs-arakoon-config', 'ovs-missing'])
+        assert statuses == {'ovs-workers': 'active', 'ovs-arakoon-config': 'inactive'}
+
+    @staticmethod
+    def test_systemd_with_fallback():
+        ServiceStatusHelper.clear()
+        client = FakeClient('systemd\n', {'systemctl': SYSTEMCTL_SHOW_OUTPUT})
+        service_manager = FakeServiceManager()
+        statuses = ServiceStatusHelper.get_service_statuses(['ovs-workers', 'ovs-arakoon-config', 'ovs-unknown'], client, service_manager)
+        assert statuses == {'ovs-workers': 'active', 'ovs-arakoon-config': 'failed', 'ovs-unknown': 'inactive'}
+        # Only the unit which is unknown to systemd is asked one by one
+        assert service_manager.requested == ['ovs-unknown']
+        assert client.commands[1] == ['systemctl', 'show', '--property=Id,LoadState,ActiveState', '--',
+                                      'ovs-workers.service', 'ovs-arakoon-config.service', 'ovs-unknown.service']
+
+    @staticmethod
+    def test_upstart():
+        ServiceStatusHelper.clear()
+        client = FakeClient('init\n', {'initctl': INITCTL_LIST_OUTPUT})
+        service_manager = FakeServiceManager()
+        statuses = ServiceStatusHelper.get_service_statuses(['ovs-workers', 'ovs-volumedriver_mypool', 'ovs-missing'], client, service_manager)
+        assert statuses == {'ovs-workers': 'active', 'ovs-volumedriver_mypool': 'active', 'ovs-missing': 'inactive'}
+        assert service_manager.requested == ['ovs-missing']
+
+    @staticmethod
+    def test_statuses_are_cached():
+        ServiceStatusHelper.clear()
+        client = FakeClient('systemd\n', {'systemctl': SYSTEMCTL_SHOW_OUTPUT})
+        service_manager = FakeServiceManager()
+        ServiceStatusHelper.get_service_statuses(['ovs-workers', 'ovs-arakoon-config'], client, service_manager)
+        statuses = ServiceStatusHelper.get_service_statuses(['ovs-workers'], client, service_manager)
+        assert statuses == {'ovs-workers': 'active'}
+        assert len(client.commands) == 2
+
+    @staticmethod
+    def test_failing_bulk_call():
+        ServiceStatusHelper.clear()
+        client = FakeClient('systemd\n', {'systemctl': RuntimeError('systemctl is not available')})
+        service_manager = FakeServiceManager()
+        statuses = ServiceStatusHelper.get_service_statuses(['ovs-workers', 'ovs-arakoon-config'], client, service_manager)
+        assert statuses == {'ovs-workers': 'inactive', 'ovs-arakoon-config': 'inactive'}
+        assert service_manager.requested == ['ovs-workers', 'ovs-arakoon-config']
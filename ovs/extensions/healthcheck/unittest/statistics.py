@@ -0,0 +1,45 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+from ovs.extensions.healthcheck.helpers.statistics import StatisticsHelper
+
+
+class StatisticsTest(object):
+
+    @staticmethod
+    def test_percentiles():
+        values = [5, 1, 4, 2, 3]
+        assert StatisticsHelper.median(values) == 3
+        assert StatisticsHelper.median([1, 2, 3, 4]) == 2.5
+        assert StatisticsHelper.percentile(values, 0) == 1
+        assert StatisticsHelper.percentile(values, 100) == 5
+        assert StatisticsHelper.median_absolute_deviation(values) == 1
+        assert StatisticsHelper.median([]) is None
+
+    @staticmethod
+    def test_slow_disk_is_an_outlier():
+        samples = dict(('asd_{0}'.format(i), 0.010 + i * 0.001) for i in xrange(11))
+        samples['dying_asd'] = 2.0
+        assert StatisticsHelper.find_outliers(samples, minimum_value=0.1).keys() == ['dying_asd']
+
+    @staticmethod
+    def test_no_outliers():
+        samples = dict(('asd_{0}'.format(i), 0.010) for i in xrange(11))
+        assert StatisticsHelper.find_outliers(samples) == {}
+        # Significantly slower, but still fast enough
+        samples['asd_11'] = 0.05
+        assert StatisticsHelper.find_outliers(samples, minimum_value=0.1) == {}
+        # Not enough samples to compare
+        assert StatisticsHelper.find_outliers({'asd_1': 0.01, 'asd_2': 2.0}) == {}
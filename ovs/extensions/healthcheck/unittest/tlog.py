@@ -0,0 +1,71 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+import os
+import shutil
+import tempfile
+import subprocess
+from ovs.extensions.healthcheck.helpers.tlog import TlogHelper
+
+
+class TlogTest(object):
+
+    @staticmethod
+    def test_parse_collapse_probe():
+        output = TlogHelper.parse_collapse_probe('tlx 3392 1513166090 1513174418\n'
+                                                 'tlog 1 1513178427 1513178427\n'
+                                                 'headdb 104857600\n'
+                                                 'avail 5368709120\n')
+        assert output == {'tlx': {'count': 3392, 'oldest': 1513166090, 'youngest': 1513174418},
+                          'tlog': {'count': 1, 'oldest': 1513178427, 'youngest': 1513178427},
+                          'headdb_size': 104857600,
+                          'avail_size': 5368709120}
+
+    @staticmethod
+    def test_parse_empty_directory():
+        output = TlogHelper.parse_collapse_probe('headdb 0\navail 5368709120\n')
+        assert output == {'tlx': {'count': 0, 'oldest': None, 'youngest': None},
+                          'tlog': {'count': 0, 'oldest': None, 'youngest': None},
+                          'headdb_size': 0,
+                          'avail_size': 5368709120}
+
+    @staticmethod
+    def test_parse_missing_avail():
+        # df failed, eg: because the directory does not exist
+        output = TlogHelper.parse_collapse_probe('tlog 2 1513178427 1513178500\nheaddb 0\n')
+        assert output['tlog'] == {'count': 2, 'oldest': 1513178427, 'youngest': 1513178500}
+        assert output['avail_size'] is None
+
+    @staticmethod
+    def test_probe_quotes_directory():
+        directory = tempfile.mkdtemp()
+        try:
+            tlog_dir = os.path.join(directory, "tlogs; touch 'injected'")
+            assert TlogHelper.get_collapse_probe(tlog_dir).count(tlog_dir) == 0
+            os.mkdir(tlog_dir)
+            for name, timestamp in [('1.tlx', 1513166090), ('2.tlx', 1513174418), ('3.tlog', 1513178427), ('head.db', 1513178427)]:
+                filename = os.path.join(tlog_dir, name)
+                with open(filename, 'w') as output_file:
+                    output_file.write('x' * 10)
+                os.utime(filename, (timestamp, timestamp))
+            probe_output = subprocess.check_output(TlogHelper.get_collapse_probe(tlog_dir), shell=True, cwd=directory)
+            output = TlogHelper.parse_collapse_probe(probe_output)
+            assert output['tlx'] == {'count': 2, 'oldest': 1513166090, 'youngest': 1513174418}
+            assert output['tlog'] == {'count': 1, 'oldest': 1513178427, 'youngest': 1513178427}
+            assert output['headdb_size'] == 10
+            assert output['avail_size'] is not None
+            assert os.path.exists(os.path.join(directory, 'injected')) is False
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,42 @@
+# Copyright (C) 2018 iNuron NV
+#
+# This file is part of Open vStorage Open Source Edition (OSE),
+# as available from
+#
+#      http://www.openvstorage.org and
+#      http://www.openvstorage.com.
+#
+# This file is free software; you can redistribute it and/or modify it
+# under the terms of the GNU Affero General Public License v3 (GNU AGPLv3)
+# as published by the Free Software Foundation, in version 3 as it comes
+# in the LICENSE.txt file of the Open vStorage OSE distribution.
+#
+# Open vStorage is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY of any kind.
+from ovs.extensions.healthcheck.helpers.trend import TrendHelper
+
+
+class TrendTest(object):
+
+    @staticmethod
+    def test_linear_regression():
+        slope, intercept = TrendHelper.linear_regression([(0, 1), (1, 3), (2, 5)])
+        assert abs(slope - 2) < 1e-7
+        assert abs(intercept - 1) < 1e-7
+        assert TrendHelper.linear_regression([(0, 1)]) is None
+        assert TrendHelper.linear_regression([(5, 1), (5, 2)]) is None
+
+    @staticmethod
+    def test_time_until():
+        # Losing 1 level of safety every hour, 3 levels left
+        points = [(0, 5), (3600, 4), (7200, 3)]
+        assert abs(TrendHelper.time_until(points, 0) - 3 * 3600) < 1e-7
+        # Moving away from the target
+        assert TrendHelper.time_until(points, 10) is None
+        assert TrendHelper.time_until(points, 3) == 0
+        assert TrendHelper.time_until([(0, 3), (3600, 3)], 0) is None
+
+    @staticmethod
+    def test_prune():
+        samples = [{'time': 100}, {'time': 200}, {'time': 300}]
+        assert TrendHelper.prune(samples, 150, 350) == [{'time': 200}, {'time': 300}]